@@ -5,14 +5,15 @@
 
 let DATA = null;
 let searchIndex = [];
+let searchValues = null;
 
 // --- Init ---
 async function init() {
   try {
-    const resp = await fetch('data.json');
+    const resp = await fetch('data/index.json');
     DATA = await resp.json();
   } catch (e) {
-    document.body.innerHTML = '<div class="loading">Failed to load data.json. Run the build first: <code>cd docs && npm install && node build.mjs</code></div>';
+    document.body.innerHTML = '<div class="loading">Failed to load data/index.json. Run the build first: <code>cd docs && npm install && node build.mjs</code></div>';
     return;
   }
 
@@ -27,6 +28,34 @@ async function init() {
   window.addEventListener('hashchange', handleRoute);
 }
 
+// --- Data shards ---
+// data/index.json is enough for first paint; template slots, enum values and
+// the value search list live in content-hashed shards fetched on demand.
+const shardCache = new Map();
+function loadShard(path) {
+  if (!shardCache.has(path)) {
+    const promise = fetch(`data/${path}`).then(resp => {
+      if (!resp.ok) throw new Error(`${path}: HTTP ${resp.status}`);
+      return resp.json();
+    });
+    promise.catch(() => shardCache.delete(path));
+    shardCache.set(path, promise);
+  }
+  return shardCache.get(path);
+}
+
+// Enum values for search: [{ name, enum, definition, synonyms }], loaded on first search
+async function loadSearchValues() {
+  if (!searchValues) {
+    const rows = await loadShard(DATA.searchValues);
+    searchValues = rows.map(([name, enumName, definition, synonyms]) => ({ name, enum: enumName, definition, synonyms }));
+    for (const v of searchValues) {
+      searchIndex.push({ type: 'value', name: v.name, display: v.name, desc: v.definition, parent: v.enum });
+    }
+  }
+  return searchValues;
+}
+
 // --- Search Index ---
 function buildSearchIndex() {
   searchIndex = [];
@@ -38,9 +67,6 @@ function buildSearchIndex() {
   }
   for (const e of Object.values(DATA.enums)) {
     searchIndex.push({ type: 'vocab', name: e.name, display: e.name, desc: `${e.valueCount} values` });
-    for (const v of e.values) {
-      searchIndex.push({ type: 'value', name: v.name, display: v.name, desc: v.definition, parent: e.name });
-    }
   }
 }
 
@@ -82,11 +108,14 @@ function initGlobalSearch() {
   const results = document.getElementById('search-results');
   let timer = null;
 
+  input.addEventListener('focus', () => loadSearchValues().catch(() => {}), { once: true });
   input.addEventListener('input', () => {
     clearTimeout(timer);
-    timer = setTimeout(() => {
+    timer = setTimeout(async () => {
       const q = input.value.trim().toLowerCase();
       if (q.length < 2) { results.hidden = true; return; }
+      try { await loadSearchValues(); } catch (e) { /* search templates, slots and vocabularies only */ }
+      if (input.value.trim().toLowerCase() !== q) return;
       const matches = searchIndex.filter(item =>
         item.name.toLowerCase().includes(q) ||
         item.display.toLowerCase().includes(q) ||
@@ -470,7 +499,7 @@ function renderTemplateCards() {
   });
 }
 
-function showTemplateDetail(name) {
+async function showTemplateDetail(name) {
   const t = DATA.templates.find(t => t.name === name);
   if (!t) return;
 
@@ -483,7 +512,16 @@ function showTemplateDetail(name) {
   });
 
   const content = document.getElementById('template-detail-content');
-  const slots = t.resolvedSlots || [];
+  content.dataset.template = name;
+  let slots;
+  try {
+    slots = (await loadShard(t.shard)).resolvedSlots || [];
+  } catch (e) {
+    content.innerHTML = `<div class="empty-state">Failed to load fields for ${esc(name)}: ${esc(e.message)}</div>`;
+    return;
+  }
+  // A later navigation may have replaced this template while its shard loaded
+  if (content.dataset.template !== name) return;
 
   content.innerHTML = `
     <div class="detail-header">
@@ -617,22 +655,28 @@ function initVocabulary() {
   renderVocabCards();
 }
 
-function renderVocabCards(scrollToEnum) {
+let vocabRender = 0;
+async function renderVocabCards(scrollToEnum) {
   const container = document.getElementById('vocab-cards');
   const query = document.getElementById('vocab-search').value.toLowerCase();
   const selected = document.getElementById('vocab-select').value;
+  const render = ++vocabRender;
 
   let enums = Object.values(DATA.enums);
   if (selected) enums = enums.filter(e => e.name === selected);
   if (query) {
-    enums = enums.filter(e =>
-      e.name.toLowerCase().includes(query) ||
-      e.values.some(v =>
-        v.name.toLowerCase().includes(query) ||
-        (v.definition && v.definition.toLowerCase().includes(query)) ||
-        (v.synonyms && v.synonyms.some(s => s.toLowerCase().includes(query)))
-      )
-    );
+    const matching = new Set();
+    try {
+      for (const v of await loadSearchValues()) {
+        if (v.name.toLowerCase().includes(query) ||
+            (v.definition && v.definition.toLowerCase().includes(query)) ||
+            (v.synonyms && v.synonyms.some(s => s.toLowerCase().includes(query)))) {
+          matching.add(v.enum);
+        }
+      }
+    } catch (e) { /* match on vocabulary names only */ }
+    if (render !== vocabRender) return;
+    enums = enums.filter(e => e.name.toLowerCase().includes(query) || matching.has(e.name));
   }
 
   if (enums.length === 0) {
@@ -650,35 +694,56 @@ function renderVocabCards(scrollToEnum) {
       </div>
       ${e.description ? `<div class="enum-card-desc">${esc(e.description)}</div>` : ''}
       <div class="enum-card-body${isTarget ? '' : ' collapsed'}">
-        <ul class="enum-value-list">
-          ${e.values.map(v => `
-            <li class="enum-value-item">
-              <span class="enum-value-name">${esc(v.name)}${v.synonyms ? v.synonyms.map(s => `<span class="synonym-tag">${esc(s)}</span>`).join('') : ''}</span>
-              <span class="enum-value-def">${esc(v.definition)}</span>
-              <span class="enum-value-links">
-                ${v.meaning ? `<a class="ontology-link" href="${esc(resolveOntologyUri(v.meaning))}" target="_blank" rel="noopener">${esc(shortenUri(v.meaning))}</a>` : ''}
-              </span>
-            </li>
-          `).join('')}
-        </ul>
+        <ul class="enum-value-list"></ul>
       </div>
     </div>
   `}).join('');
 
-  // Toggle expand/collapse
+  // Toggle expand/collapse; values are fetched the first time a card opens
   container.querySelectorAll('.enum-card-header').forEach(header => {
     header.addEventListener('click', () => {
-      const body = header.closest('.enum-card').querySelector('.enum-card-body');
+      const card = header.closest('.enum-card');
+      const body = card.querySelector('.enum-card-body');
       body.classList.toggle('collapsed');
+      if (!body.classList.contains('collapsed')) fillEnumValues(card);
     });
   });
 
   if (typeof scrollToEnum === 'string') {
     const target = document.getElementById(`enum-${scrollToEnum}`);
-    if (target) target.scrollIntoView({ behavior: 'smooth', block: 'start' });
+    if (target) {
+      fillEnumValues(target);
+      target.scrollIntoView({ behavior: 'smooth', block: 'start' });
+    }
+  }
+}
+
+async function fillEnumValues(card) {
+  if (card.dataset.loaded) return;
+  card.dataset.loaded = 'true';
+  const list = card.querySelector('.enum-value-list');
+  list.innerHTML = '<li class="enum-value-item">Loading values...</li>';
+  try {
+    const { values } = await loadShard(DATA.enums[card.dataset.name].shard);
+    list.innerHTML = renderEnumValues(values);
+  } catch (e) {
+    delete card.dataset.loaded;
+    list.innerHTML = `<li class="enum-value-item">Failed to load values: ${esc(e.message)}</li>`;
   }
 }
 
+function renderEnumValues(values) {
+  return values.map(v => `
+    <li class="enum-value-item">
+      <span class="enum-value-name">${esc(v.name)}${v.synonyms ? v.synonyms.map(s => `<span class="synonym-tag">${esc(s)}</span>`).join('') : ''}</span>
+      <span class="enum-value-def">${esc(v.definition)}</span>
+      <span class="enum-value-links">
+        ${v.meaning ? `<a class="ontology-link" href="${esc(resolveOntologyUri(v.meaning))}" target="_blank" rel="noopener">${esc(shortenUri(v.meaning))}</a>` : ''}
+      </span>
+    </li>
+  `).join('');
+}
+
 function resolveOntologyUri(uri) {
   if (!uri) return '';
   // Common prefixes
@@ -1,10 +1,13 @@
 #!/usr/bin/env node
 /**
- * Build script: Parses dist/NF.ttl → docs/data.json
- * Extracts templates, slots, enums, and reads annotations from source YAML
+ * Build script: Parses dist/NF.ttl → docs/data/ (index.json plus content-hashed shards)
+ * Extracts templates, slots, enums, and reads annotations from source YAML.
+ * When dist/NF.attributes.jsonl exists (utils/template_attributes.py), per-template
+ * attributes, hierarchy facts and annotations are taken from it instead.
  */
 
-import { readFileSync, writeFileSync, copyFileSync, existsSync, readdirSync } from 'fs';
+import { readFileSync, writeFileSync, copyFileSync, existsSync, readdirSync, mkdirSync, rmSync } from 'fs';
+import { createHash } from 'crypto';
 import { Parser, Store, DataFactory } from 'n3';
 import { resolve, dirname } from 'path';
 import { fileURLToPath } from 'url';
@@ -97,6 +100,29 @@ if (existsSync(templateDir)) {
   console.log(`Read annotations for ${Object.keys(templateAnnotations).length} templates from source YAML`);
 }
 
+// 2b. Read the per-template attribute artifact, if built from the current dist/NF.yaml
+const ATTRIBUTES_FORMAT = 'nf-template-attributes';
+const ATTRIBUTES_VERSION = 1;
+const attributeRecords = {};
+const attributesPath = resolve(rootDir, 'dist', 'NF.attributes.jsonl');
+const modelPath = resolve(rootDir, 'dist', 'NF.yaml');
+if (existsSync(attributesPath)) {
+  const [headerLine, ...recordLines] = readFileSync(attributesPath, 'utf-8').split('\n').filter(l => l.trim());
+  const header = JSON.parse(headerLine);
+  const modelSha256 = existsSync(modelPath) ? createHash('sha256').update(readFileSync(modelPath)).digest('hex') : null;
+  if (header.format !== ATTRIBUTES_FORMAT || header.version !== ATTRIBUTES_VERSION) {
+    console.warn(`WARNING: ignoring dist/NF.attributes.jsonl (${header.format} v${header.version}, expected ${ATTRIBUTES_FORMAT} v${ATTRIBUTES_VERSION})`);
+  } else if (header.modelSha256 !== modelSha256) {
+    console.warn('WARNING: ignoring dist/NF.attributes.jsonl (built from a different dist/NF.yaml; rebuild with `python utils/build.py --only attributes`)');
+  } else {
+    for (const line of recordLines) {
+      const record = JSON.parse(line);
+      attributeRecords[record.name] = record;
+    }
+    console.log(`Read attributes for ${recordLines.length} templates from dist/NF.attributes.jsonl`);
+  }
+}
+
 // 3. Extract ClassDefinitions (templates)
 console.log('Extracting templates...');
 const classQuads = store.getQuads(null, namedNode(RDF + 'type'), namedNode(LINKML + 'ClassDefinition'), null);
@@ -255,6 +281,10 @@ console.log(`Found ${Object.keys(enumMap).length} enums`);
 
 // 6. Build resolved template data (slots with usage overrides applied)
 for (const template of templates) {
+  // The artifact resolves the template's own slots (same list as before, so
+  // Filename/Component, which it excludes, still come from NF.ttl below)
+  const attributes = {};
+  for (const a of attributeRecords[template.name]?.attributes || []) attributes[a.name] = a;
   const overrides = usageSlots[template.name] || {};
   template.resolvedSlots = template.slots.map(slotName => {
     // Usage slots are named like "WGSTemplate_assay" in the slots list
@@ -284,6 +314,19 @@ for (const template of templates) {
     // Use the base slot name (without template prefix) as the canonical name
     const canonicalName = base.name || slotName;
 
+    const attribute = attributes[canonicalName];
+    if (attribute) {
+      return {
+        name: canonicalName,
+        displayName: attribute.title,
+        description: attribute.description,
+        range: attribute.ranges.join(' | '),
+        rangeUnion: attribute.ranges.length > 1 ? attribute.ranges : null,
+        required: attribute.required,
+        multivalued: attribute.multivalued
+      };
+    }
+
     return {
       name: canonicalName,
       displayName,
@@ -330,6 +373,14 @@ function computeDepth(name) {
 }
 
 for (const t of templates) {
+  const record = attributeRecords[t.name];
+  if (record) {
+    t.templateType = record.templateType;
+    t.depth = record.depth;
+    t.dataGranularity = record.dataGranularity;
+    t.templateUsage = record.templateUsage;
+    continue;
+  }
   t.templateType = computeTemplateType(t.name);
   t.depth = computeDepth(t.name);
   const annots = templateAnnotations[t.name];
@@ -337,8 +388,37 @@ for (const t of templates) {
   t.templateUsage = annots?.templateUsage || null;
 }
 
-// 9. Compile output
-const output = {
+// 9. Write the data bundle: a small index.json plus content-hashed shards.
+// The index holds everything needed for first paint (template list, slots,
+// enum names and counts); per-template slots, per-enum values and the value
+// search list are separate shards the app fetches only when a view needs them.
+// Shards are minified and named by content hash so they can be cached forever.
+const dataDir = resolve(__dirname, 'data');
+rmSync(dataDir, { recursive: true, force: true });
+mkdirSync(resolve(dataDir, 'templates'), { recursive: true });
+mkdirSync(resolve(dataDir, 'enums'), { recursive: true });
+
+let shardCount = 0;
+let shardBytes = 0;
+function writeShard(dir, name, payload) {
+  const body = JSON.stringify(payload);
+  const hash = createHash('sha256').update(body).digest('hex').slice(0, 12);
+  const file = `${dir ? dir + '/' : ''}${name}.${hash}.json`;
+  writeFileSync(resolve(dataDir, file), body);
+  shardCount++;
+  shardBytes += Buffer.byteLength(body);
+  return file;
+}
+
+// Value search entries: [value, enum, definition, synonyms]
+const searchValues = [];
+for (const e of Object.values(enumMap)) {
+  for (const v of e.values) {
+    searchValues.push(v.synonyms ? [v.name, e.name, v.definition, v.synonyms] : [v.name, e.name, v.definition]);
+  }
+}
+
+const index = {
   meta: {
     generatedAt: new Date().toISOString(),
     templateCount: templates.length,
@@ -346,19 +426,39 @@ const output = {
     enumCount: Object.keys(enumMap).length,
     totalEnumValues: Object.values(enumMap).reduce((sum, e) => sum + e.valueCount, 0)
   },
-  templates,
+  templates: templates.map(({ resolvedSlots, ...t }) => ({
+    ...t,
+    shard: writeShard('templates', t.name, { name: t.name, resolvedSlots })
+  })),
   slots,
-  enums: enumMap
+  enums: Object.fromEntries(Object.values(enumMap).map(({ values, ...e }) => [
+    e.name,
+    { ...e, shard: writeShard('enums', e.name, { name: e.name, values }) }
+  ])),
+  searchValues: writeShard('', 'search-values', searchValues)
 };
 
-// 9. Write data.json
-const outPath = resolve(__dirname, 'data.json');
-writeFileSync(outPath, JSON.stringify(output, null, 2));
-console.log(`Wrote ${outPath} (${(readFileSync(outPath).length / 1024).toFixed(0)} KB)`);
+const indexPath = resolve(dataDir, 'index.json');
+writeFileSync(indexPath, JSON.stringify(index));
+console.log(`Wrote ${indexPath} (${(readFileSync(indexPath).length / 1024).toFixed(0)} KB) and ${shardCount} shards (${(shardBytes / 1024).toFixed(0)} KB)`);
 
 // 10. Copy NF.ttl for SPARQL explorer
 const ttlDest = resolve(__dirname, 'NF.ttl');
 copyFileSync(ttlPath, ttlDest);
 console.log(`Copied NF.ttl to docs/`);
 
+// 11. Copy the prebuilt N-Triples bundle (utils/rdf_bundle.py) if present;
+// sparql.js falls back to parsing NF.ttl without it
+const bundleManifest = resolve(rootDir, 'dist', 'NF.rdf.json');
+if (existsSync(bundleManifest)) {
+  const manifest = JSON.parse(readFileSync(bundleManifest, 'utf-8'));
+  for (const entry of manifest.files) {
+    copyFileSync(resolve(rootDir, 'dist', entry.file), resolve(__dirname, entry.file));
+  }
+  copyFileSync(bundleManifest, resolve(__dirname, 'NF.rdf.json'));
+  console.log(`Copied RDF bundle (${manifest.files.map(f => f.file).join(', ')}) to docs/`);
+} else {
+  rmSync(resolve(__dirname, 'NF.rdf.json'), { force: true });
+}
+
 console.log('Build complete!');
@@ -2,6 +2,11 @@
  * NF Metadata Dictionary - SPARQL Explorer Module
  * Lazy-loaded when SPARQL tab is activated.
  * Uses Oxigraph WASM for in-browser SPARQL query execution.
+ *
+ * Loads the prebuilt N-Triples bundle described by NF.rdf.json
+ * (utils/rdf_bundle.py) when available, falling back to parsing NF.ttl.
+ * With a split bundle, enum values live in a named graph that is fetched
+ * only when a query is run with "Include vocabulary values" checked.
  */
 
 const PREFIXES = `PREFIX linkml: <https://w3id.org/linkml/>
@@ -57,6 +62,7 @@ ORDER BY ?template ?field`
   },
   {
     name: 'Vocabulary values with ontology mappings',
+    values: true,
     query: `SELECT ?enum ?value ?ontology WHERE {
   ?e linkml:permissible_values ?v .
   ?v linkml:meaning ?ontology .
@@ -80,6 +86,7 @@ ORDER BY ?range ?slot`
   },
   {
     name: 'Terms with synonyms',
+    values: true,
     query: `SELECT ?term ?synonym WHERE {
   ?t skos:altLabel ?synonym .
   BIND(REPLACE(STR(?t), "^.*/", "") AS ?term)
@@ -99,6 +106,48 @@ GROUP BY ?type`
 ];
 
 let oxStore = null;
+let ox = null;
+// Named-graph bundle files not loaded yet: [{ file, graph }]
+let deferredGraphs = [];
+
+// Fetch a bundle file, gunzipping in the browser unless the server already did
+async function fetchText(file) {
+  const resp = await fetch(file);
+  if (!resp.ok) throw new Error(`${file}: HTTP ${resp.status}`);
+  const bytes = new Uint8Array(await resp.arrayBuffer());
+  if (bytes[0] === 0x1f && bytes[1] === 0x8b) {
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return new Response(stream).text();
+  }
+  return new TextDecoder().decode(bytes);
+}
+
+async function loadModel(status) {
+  const resp = await fetch('NF.rdf.json');
+  if (!resp.ok || typeof DecompressionStream === 'undefined') {
+    status.textContent = 'Loading NF.ttl...';
+    oxStore.load(await fetchText('NF.ttl'), { format: 'text/turtle' });
+    return;
+  }
+  const manifest = await resp.json();
+  for (const entry of manifest.files) {
+    if (entry.graph) {
+      deferredGraphs.push(entry);
+      continue;
+    }
+    status.textContent = `Loading ${entry.file}...`;
+    oxStore.load(await fetchText(entry.file), { format: manifest.format });
+  }
+}
+
+async function loadDeferredGraphs(status) {
+  while (deferredGraphs.length > 0) {
+    const entry = deferredGraphs[0];
+    status.textContent = `Loading ${entry.file}...`;
+    oxStore.load(await fetchText(entry.file), { format: 'application/n-triples', to_graph_name: ox.namedNode(entry.graph) });
+    deferredGraphs.shift();
+  }
+}
 
 export async function initSparql() {
   const editor = document.getElementById('sparql-editor');
@@ -107,6 +156,7 @@ export async function initSparql() {
   const runBtn = document.getElementById('sparql-run');
   const clearBtn = document.getElementById('sparql-clear');
   const examplesSelect = document.getElementById('sparql-examples');
+  const includeValues = document.getElementById('sparql-include-values');
 
   // Populate example queries
   for (const ex of EXAMPLES) {
@@ -117,7 +167,10 @@ export async function initSparql() {
   }
 
   examplesSelect.addEventListener('change', () => {
-    if (examplesSelect.value) editor.value = PREFIXES + '\n' + examplesSelect.value;
+    if (!examplesSelect.value) return;
+    editor.value = PREFIXES + '\n' + examplesSelect.value;
+    const example = EXAMPLES.find(ex => ex.query === examplesSelect.value);
+    if (includeValues) includeValues.checked = Boolean(example?.values);
   });
 
   runBtn.addEventListener('click', runQuery);
@@ -139,17 +192,13 @@ export async function initSparql() {
   // Load Oxigraph
   status.textContent = 'Loading Oxigraph WASM...';
   try {
-    const ox = await import('https://cdn.jsdelivr.net/npm/oxigraph@0.4.4/web.js');
+    ox = await import('https://cdn.jsdelivr.net/npm/oxigraph@0.4.4/web.js');
     await ox.default();
-    status.textContent = 'Loading NF.ttl...';
-
-    const resp = await fetch('NF.ttl');
-    const ttlText = await resp.text();
 
     oxStore = new ox.Store();
-    oxStore.load(ttlText, { format: "text/turtle" });
+    await loadModel(status);
     const size = oxStore.size;
-    status.textContent = `Ready (${size.toLocaleString()} triples loaded)`;
+    status.textContent = `Ready (${size.toLocaleString()} triples loaded${deferredGraphs.length ? '; vocabulary values load on demand' : ''})`;
 
     // Set default query
     editor.value = PREFIXES + '\n' + EXAMPLES[0].query;
@@ -166,11 +215,22 @@ export async function initSparql() {
       return;
     }
 
+    const useValues = Boolean(includeValues?.checked);
+    if (useValues && deferredGraphs.length > 0) {
+      try {
+        await loadDeferredGraphs(status);
+      } catch (e) {
+        status.textContent = 'Failed to load vocabulary values';
+        resultsDiv.innerHTML = `<div class="sparql-error">${escHtml(e.message || String(e))}</div>`;
+        return;
+      }
+    }
+
     status.textContent = 'Running query...';
     const t0 = performance.now();
 
     try {
-      const results = oxStore.query(queryText);
+      const results = oxStore.query(queryText, { use_default_graph_as_union: useValues });
       const elapsed = ((performance.now() - t0) / 1000).toFixed(3);
 
       if (typeof results === 'boolean') {
@@ -6,9 +6,13 @@ to dataType, assay, and dataGranularity.
 Output: docs/template-mapping.md
 """
 
+import sys
 import yaml
 from pathlib import Path
-from collections import defaultdict
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "utils"))
+from schema_index import HierarchyIndex
+from stage_profiling import span, start_profiling
 
 
 def load_yaml_files(modules_dir: Path) -> dict:
@@ -30,15 +34,9 @@ def load_yaml_files(modules_dir: Path) -> dict:
 
 
 def get_all_subclasses(classes: dict, base_class: str) -> set:
-    """Recursively find all subclasses of a base class."""
-    subclasses = set()
-
-    for class_name, class_def in classes.items():
-        if class_def and class_def.get("is_a") == base_class:
-            subclasses.add(class_name)
-            subclasses.update(get_all_subclasses(classes, class_name))
-
-    return subclasses
+    """Find all transitive subclasses of a base class."""
+    hierarchy = HierarchyIndex({name: (class_def or {}).get("is_a") for name, class_def in classes.items()})
+    return set(hierarchy.descendants(base_class))
 
 
 def extract_template_info(classes: dict, template_name: str) -> dict:
@@ -93,8 +91,11 @@ def main():
     modules_dir = repo_root / "modules"
     docs_dir = repo_root / "docs"
 
+    start_profiling("generate_template_table")  # NF_PROFILE only; this script takes no arguments
+
     print("Loading YAML files...")
-    data = load_yaml_files(modules_dir)
+    with span("yaml load", "io", path=str(modules_dir)):
+        data = load_yaml_files(modules_dir)
 
     print("Finding FileBasedTemplate subclasses...")
     file_based_templates = get_all_subclasses(data["classes"], "FileBasedTemplate")
@@ -115,7 +116,7 @@ def main():
     output_file = docs_dir / "template-mapping.md"
     docs_dir.mkdir(exist_ok=True)
 
-    with open(output_file, "w") as f:
+    with span("markdown dump", "io", path=output_file.name), open(output_file, "w") as f:
         f.write(markdown)
 
     print(f"Written to {output_file}")
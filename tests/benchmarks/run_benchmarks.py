@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmark the schema toolchain: wall time and peak Python memory per stage.
+
+Stages (see stages.py): module merge, JSON Schema generation per class,
+process_schema post-processing, compare.py parse/diff, check_schema_limits,
+synonym filtering and instance validation. Each runs against the real model
+and, with --scale, against synthetic copies N times larger written by
+utils/scale_model.py (NF.ttl and JSON Schemas for those are generated
+first, when linkml is installed and a selected stage reads them).
+
+Every case is timed --repeat times (after one warm-up run); the median is
+what gets compared. Peak memory comes from one extra run under tracemalloc,
+so the tracing overhead never shows up in the timings.
+
+Results are written as JSON (--output). With --baseline, the run is
+compared against an earlier results file and exits 1 when any case got
+slower or hungrier by more than --threshold.
+
+Usage:
+    python tests/benchmarks/run_benchmarks.py --output bench.json
+    python tests/benchmarks/run_benchmarks.py --scale 5 10 --only merge synonym_filtering
+    python tests/benchmarks/run_benchmarks.py --baseline bench-main.json --threshold 0.2
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "utils"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from build import build
+from scale_model import scale_modules
+from stages import NEEDS, ROOT, STAGES, ModelUnderTest, Skip
+
+RESULTS_FORMAT = "nf-benchmarks"
+RESULTS_VERSION = 1
+
+
+def measure(fn, repeat: int = 5) -> dict:
+    """Median/min wall and CPU seconds over repeat runs, plus tracemalloc peak (KB) of one more."""
+    fn()  # warm-up: imports, lazy caches
+    wall, cpu = [], []
+    for _ in range(repeat):
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        fn()
+        wall.append(time.perf_counter() - start_wall)
+        cpu.append(time.process_time() - start_cpu)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median": statistics.median(wall),
+        "min": min(wall),
+        "cpu": statistics.median(cpu),
+        "runs": wall,
+        "peak_kb": peak / 1024,
+    }
+
+
+def _generated_artifacts(model: ModelUnderTest, only: list[str] | None = None) -> None:
+    """NF.ttl and JSON Schemas for a scaled model, when the generators are installed (not timed).
+
+    Only the artifacts the selected stages read (stages.NEEDS) are built:
+    each is a full LinkML run over the scaled model.
+    """
+    needed = {artifact for name in (only or STAGES) for artifact in NEEDS[name]}
+    for stage, attribute, path in (("ttl", "ttl", model.workdir / "NF.ttl"), ("json-schemas", "schemas_dir", model.workdir / "schemas")):
+        if stage not in needed:
+            continue
+        try:
+            build([stage], header=model.header, modules_dir=model.modules_dir, dist_dir=model.workdir, schemas_dir=model.workdir / "schemas")
+        except Exception as e:
+            print(f"⏭️  {model.label:>6} no {stage} for this model ({e})")
+            continue
+        setattr(model, attribute, path)
+
+
+def models_under_test(scales: list[int], workdir: Path, real: bool = True, only: list[str] | None = None) -> list[ModelUnderTest]:
+    models = []
+    if real:
+        real_dir = workdir / "real"
+        real_dir.mkdir()
+        models.append(ModelUnderTest(
+            label="real",
+            modules_dir=ROOT / "modules",
+            header=ROOT / "header.yaml",
+            workdir=real_dir,
+            schemas_dir=ROOT / "registered-json-schemas",
+            ttl=ROOT / "dist" / "NF.ttl" if (ROOT / "dist" / "NF.ttl").exists() else None,
+        ))
+    for factor in scales:
+        scaled_dir = workdir / f"x{factor}"
+        scaled_dir.mkdir()
+        scale_modules(ROOT / "modules", factor, scaled_dir / "modules")
+        model = ModelUnderTest(label=f"x{factor}", modules_dir=scaled_dir / "modules", header=ROOT / "header.yaml", workdir=scaled_dir)
+        model.yaml_path()
+        _generated_artifacts(model, only)
+        models.append(model)
+    return models
+
+
+def run(models: list[ModelUnderTest], only: list[str] | None = None, repeat: int = 5) -> dict:
+    """Run the selected stages against each model.
+
+    Returns:
+        Results document: {"format", "version", "meta", "results": {model: {case: stats}}, "skipped": {...}}
+    """
+    results, skipped = {}, {}
+    for model in models:
+        results[model.label], skipped[model.label] = {}, {}
+        for name, setup in STAGES.items():
+            if only and name not in only:
+                continue
+            try:
+                cases = setup(model)
+            except Skip as e:
+                skipped[model.label][name] = str(e)
+                print(f"⏭️  {model.label:>6} {name}: skipped ({e})")
+                continue
+            groups = {}
+            for case, fn in cases.items():
+                stats = measure(fn, repeat)
+                results[model.label][case] = stats
+                if "/" in case:
+                    groups.setdefault(case.split("/")[0], []).append(stats)
+                else:
+                    print(f"✅ {model.label:>6} {case:<40} {stats['median'] * 1000:>10.1f} ms {stats['peak_kb'] / 1024:>8.1f} MB")
+            for group, members in groups.items():
+                total = {
+                    "median": sum(s["median"] for s in members),
+                    "min": sum(s["min"] for s in members),
+                    "cpu": sum(s["cpu"] for s in members),
+                    "peak_kb": max(s["peak_kb"] for s in members),
+                    "cases": len(members),
+                }
+                results[model.label][f"{group}/total"] = total
+                print(f"✅ {model.label:>6} {group + '/total (' + str(len(members)) + ')':<40} {total['median'] * 1000:>10.1f} ms {total['peak_kb'] / 1024:>8.1f} MB")
+    return {
+        "format": RESULTS_FORMAT,
+        "version": RESULTS_VERSION,
+        "meta": environment(repeat),
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def environment(repeat: int) -> dict:
+    commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float = 0.2,
+                    min_seconds: float = 0.005, min_kb: float = 1024) -> list[dict]:
+    """Cases present in both runs that regressed by more than threshold.
+
+    A case regresses when its median time (or peak memory) exceeds the
+    baseline by more than threshold as a fraction and by more than the
+    absolute floor (min_seconds / min_kb), so sub-millisecond noise on tiny
+    stages doesn't fail a run.
+
+    Returns:
+        [{"model", "case", "metric", "baseline", "current", "change"}]
+    """
+    regressions = []
+    for model, cases in current["results"].items():
+        for case, stats in cases.items():
+            base = baseline.get("results", {}).get(model, {}).get(case)
+            if not base:
+                continue
+            for metric, floor in (("median", min_seconds), ("peak_kb", min_kb)):
+                before, after = base[metric], stats[metric]
+                if after - before > floor and after > before * (1 + threshold):
+                    regressions.append({
+                        "model": model,
+                        "case": case,
+                        "metric": metric,
+                        "baseline": before,
+                        "current": after,
+                        "change": after / before - 1 if before else float("inf"),
+                    })
+    return regressions
+
+
+def load_results(path: Path) -> dict:
+    """Read a results file written by this script.
+
+    Raises:
+        ValueError: If the file is not a benchmark results file of a supported version
+    """
+    data = json.loads(Path(path).read_text())
+    if data.get("format") != RESULTS_FORMAT or data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} is not a version {RESULTS_VERSION} {RESULTS_FORMAT} file")
+    return data
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the schema toolchain (time and peak memory per stage)")
+    parser.add_argument("--only", nargs="+", choices=list(STAGES), help="Stages to run (default: all)")
+    parser.add_argument("--scale", nargs="*", type=int, default=[], metavar="N", help="Also run on synthetic models N times larger")
+    parser.add_argument("--no-real", action="store_true", help="Skip the real model (only the --scale variants)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (default: 5)")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown/memory growth as a fraction (default: 0.2)")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="Ignore time changes smaller than this (default: 0.005)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="nf-bench-") as workdir:
+        models = models_under_test(args.scale, Path(workdir), real=not args.no_real, only=args.only)
+        document = run(models, args.only, args.repeat)
+
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"📝 Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_results(document, load_results(args.baseline), args.threshold, args.min_seconds)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for r in regressions:
+                unit = "s" if r["metric"] == "median" else " KB"
+                print(f"  - {r['model']} {r['case']} {r['metric']}: {r['baseline']:.3f}{unit} -> {r['current']:.3f}{unit} (+{r['change']:.0%})")
+            return 1
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
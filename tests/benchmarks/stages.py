@@ -0,0 +1,277 @@
+"""
+Benchmarked stages of the schema toolchain.
+
+Each stage is a setup function registered with @stage. It receives the
+ModelUnderTest and returns {case name: zero-argument callable}; only the
+callables are timed. Setup raises Skip when the stage can't run here (a
+tool that isn't installed, or an input that doesn't exist for this model).
+Case names containing "/" are grouped, and the runner reports a
+"<group>/total" row for each group. A stage that reads generated artifacts
+of a scaled model (NF.ttl, JSON Schemas) lists them in `needs`, so the
+runner builds them only when such a stage is selected.
+"""
+
+import contextlib
+import copy
+import importlib.util
+import io
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from build import merge_modules, module_files, strip_keys
+from schema_passes import DEFAULT_PASSES, DERIVED_SCHEMAS, run_pipeline
+from schema_validators import compile_schema
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+UTILS_DIR = ROOT / "utils"
+TESTS_DIR = ROOT / "tests"
+
+STAGES = {}
+NEEDS = {}  # stage -> build.py stages ("ttl", "json-schemas") whose output it reads
+
+
+class Skip(Exception):
+    """The stage can't run for this model in this environment."""
+
+
+def stage(name: str, needs: tuple[str, ...] = ()):
+    def register(setup):
+        STAGES[name] = setup
+        NEEDS[name] = needs
+        return setup
+    return register
+
+
+@dataclass
+class ModelUnderTest:
+    """One model variant (the real modules/ tree or a scaled copy) and its derived inputs."""
+
+    label: str
+    modules_dir: Path
+    header: Path
+    workdir: Path
+    schemas_dir: Path | None = None  # registered JSON Schemas, when they exist for this model
+    ttl: Path | None = None  # NF.ttl, when it exists for this model
+    _cache: dict = field(default_factory=dict, repr=False)
+
+    def files(self) -> list[Path]:
+        return module_files(self.header, self.modules_dir)
+
+    def merged(self) -> dict:
+        """Merged model with annotations (not timed: computed once per variant)."""
+        if "merged" not in self._cache:
+            self._cache["merged"] = merge_modules(self.files())
+        return self._cache["merged"]
+
+    def model(self) -> dict:
+        if "model" not in self._cache:
+            self._cache["model"] = strip_keys(self.merged())
+        return self._cache["model"]
+
+    def yaml_path(self) -> Path:
+        path = self.workdir / "NF.yaml"
+        if not path.exists():
+            dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+            with open(path, "w") as f:
+                yaml.dump(self.model(), f, Dumper=dumper, sort_keys=False, allow_unicode=True)
+        return path
+
+    def linkml_schema(self):
+        if "schema" not in self._cache:
+            try:
+                from linkml_runtime.linkml_model import SchemaDefinition
+                from linkml_runtime.loaders import yaml_loader
+            except ImportError:
+                raise Skip("linkml is not installed")
+            self._cache["schema"] = yaml_loader.load(str(self.yaml_path()), SchemaDefinition)
+        return self._cache["schema"]
+
+    def class_names(self) -> list[str]:
+        return list(self.model().get("classes") or {})
+
+
+def _gen_json_schema_module():
+    try:
+        spec = importlib.util.spec_from_file_location("gen_json_schema_class", UTILS_DIR / "gen-json-schema-class.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except ImportError as e:
+        raise Skip(f"gen-json-schema-class.py dependencies missing ({e.name})")
+    return module
+
+
+@stage("merge")
+def merge(model: ModelUnderTest) -> dict:
+    files = model.files()
+    return {"merge": lambda: strip_keys(merge_modules(files))}
+
+
+@stage("json_schema")
+def json_schema(model: ModelUnderTest) -> dict:
+    schema = model.linkml_schema()
+    from linkml.generators.jsonschemagen import JsonSchemaGenerator
+
+    def generate(cls_name):
+        return lambda: JsonSchemaGenerator(
+            copy.deepcopy(schema), top_class=cls_name, not_closed=True, metadata=False
+        ).serialize()
+
+    return {f"json_schema/{cls_name}": generate(cls_name) for cls_name in model.class_names()}
+
+
+@stage("process_schema")
+def process_schema(model: ModelUnderTest) -> dict:
+    module = _gen_json_schema_module()
+    try:
+        schema = model.linkml_schema()
+        from linkml.generators.jsonschemagen import JsonSchemaGenerator
+
+        raw = {
+            cls_name: JsonSchemaGenerator(copy.deepcopy(schema), top_class=cls_name, not_closed=True, metadata=False).serialize()
+            for cls_name in model.class_names()
+        }
+    except Skip:
+        # Without linkml, post-process the registered schemas again (same traversal, no $refs left).
+        # No `needs`: a scaled model's schemas need linkml too, so they never exist here
+        if model.schemas_dir is None:
+            raise
+        raw = {path.stem: path.read_text() for path in sorted(model.schemas_dir.glob("*.json"))}
+
+    def run():
+        orders = module.property_orders(model.model())
+        for cls_name, text in raw.items():
+            schema = module.process_schema(json.loads(text), cls_name, None, orders.get(cls_name))
+            run_pipeline(schema, cls_name, DEFAULT_PASSES, derived=DERIVED_SCHEMAS)
+
+    return {"process_schema": run}
+
+
+@stage("compare", needs=("ttl",))
+def compare(model: ModelUnderTest) -> dict:
+    if model.ttl is None:
+        raise Skip("no NF.ttl for this model")
+    try:
+        import compare as compare_module
+    except ImportError as e:
+        raise Skip(f"compare.py dependencies missing ({e.name})")
+
+    # "main" is the model itself; "current" drops every 100th template triple, as a PR would change a few
+    g_main = compare_module.load_graph(str(model.ttl))
+    templates = compare_module.get_templates(g_main)
+    changed = sorted(t for t in g_main if t[0] in templates)[::100]
+    g_current = compare_module.load_graph(str(model.ttl))
+    for triple in changed:
+        g_current.remove(triple)
+    current_ttl = model.workdir / "NF_current.ttl"
+    g_current.serialize(str(current_ttl), format="turtle")
+
+    def parse():
+        compare_module.load_graph(str(model.ttl))
+        compare_module.load_graph(str(current_ttl))
+
+    def diff():
+        compare_module.compare_templates(g_main, g_current)
+        compare_module.get_range_changes(g_main, g_current)
+
+    return {"compare/parse": parse, "compare/diff": diff}
+
+
+@stage("check_schema_limits", needs=("json-schemas",))
+def check_schema_limits(model: ModelUnderTest) -> dict:
+    if model.schemas_dir is None:
+        raise Skip("no JSON Schemas for this model")
+    import check_schema_limits as limits
+    from template_attributes import build_attributes, load_attributes, write_attributes
+
+    annotations = {
+        name: definition["annotations"]
+        for name, definition in (model.merged().get("classes") or {}).items()
+        if isinstance(definition, dict) and definition.get("annotations")
+    }
+    attributes = model.workdir / "NF.attributes.jsonl"
+    write_attributes(build_attributes(model.yaml_path(), model.modules_dir, model=model.model(), annotations=annotations), attributes)
+
+    def run():
+        limits.check_enum_sizes(model.modules_dir)
+        limits.check_string_lengths(model.schemas_dir)
+        limits.check_row_sizes_from_attributes(load_attributes(attributes), model.schemas_dir)
+
+    return {"check_schema_limits": run}
+
+
+def synthetic_synonyms(enums: dict) -> dict:
+    """Deterministic OLS-like synonym lists: case variants, near duplicates and genuinely new terms."""
+    synonyms = {}
+    for enum_name, enum_data in enums.items():
+        for term in (enum_data or {}).get("permissible_values") or {}:
+            term = str(term)
+            synonyms[term] = [
+                term,
+                term.upper(),
+                f"{term}s",
+                f"{term} ({enum_name})",
+                term.replace(" ", "-"),
+                f"{enum_name} {term} variant",
+                f"{term[::-1]} alt",
+            ]
+    return synonyms
+
+
+@stage("synonym_filtering")
+def synonym_filtering(model: ModelUnderTest) -> dict:
+    import inject_synonyms
+
+    enums = model.model().get("enums") or {}
+    synonyms = synthetic_synonyms(enums)
+
+    def run():
+        inject_synonyms.normalize_for_comparison.cache_clear()
+        data = {
+            "enums": {
+                name: {"permissible_values": {term: dict(value or {}) for term, value in (enum.get("permissible_values") or {}).items()}}
+                for name, enum in enums.items()
+                if isinstance(enum, dict)
+            }
+        }
+        with contextlib.redirect_stdout(io.StringIO()):
+            inject_synonyms.plan_alias_additions(data, synonyms)
+
+    return {"synonym_filtering": run}
+
+
+@stage("instance_validation", needs=("json-schemas",))
+def instance_validation(model: ModelUnderTest) -> dict:
+    if model.schemas_dir is None:
+        raise Skip("no JSON Schemas for this model")
+    import jsonschema
+
+    cases = []
+    for fixture in sorted(TESTS_DIR.glob("test_registry*.yaml")):
+        for doc in yaml.safe_load_all(fixture.read_text()):
+            if not doc or not (model.schemas_dir / f"{doc['schema']}.json").exists():
+                continue
+            schema = json.loads((model.schemas_dir / f"{doc['schema']}.json").read_text())
+            for instance in doc["instances"]:
+                cases.append((schema, json.loads((TESTS_DIR / instance["file"]).read_text())))
+    if not cases:
+        raise Skip("no test instances for this model's schemas")
+
+    def run():
+        for schema, instance in cases:
+            list(jsonschema.Draft7Validator(schema).iter_errors(instance))
+
+    # The same instances through schema_validators.py modules, compiled once up front
+    compiled = []
+    for schema, instance in cases:
+        namespace = {}
+        exec(compile_schema(schema, schema.get("title", "schema")), namespace)
+        compiled.append((namespace["errors"], instance))
+
+    def run_generated():
+        for errors, instance in compiled:
+            errors(instance)
+
+    return {"instance_validation": run, "instance_validation_generated": run_generated}
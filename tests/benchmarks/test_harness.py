@@ -0,0 +1,53 @@
+"""Tests for the benchmark harness itself (the benchmarks run via run_benchmarks.py)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "utils"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import run_benchmarks
+from run_benchmarks import RESULTS_FORMAT, RESULTS_VERSION, compare_results, measure
+from stages import ModelUnderTest
+
+
+def _results(median, peak_kb):
+    return {
+        "format": RESULTS_FORMAT,
+        "version": RESULTS_VERSION,
+        "results": {"real": {"merge": {"median": median, "peak_kb": peak_kb}}},
+    }
+
+
+def test_measure_reports_time_and_memory():
+    stats = measure(lambda: [0] * 100_000, repeat=2)
+    assert len(stats["runs"]) == 2
+    assert stats["min"] <= stats["median"]
+    assert stats["peak_kb"] > 100_000 * 8 / 1024 * 0.9
+
+
+def test_compare_results_threshold_and_floor():
+    baseline = _results(1.0, 10_000)
+    assert compare_results(_results(1.1, 10_000), baseline, threshold=0.2) == []
+
+    regressions = compare_results(_results(1.5, 20_000), baseline, threshold=0.2)
+    assert {(r["case"], r["metric"]) for r in regressions} == {("merge", "median"), ("merge", "peak_kb")}
+
+    # 3x slower, but by less than the absolute floor
+    assert compare_results(_results(0.003, 10), _results(0.001, 10), threshold=0.2) == []
+
+
+def test_scaled_artifacts_only_for_selected_stages(tmp_path, monkeypatch):
+    built = []
+    monkeypatch.setattr(run_benchmarks, "build", lambda stages, **kwargs: built.extend(stages))
+    model = ModelUnderTest(label="x2", modules_dir=tmp_path, header=tmp_path / "header.yaml", workdir=tmp_path)
+
+    run_benchmarks._generated_artifacts(model, ["merge", "synonym_filtering"])
+    assert built == [] and model.ttl is None and model.schemas_dir is None
+
+    run_benchmarks._generated_artifacts(model, ["compare"])
+    assert built == ["ttl"] and model.ttl == tmp_path / "NF.ttl" and model.schemas_dir is None
+
+    built.clear()
+    run_benchmarks._generated_artifacts(model)
+    assert built == ["ttl", "json-schemas"]
@@ -0,0 +1,108 @@
+"""Tests for resolving annotation values to canonical permissible values."""
+
+import csv
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from alias_resolver import AliasResolver, CandidateIndex, normalize_manifest
+
+ENUMS = {
+    "SequencingAssayEnum": {
+        "permissible_values": {
+            "RNA-seq": {"aliases": ["RNA sequencing"]},
+            "whole genome sequencing": None,
+        }
+    },
+    "AnimalModel": {
+        "permissible_values": {
+            "Nf1+/-": None,
+            "Nf1-/-": None,
+            "Nf1 flox/flox": None,
+            "Nf1 flox/+": None,
+        }
+    },
+    "BatchEnum": {
+        "permissible_values": {
+            "batch A1": None,
+            "batch A2": None,
+        }
+    },
+}
+
+
+def test_exact_alias_and_normalized_matches():
+    resolver = AliasResolver(ENUMS)
+
+    assert resolver.resolve("RNA-seq").match == "exact"
+    alias = resolver.resolve("RNA sequencing")
+    assert (alias.canonical, alias.match) == ("RNA-seq", "alias")
+    normalized = resolver.resolve(" rna_SEQ ")
+    assert (normalized.canonical, normalized.enum, normalized.match) == ("RNA-seq", "SequencingAssayEnum", "normalized")
+    assert resolver.resolve("NF1 +/-").canonical == "Nf1+/-"
+
+
+def test_fuzzy_match_and_ambiguity():
+    resolver = AliasResolver(ENUMS)
+
+    typo = resolver.resolve("Whole Genom Sequencing")
+    assert (typo.canonical, typo.match) == ("whole genome sequencing", "fuzzy")
+    assert resolver.resolve("Whole Genom Sequencing", fuzzy=False) is None
+    # One edit away from two different values: not resolved
+    assert resolver.resolve("batch A3") is None
+    # A word added at the end is a different term, not a typo
+    assert resolver.resolve("RNA-seq X") is None
+    # Restricting the enums restricts the answer
+    assert resolver.resolve("RNA-seq", enums=["AnimalModel"]) is None
+
+
+def test_normalize_values():
+    resolver = AliasResolver(ENUMS)
+
+    assert resolver.normalize_values(["rna seq", "RNA-seq", "unknown"]) == {"rna seq": "RNA-seq"}
+
+
+def test_candidate_index_ranks_closest_values():
+    index = CandidateIndex(ENUMS)
+
+    candidates = index.search("rna sequencing assay", k=2)
+    assert candidates[0].canonical == "RNA-seq"
+    assert candidates[0].matched == "RNA sequencing"
+    assert candidates[0].score > candidates[-1].score or len(candidates) == 1
+    assert index.search("rna sequencing assay", enums=["AnimalModel"]) == []
+    assert index.search("zzzz") == []
+
+
+def test_normalize_manifest_splits_only_multivalued_columns(tmp_path):
+    model = tmp_path / "NF.yaml"
+    model.write_text(yaml.safe_dump({
+        "enums": {
+            **ENUMS,
+            "ReagentEnum": {"permissible_values": {"Anti-NF1, clone 3F3": None, "Anti-NF2": None}},
+        },
+        "slots": {
+            "assay": {"range": "SequencingAssayEnum", "multivalued": True},
+            "antibodyID": {"range": "ReagentEnum"},
+        },
+    }))
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text(
+        "assay,antibodyID\n"
+        '"rna seq,RNA-seq","anti-nf1, clone 3F3"\n'
+        '"RNA-seq,whole genome sequencing","Anti-NF1, clone 3F3"\n'
+    )
+    output = tmp_path / "normalized.csv"
+
+    changes = normalize_manifest(manifest, output, model)
+
+    assert changes == {
+        "assay": {"rna seq": "RNA-seq"},
+        "antibodyID": {"anti-nf1, clone 3F3": "Anti-NF1, clone 3F3"},
+    }
+    rows = list(csv.DictReader(output.open()))
+    assert rows[0] == {"assay": "RNA-seq, RNA-seq", "antibodyID": "Anti-NF1, clone 3F3"}
+    # Nothing in the second row changed, so it is written back verbatim
+    assert rows[1] == {"assay": "RNA-seq,whole genome sequencing", "antibodyID": "Anti-NF1, clone 3F3"}
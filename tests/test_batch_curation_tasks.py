@@ -0,0 +1,124 @@
+"""Tests for batch curation task provisioning (Synapse calls are faked)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+import batch_curation_tasks as batch
+from create_curation_task import resolve_project_id
+
+PROJECT = "org.sagebionetworks.repo.model.Project"
+
+
+class Entity(dict):
+    """Just enough of a synapseclient entity for resolve_project_id."""
+
+    def __init__(self, id, parent=None, concrete_type="org.sagebionetworks.repo.model.Folder"):
+        super().__init__(parentId=parent, concreteType=concrete_type)
+        self.id = id
+        self.properties = {}
+
+
+class FakeSynapse:
+    def __init__(self, *entities):
+        self.entities = {e.id: e for e in entities}
+        self.gets = []
+
+    def get(self, entity_id, downloadFile=False):
+        self.gets.append(entity_id)
+        return self.entities[entity_id]
+
+
+def test_read_manifest(tmp_path):
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text(
+        "folder,template,instructions,recordset_name\n"
+        "syn1,RNASeqTemplate,Annotate please,\n"
+        ",,,\n"
+        " syn2 , DataLandscape ,, Smith_2026 \n"
+    )
+
+    assert batch.read_manifest(manifest) == [
+        {"folder": "syn1", "template": "RNASeqTemplate", "instructions": "Annotate please", "recordset_name": None},
+        {"folder": "syn2", "template": "DataLandscape", "instructions": None, "recordset_name": "Smith_2026"},
+    ]
+
+    manifest.write_text("folder\nsyn1\n")
+    with pytest.raises(ValueError, match="template"):
+        batch.read_manifest(manifest)
+    manifest.write_text("folder,template\nsyn1,RNASeqTemplate\nsyn1,WGSTemplate\n")
+    with pytest.raises(ValueError, match="line 3"):
+        batch.read_manifest(manifest)
+    manifest.write_text("folder,template\nsyn1,\n")
+    with pytest.raises(ValueError, match="line 2"):
+        batch.read_manifest(manifest)
+
+
+def test_project_cache_resolves_siblings_without_requests():
+    syn = FakeSynapse(
+        Entity("syn1", parent="syn10"),
+        Entity("syn2", parent="syn10"),
+        Entity("syn10", parent="syn100"),
+        Entity("syn100", concrete_type=PROJECT),
+    )
+    cache = {}
+
+    assert resolve_project_id("syn1", syn, cache=cache) == "syn100"
+    assert resolve_project_id("syn2", syn, cache=cache) == "syn100"
+    assert resolve_project_id("syn1", syn, cache=cache) == "syn100"
+    assert syn.gets == ["syn1", "syn10", "syn100", "syn2"]
+
+
+def test_provision_batch_shares_schemas_and_collects_row_errors(monkeypatch):
+    syn = FakeSynapse(
+        Entity("syn1", parent="syn100"),
+        Entity("syn2", parent="syn100"),
+        Entity("syn3", parent="syn100"),
+        Entity("syn4", parent="syn100"),
+        Entity("syn5"),  # no parent: project can't be resolved
+        Entity("syn100", concrete_type=PROJECT),
+    )
+    loads = []
+    real_load_schema_uri = batch.load_schema_uri
+    batch.load_schema.cache_clear()
+    monkeypatch.setattr(batch, "login", lambda auth_token=None: syn)
+    monkeypatch.setattr(batch, "load_schema_uri", lambda template: loads.append(template) or real_load_schema_uri(template))
+
+    calls = []
+
+    def create_curation_task(upload_folder_id, template, schema, **kwargs):
+        if upload_folder_id == "syn3":
+            raise RuntimeError("view creation failed")
+        calls.append((upload_folder_id, schema))
+        return {"task_id": f"task-{upload_folder_id}"}
+
+    def create_recordset_task(folder_id, record_set_name, template, schema, **kwargs):
+        calls.append((folder_id, schema))
+        return {"task_id": f"task-{folder_id}"}
+
+    monkeypatch.setattr(batch, "create_curation_task", create_curation_task)
+    monkeypatch.setattr(batch, "create_recordset_task", create_recordset_task)
+    rows = [
+        {"folder": "syn1", "template": "DataLandscape", "instructions": None, "recordset_name": None},
+        {"folder": "syn2", "template": "DataLandscape", "instructions": None, "recordset_name": "Smith_2026"},
+        {"folder": "syn3", "template": "DataLandscape", "instructions": None, "recordset_name": None},
+        {"folder": "syn4", "template": "NoSuchTemplate", "instructions": None, "recordset_name": None},
+        {"folder": "syn5", "template": "DataLandscape", "instructions": None, "recordset_name": None},
+    ]
+
+    results = batch.provision_batch(rows, max_workers=2)
+
+    assert [r["folder"] for r in results] == ["syn1", "syn2", "syn3", "syn4", "syn5"]
+    assert [r["ok"] for r in results] == [True, True, False, False, False]
+    assert results[2]["error"] == "view creation failed"
+    assert "NoSuchTemplate" in results[3]["error"]
+    assert "project" in results[4]["error"]
+    # One schema load per template, shared by file- and record-based rows
+    assert sorted(loads) == ["DataLandscape", "NoSuchTemplate"]
+    schema = batch.load_schema("DataLandscape")
+    assert sorted(calls) == [("syn1", schema), ("syn2", schema)]
+    # syn1-syn4 share a parent, so the hierarchy above them is fetched once
+    assert syn.gets.count("syn100") == 1
@@ -0,0 +1,179 @@
+"""Tests for the in-process module merge used by utils/build.py."""
+
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from build import ROOT, deep_merge, merge_modules, module_files, strip_keys
+
+
+def test_merge_matches_yq_semantics(tmp_path):
+    (tmp_path / "modules" / "A").mkdir(parents=True)
+    (tmp_path / "header.yaml").write_text("id: nf\nslots: {}\n")
+    (tmp_path / "modules" / "props.yaml").write_text("slots:\n  assay: {range: string, in_subset: [core]}\n")
+    (tmp_path / "modules" / "A" / "b.yaml").write_text(
+        "enums:\n  AssayEnum:\n    permissible_values: {RNA-seq: {}}\n"
+        "slots:\n  assay: {range: AssayEnum}\n"
+        "classes:\n  T: {slots: [x], annotations: {templateUsage: most_common}}\n"
+    )
+    (tmp_path / "modules" / "A" / "a.yaml").write_text("classes:\n  T: {slots: [assay, y]}\n")
+
+    files = module_files(tmp_path / "header.yaml", tmp_path / "modules")
+    assert [f.name for f in files] == ["header.yaml", "props.yaml", "a.yaml", "b.yaml"]
+
+    merged = merge_modules(files)
+    assert merged["classes"]["T"]["slots"] == ["x"]  # lists are replaced, not appended
+    assert merged["classes"]["T"]["annotations"] == {"templateUsage": "most_common"}
+
+    model = strip_keys(merged)
+    assert model["slots"]["assay"] == {"range": "AssayEnum"}
+    assert "annotations" not in model["classes"]["T"]
+
+
+def test_deep_merge_replaces_scalars_and_recurses():
+    assert deep_merge({"a": {"b": 1, "c": 2}}, {"a": {"b": 3}}) == {"a": {"b": 3, "c": 2}}
+    assert deep_merge({"a": {"b": 1}}, {"a": None}) == {"a": None}
+
+
+def test_merge_of_repo_modules_matches_dist():
+    dist = ROOT / "dist" / "NF.yaml"
+    with open(dist) as f:
+        expected = yaml.safe_load(f)
+    assert strip_keys(merge_modules(module_files())) == expected
+
+
+def test_stage_cache_round_trip(tmp_path):
+    from build_cache import BuildCache, stage_key
+
+    source = tmp_path / "module.yaml"
+    source.write_text("classes: {}\n")
+    output = tmp_path / "dist" / "NF.yaml"
+    output.parent.mkdir()
+    output.write_text("built\n")
+
+    cache = BuildCache(tmp_path / "cache", root=tmp_path)
+    key = stage_key("yaml", [source], versions={"linkml": "1.8.1"})
+    assert cache.restore("yaml", key) is None
+    cache.store("yaml", key, [output])
+
+    output.unlink()
+    assert cache.restore("yaml", key) == [output]
+    assert output.read_text() == "built\n"
+
+    source.write_text("classes: {T: {}}\n")
+    assert stage_key("yaml", [source], versions={"linkml": "1.8.1"}) != key
+    assert stage_key("yaml", [tmp_path / "module.yaml"], versions={"linkml": "1.9.0"}) != key
+
+
+def test_stage_cache_prune(tmp_path):
+    import os
+    import time
+
+    from build_cache import BuildCache
+
+    cache = BuildCache(tmp_path / "cache", root=tmp_path)
+    old, new = tmp_path / "old.txt", tmp_path / "new.txt"
+    old.write_text("old\n")
+    new.write_text("new\n")
+    cache.store("ttl", "a" * 64, [old])
+    cache.store("ttl", "b" * 64, [new])
+    month_ago = time.time() - 30 * 86400
+    os.utime(cache._manifest("ttl", "a" * 64), (month_ago, month_ago))
+
+    assert cache.prune(keep_days=14) == 1
+    assert cache.restore("ttl", "a" * 64) is None
+    assert cache.restore("ttl", "b" * 64) == [new]
+    assert cache.stats()["objects"] == 1
+
+
+def _generated(tmp_path, cli, emit, filename):
+    """(CLI output, in-process output) of one LinkML emitter on dist/NF.yaml.
+
+    Skips when the generator isn't installed or needs a network fetch
+    (gen-rdf resolves its JSON-LD context online).
+    """
+    import shutil
+    import subprocess
+    from urllib.error import URLError
+
+    import pytest
+
+    if not shutil.which(cli[0]):
+        pytest.skip(f"{cli[0]} is not installed")
+    yaml_path = tmp_path / "NF.yaml"
+    shutil.copy2(ROOT / "dist" / "NF.yaml", yaml_path)
+    expected = tmp_path / f"cli-{filename}"
+    args = [*cli, str(yaml_path)]
+    if cli[0] == "gen-sssom":
+        result = subprocess.run([*args, "-o", str(expected)], capture_output=True, text=True)
+    else:
+        with open(expected, "w") as f:
+            result = subprocess.run(args, stdout=f, stderr=subprocess.PIPE, text=True)
+    if result.returncode and "URLError" in result.stderr:
+        pytest.skip(f"{cli[0]} needs network access")
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    actual = tmp_path / filename
+    try:
+        emit(yaml_path, actual)
+    except URLError:
+        pytest.skip(f"{cli[0]} needs network access")
+    return expected.read_text(), actual.read_text()
+
+
+def test_ttl_emitter_matches_gen_rdf(tmp_path):
+    import pytest
+
+    from build import _emit_ttl
+
+    rdflib = pytest.importorskip("rdflib")
+    from rdflib.compare import isomorphic
+
+    expected, actual = _generated(tmp_path, ["gen-rdf"], _emit_ttl, "NF.ttl")
+    assert isomorphic(rdflib.Graph().parse(data=expected, format="turtle"), rdflib.Graph().parse(data=actual, format="turtle"))
+
+
+def test_jsonld_emitter_matches_gen_jsonld(tmp_path):
+    from build import _emit_jsonld
+
+    expected, actual = _generated(tmp_path, ["gen-jsonld"], _emit_jsonld, "NF_linkml.jsonld")
+
+    def undated(text):
+        return [line for line in text.split("\n") if not line.lstrip().startswith('"generation_date":')]
+
+    # Byte-identical apart from the timestamp, trailing newline from print() included
+    assert undated(actual) == undated(expected)
+    assert '"@context"' in expected
+
+
+def test_sssom_emitter_matches_gen_sssom(tmp_path):
+    from build import _emit_sssom
+
+    expected, actual = _generated(tmp_path, ["gen-sssom"], _emit_sssom, "NF.sssom.tsv")
+
+    def undated(text):
+        return [line for line in text.splitlines() if not line.startswith("#mapping_date:")]
+
+    assert undated(actual) == undated(expected)
+    assert "#mapping_date:" in expected
+
+
+def test_workflow_cache_keys_cover_stage_inputs():
+    import re
+
+    from build import STAGE_SCRIPTS
+    from schema_passes import SUPER_RULES
+
+    inputs = {"header.yaml", "modules/props.yaml", SUPER_RULES.relative_to(ROOT).as_posix()}
+    inputs |= {f"utils/{name}" for names in STAGE_SCRIPTS.values() for name in names}
+    for workflow in ("main-ci.yml", "rebuild-artifacts-on-main.yml"):
+        text = (ROOT / ".github" / "workflows" / workflow).read_text()
+        steps = [step for job in yaml.safe_load(text)["jobs"].values() for step in job["steps"]]
+        (key,) = [step["with"]["key"] for step in steps if step.get("with", {}).get("path") == ".cache/nf-build"]
+        patterns = re.findall(r"'([^']+)'", re.search(r"hashFiles\((.*)\)", key).group(1))
+        covered = {path for path in inputs if any(Path(path).match(p) or path.startswith(p.rstrip("*")) for p in patterns)}
+        assert covered == inputs, f"{workflow}: {sorted(inputs - covered)} not in the cache key"
+        assert re.search(r"linkml==v?([\d.]+)", text).group(1) in key
@@ -0,0 +1,37 @@
+"""Tests for the Synapse schema limit checks."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "utils"))
+
+from check_schema_limits import CONFIG, check_row_sizes, check_row_sizes_from_attributes, check_string_lengths
+from template_attributes import DEFAULT_OUTPUT, load_attributes
+
+SCHEMAS_DIR = ROOT / "registered-json-schemas"
+
+
+@pytest.mark.skipif(not DEFAULT_OUTPUT.exists(), reason="dist/NF.attributes.jsonl not built")
+def test_attribute_rows_match_registered_schemas():
+    from_attributes = check_row_sizes_from_attributes(load_attributes(DEFAULT_OUTPUT), SCHEMAS_DIR)
+
+    assert from_attributes == check_row_sizes(SCHEMAS_DIR)
+    assert {s["name"] for s in from_attributes["schemas"]} == {f.stem for f in SCHEMAS_DIR.glob("*Template.json")}
+
+
+def test_string_lengths_count_every_enum_value(tmp_path):
+    long_value = "x" * (CONFIG["STRING_MAX_SIZE"] + 1)
+    (tmp_path / "T.json").write_text(json.dumps({"properties": {
+        "assay": {"enum": [long_value, long_value + "y", "ok"]},
+        "tags": {"type": "array", "items": {"enum": ["a" * (CONFIG["LIST_MAX_SIZE"] + 1), "b"]}},
+    }}))
+
+    lengths = check_string_lengths(tmp_path)
+
+    assert lengths["string_exceeds"] == 2
+    assert lengths["list_exceeds"] == 1
+    assert lengths["string_max"] == len(long_value) + 1
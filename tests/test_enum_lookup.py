@@ -0,0 +1,58 @@
+"""Tests for the memory-mapped enum lookup file (utils/enum_lookup.py)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from enum_lookup import LookupFile, write_lookup
+from enum_store import EnumStore
+
+ENUMS = {
+    "SequencingAssayEnum": {
+        "permissible_values": {
+            "RNA-seq": {"aliases": ["RNA sequencing", "rnaseq"]},
+            "whole genome sequencing": {"aliases": "WGS"},
+            "Ribo-seq": None,
+        }
+    },
+    "OtherAssayEnum": {"permissible_values": {"RNA-seq": None, "Nf1+/-": None, "café": None}},
+    "EmptyEnum": {"description": "no permissible values"},
+}
+
+
+@pytest.fixture
+def lookup(tmp_path):
+    return LookupFile(write_lookup(ENUMS, tmp_path / "NF.lookup"))
+
+
+def test_membership_matches_enum_store(lookup):
+    store = EnumStore.from_values({
+        "SequencingAssayEnum": (["RNA-seq", "whole genome sequencing", "Ribo-seq"], ["RNA sequencing", "rnaseq", "WGS"]),
+        "OtherAssayEnum": (["RNA-seq", "Nf1+/-", "café"], []),
+    })
+    assert sorted(lookup.enum_names()) == sorted(store) and len(lookup) == 2
+    assert "OtherAssayEnum" in lookup and "EmptyEnum" not in lookup
+    for enum_name in store:
+        for value in [*store.strings, "rna-seq", "missing", ""]:
+            for kind in ("values", "aliases", "all"):
+                assert lookup.contains(enum_name, value, kind) == store.contains(enum_name, value, kind), (enum_name, value, kind)
+    with pytest.raises(KeyError):
+        lookup.contains("EmptyEnum", "RNA-seq")
+
+
+def test_resolve_normalized(lookup):
+    assert sorted(lookup.resolve("rna seq")) == [("OtherAssayEnum", "RNA-seq"), ("SequencingAssayEnum", "RNA-seq")]
+    assert lookup.resolve("RNA  Sequencing!", enums=["SequencingAssayEnum"]) == [("SequencingAssayEnum", "RNA-seq")]
+    assert lookup.resolve("wgs") == [("SequencingAssayEnum", "whole genome sequencing")]
+    assert lookup.resolve("CAFÉ") == [("OtherAssayEnum", "café")]
+    assert lookup.resolve("nf1+/-") == [("OtherAssayEnum", "Nf1+/-")]
+    assert lookup.resolve("unknown") == [] and lookup.resolve("--") == []
+
+
+def test_rejects_other_files(tmp_path):
+    (tmp_path / "NF.yaml").write_text("id: not a lookup file\n")
+    with pytest.raises(ValueError):
+        LookupFile(tmp_path / "NF.yaml")
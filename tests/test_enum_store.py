@@ -0,0 +1,62 @@
+"""Tests for the interned enum store used by review_annotations.py."""
+
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from enum_store import EnumStore
+
+MODULE = {
+    "enums": {
+        "SequencingAssayEnum": {
+            "permissible_values": {
+                "RNA-seq": {"aliases": ["RNA sequencing", "rnaseq"]},
+                "whole genome sequencing": {"aliases": "WGS"},
+            }
+        },
+        "OtherAssayEnum": {"permissible_values": {"RNA-seq": None, "rnaseq": None}},
+        "EmptyEnum": {"description": "no permissible values"},
+    }
+}
+
+
+def test_lookups_match_sets(tmp_path):
+    (tmp_path / "Assay.yaml").write_text(yaml.safe_dump(MODULE))
+    store = EnumStore.from_modules(tmp_path)
+
+    assert sorted(store) == ["OtherAssayEnum", "SequencingAssayEnum"]
+    entry = store["SequencingAssayEnum"]
+    assert set(entry["values"]) == {"RNA-seq", "whole genome sequencing"}
+    assert set(entry["aliases"]) == {"RNA sequencing", "rnaseq", "WGS"}
+    assert list(entry["all"]) == sorted(entry["values"] | entry["aliases"])
+    assert len(entry["all"]) == 5 and len(store["OtherAssayEnum"]["all"]) == 2
+
+    assert "WGS" in entry["all"] and "WGS" not in entry["values"] and "wgs" not in entry["all"]
+    assert store.contains("SequencingAssayEnum", "rnaseq", "aliases")
+    assert not store.contains("OtherAssayEnum", "rnaseq", "aliases")
+    assert store.contains("OtherAssayEnum", "rnaseq", "values")
+    assert not store.contains("OtherAssayEnum", "OtherAssayEnum")  # enum names share the table but aren't members
+
+    # One shared copy of each string
+    assert len(store.strings) == len(set(store.strings)) == 7
+    values = [v for name in store for v in store[name]["values"]]
+    assert values.count("RNA-seq") == 2 and values[0] is store.intern("RNA-seq")
+
+
+def test_unreadable_file_is_reported(tmp_path):
+    (tmp_path / "Good.yaml").write_text(yaml.safe_dump(MODULE))
+    (tmp_path / "Bad.yaml").write_text("enums: [unclosed")
+    errors = []
+    store = EnumStore.from_modules(tmp_path, on_error=lambda path, e: errors.append(path.name))
+    assert errors == ["Bad.yaml"] and "SequencingAssayEnum" in store
+
+
+def test_non_string_yaml_keys_are_stored_as_text(tmp_path):
+    (tmp_path / "Grade.yaml").write_text("enums:\n  GradeEnum:\n    permissible_values:\n      1:\n      no:\n        aliases: [2]\n")
+    store = EnumStore.from_modules(tmp_path)
+
+    assert sorted(store["GradeEnum"]["values"]) == ["1", "False"]
+    assert store.contains("GradeEnum", "2", "aliases")
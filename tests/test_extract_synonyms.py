@@ -0,0 +1,151 @@
+"""Tests for the asynchronous synonym fetch pipeline (no network access)."""
+
+import asyncio
+import csv
+import io
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+import extract_synonyms
+from term_cache import CachedTerm
+
+NCIT_ELISA = "http://purl.obolibrary.org/obo/NCIT_C16553"
+NCIT_HPLC = "http://purl.obolibrary.org/obo/NCIT_C16434"
+
+
+def _rows(csvfile: io.StringIO) -> list[list[str]]:
+    return list(csv.reader(io.StringIO(csvfile.getvalue())))
+
+
+def _found(iri: str) -> dict:
+    return {"source": "ols4", "synonyms": [iri.rsplit("_", 1)[-1]], "label": None, "obsolete": False}
+
+
+def test_rate_limiter_spaces_requests_per_host():
+    limiter = extract_synonyms.HostRateLimiter(rate=20)  # one request every 50 ms per host
+    times = {}
+
+    async def call(name, url):
+        await limiter.wait(url)
+        times[name] = time.monotonic()
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(
+            *(call(f"ols{i}", "https://www.ebi.ac.uk/ols4/api/ontologies") for i in range(4)),
+            call("other", "http://purl.obolibrary.org/obo/NCIT_C16553"),
+        )
+        return start
+
+    start = asyncio.run(run())
+    ols = sorted(times[f"ols{i}"] for i in range(4))
+    assert all(later - earlier >= 0.045 for earlier, later in zip(ols, ols[1:]))
+    # Another host has its own schedule, so it isn't queued behind the first
+    assert times["other"] - start < 0.04
+
+
+def test_pipeline_bounds_concurrency(monkeypatch):
+    in_flight = peak = 0
+
+    async def fetch(iri, limiter):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _found(iri)
+
+    monkeypatch.setattr(extract_synonyms, "fetch_term_async", fetch)
+    iri_terms = {f"http://purl.obolibrary.org/obo/NCIT_C{i}": [f"term {i}"] for i in range(12)}
+
+    written = asyncio.run(extract_synonyms.run_pipeline(iri_terms, io.StringIO(), concurrency=3, rate=0))
+
+    assert written == 12
+    assert peak == 3
+
+
+def test_pipeline_sizes_connection_pool_from_concurrency(monkeypatch):
+    async def fetch(iri, limiter):
+        return _found(iri)
+
+    monkeypatch.setattr(extract_synonyms, "fetch_term_async", fetch)
+    monkeypatch.setattr(extract_synonyms, "_SESSION", None)
+    concurrency = extract_synonyms.MAX_CONCURRENCY + 15
+
+    asyncio.run(extract_synonyms.run_pipeline({NCIT_ELISA: ["ELISA"]}, io.StringIO(), concurrency=concurrency, rate=0))
+
+    adapter = extract_synonyms._session().get_adapter("https://www.ebi.ac.uk/ols4/api")
+    assert adapter._pool_maxsize == concurrency
+    assert adapter._pool_connections == concurrency
+
+
+def test_pipeline_streams_rows_as_iris_complete(monkeypatch):
+    csvfile = io.StringIO()
+    seen_while_slow = []
+
+    async def fetch(iri, limiter):
+        if iri == NCIT_HPLC:
+            # Still running: the other IRI's row must already be in the file
+            await asyncio.sleep(0.05)
+            seen_while_slow.append(csvfile.getvalue())
+        return _found(iri)
+
+    monkeypatch.setattr(extract_synonyms, "fetch_term_async", fetch)
+
+    asyncio.run(extract_synonyms.run_pipeline({NCIT_HPLC: ["HPLC"], NCIT_ELISA: ["ELISA"]}, csvfile, concurrency=2, rate=0))
+
+    assert seen_while_slow == [f"ELISA,{NCIT_ELISA},C16553\r\n"]
+    assert len(_rows(csvfile)) == 2
+
+
+def test_resume_from_existing_csv(tmp_path, monkeypatch):
+    (tmp_path / "dist").mkdir()
+    (tmp_path / "dist" / "NF.yaml").write_text(yaml.safe_dump({
+        "prefixes": {"NCIT": "http://purl.obolibrary.org/obo/NCIT_"},
+        "enums": {"AssayEnum": {"permissible_values": {
+            "ELISA": {"meaning": "NCIT:C16553"},
+            "HPLC": {"meaning": "NCIT:C16434"},
+        }}},
+    }))
+    (tmp_path / "term_synonyms.csv").write_text(f"Term,URLs,Synonyms\nELISA,{NCIT_ELISA},EIA\n")
+    fetched = []
+
+    async def fetch(iri, limiter):
+        fetched.append(iri)
+        return _found(iri)
+
+    monkeypatch.setattr(extract_synonyms, "fetch_term_async", fetch)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["extract_synonyms.py", "--rate-limit", "0"])
+
+    extract_synonyms.main()
+
+    assert fetched == [NCIT_HPLC]
+    assert (tmp_path / "term_synonyms.csv").read_text().splitlines() == [
+        "Term,URLs,Synonyms",
+        f"ELISA,{NCIT_ELISA},EIA",
+        f"HPLC,{NCIT_HPLC},C16434",
+    ]
+
+
+def test_failed_refetch_keeps_stale_entry(monkeypatch):
+    async def fetch(iri, limiter):
+        if iri == NCIT_ELISA:
+            raise ConnectionError("OLS4 unavailable")
+        return {"source": "ols4", "synonyms": ["HPLC"], "label": None, "obsolete": False}
+
+    monkeypatch.setattr(extract_synonyms, "fetch_term_async", fetch)
+    stale = {NCIT_ELISA: CachedTerm(NCIT_ELISA, "ols4", "ELISA", ("EIA",), False, 0.0)}
+    csvfile = io.StringIO()
+
+    written = asyncio.run(extract_synonyms.run_pipeline(
+        {NCIT_ELISA: ["ELISA", "elisa"], NCIT_HPLC: ["HPLC"]}, csvfile, concurrency=2, rate=0, stale=stale
+    ))
+
+    assert written == 3
+    assert sorted(_rows(csvfile)) == [["ELISA", NCIT_ELISA, "EIA"], ["HPLC", NCIT_HPLC, "HPLC"], ["elisa", NCIT_ELISA, "EIA"]]
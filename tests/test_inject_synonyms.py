@@ -0,0 +1,102 @@
+"""Tests for synonym filtering and alias injection in inject_synonyms."""
+
+import sys
+from difflib import SequenceMatcher
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from inject_synonyms import filter_synonyms, inject_synonyms_into_yaml, normalize_for_comparison
+
+
+def reference_filter(term, synonyms, fuzzy_threshold=0.9):
+    """The original pairwise filter, kept as an oracle."""
+    def ratio(a, b):
+        return SequenceMatcher(None, normalize_for_comparison(a), normalize_for_comparison(b)).ratio()
+
+    filtered = []
+    for synonym in synonyms:
+        if synonym == term or normalize_for_comparison(term) == normalize_for_comparison(synonym):
+            continue
+        if any(ratio(synonym, existing) >= fuzzy_threshold for existing in filtered):
+            continue
+        if ratio(synonym, term) < fuzzy_threshold:
+            filtered.append(synonym)
+    return filtered
+
+
+def test_filter_collapses_case_and_near_duplicates():
+    synonyms = [
+        "Malignant Peripheral Nerve Sheath Tumor",
+        "malignant peripheral nerve sheath tumour",
+        "MPNST",
+        "Malignant Schwannoma",
+        "malignant-schwannoma",
+        "mpnst",
+    ]
+    assert filter_synonyms("MPNST", synonyms) == [
+        "Malignant Peripheral Nerve Sheath Tumor",
+        "Malignant Schwannoma",
+    ]
+
+
+def test_filter_matches_pairwise_reference():
+    term = "Neurofibroma"
+    synonyms = [
+        "Neurofibromas", "neuro-fibroma", "Plexiform Neurofibroma", "Plexiform neurofibromas",
+        "NF", "Cutaneous Neurofibroma", "Dermal Neurofibroma", "cutaneous neurofibromas", "",
+    ]
+    for threshold in (0.5, 0.8, 0.9, 1.0):
+        assert filter_synonyms(term, synonyms, threshold) == reference_filter(term, synonyms, threshold)
+
+
+MODULE = """enums:
+  AssayEnum:
+    permissible_values:
+      ELISA:
+        description: Enzyme-linked   immunosorbent assay   # odd spacing is kept
+        meaning: NCIT:C16553
+      HPLC:
+        aliases:
+          - high performance LC
+        meaning: NCIT:C16434
+      Untouched:
+      Western blot:
+  FlowEnum:
+    permissible_values: {flow: {aliases: [a]}}
+"""
+
+
+def test_injection_patches_only_alias_lines(tmp_path):
+    module = tmp_path / "Assay.yaml"
+    module.write_text(MODULE)
+    synonyms = {
+        "ELISA": ["Enzyme-linked Immunosorbent Assay"],
+        "HPLC": ["High Performance Liquid Chromatography"],
+        "Western blot": ["Immunoblot: western"],
+    }
+
+    assert inject_synonyms_into_yaml(str(module), synonyms)
+    assert module.read_text() == MODULE.replace(
+        "        meaning: NCIT:C16553\n",
+        "        meaning: NCIT:C16553\n        aliases:\n        - Enzyme-linked Immunosorbent Assay\n",
+    ).replace(
+        "          - high performance LC\n",
+        "          - high performance LC\n          - High Performance Liquid Chromatography\n",
+    ).replace(
+        "      Western blot:\n",
+        "      Western blot:\n        aliases:\n        - 'Immunoblot: western'\n",
+    )
+    # Nothing new to add: the file is left alone
+    assert not inject_synonyms_into_yaml(str(module), synonyms)
+
+
+def test_injection_falls_back_for_flow_style(tmp_path):
+    module = tmp_path / "Flow.yaml"
+    module.write_text(MODULE)
+
+    assert inject_synonyms_into_yaml(str(module), {"flow": ["flow cytometry"]})
+    data = yaml.safe_load(module.read_text())
+    assert data["enums"]["FlowEnum"]["permissible_values"]["flow"]["aliases"] == ["a", "flow cytometry"]
@@ -0,0 +1,62 @@
+"""Tests for the nfdict entry point (utils/nfdict.py)."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+UTILS_DIR = Path(__file__).resolve().parent.parent / "utils"
+sys.path.insert(0, str(UTILS_DIR))
+
+import nfdict
+
+HEAVY = ("synapseclient", "rdflib", "requests", "tqdm", "jsonref", "pandas")
+
+
+def test_every_command_has_a_main():
+    for name, (script, _, _) in nfdict.COMMANDS.items():
+        assert (UTILS_DIR / script).exists(), name
+        assert "def main(" in (UTILS_DIR / script).read_text(), name
+
+
+def test_validate_runs_generated_validator(tmp_path, capsys):
+    schemas_dir = tmp_path / "schemas"
+    schemas_dir.mkdir()
+    (schemas_dir / "Demo.json").write_text(json.dumps({"properties": {"n": {"type": "integer"}}, "required": ["n"]}))
+    (tmp_path / "good.json").write_text(json.dumps({"n": 1}))
+    (tmp_path / "bad.json").write_text(json.dumps([{"n": "one"}]))
+
+    assert nfdict.main(["validate", "Demo", str(tmp_path / "good.json"), "--schemas-dir", str(schemas_dir)]) == 0
+    assert nfdict.main(["validate", "Demo", str(tmp_path / "bad.json"), "--schemas-dir", str(schemas_dir)]) == 1
+    assert "n [type]" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["validate", "--help"], ["limits", "--help"], ["register", "--help"], ["review", "--help"]])
+def test_help_skips_heavy_imports(argv):
+    code = (
+        "import sys, contextlib, io\n"
+        f"sys.path.insert(0, {str(UTILS_DIR)!r})\n"
+        "import nfdict\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        f"        nfdict.main({argv!r})\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+        f"print([m for m in {HEAVY!r} if m in sys.modules])\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_extract_synonyms_import_has_no_side_effects():
+    pytest.importorskip("yaml")
+    code = (
+        "import signal, sys\n"
+        f"sys.path.insert(0, {str(UTILS_DIR)!r})\n"
+        "import extract_synonyms\n"
+        "print(signal.alarm(0), signal.getsignal(signal.SIGALRM) is signal.SIG_DFL)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["0", "True"]
@@ -0,0 +1,65 @@
+"""Tests for the local ontology dump store used for offline synonym lookups."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from ontology_store import OntologyStore
+
+OBO_SAMPLE = """format-version: 1.2
+ontology: ncit
+
+[Term]
+id: NCIT:C16553
+name: ELISA
+synonym: "Enzyme-linked Immunosorbent Assay" EXACT []
+synonym: "EIA" RELATED []
+is_a: NCIT:C16434 ! Immunoassay
+
+[Term]
+id: NCIT:C00001
+name: retired term
+is_obsolete: true
+
+[Typedef]
+id: part_of
+name: part of
+"""
+
+PREFIXES = {"NCIT": "http://purl.obolibrary.org/obo/NCIT_"}
+
+
+def test_ingest_obo_and_lookup(tmp_path):
+    dump = tmp_path / "ncit.obo"
+    dump.write_text(OBO_SAMPLE)
+
+    with OntologyStore(tmp_path / "store.sqlite") as store:
+        assert store.ingest(dump, prefixes=PREFIXES) == 2
+        term = store.lookup("http://purl.obolibrary.org/obo/NCIT_C16553")
+        all_scopes = store.lookup("http://purl.obolibrary.org/obo/NCIT_C16553", scopes=("EXACT", "RELATED"))
+        obsolete = store.lookup("http://purl.obolibrary.org/obo/NCIT_C00001")
+        missing = store.lookup("http://purl.obolibrary.org/obo/part_of")
+
+    assert term["label"] == "ELISA"
+    assert term["ontology"] == "ncit"
+    assert term["synonyms"] == ["Enzyme-linked Immunosorbent Assay"]
+    assert term["parents"] == ["http://purl.obolibrary.org/obo/NCIT_C16434"]
+    assert all_scopes["synonyms"] == ["Enzyme-linked Immunosorbent Assay", "EIA"]
+    assert obsolete["obsolete"]
+    assert missing is None
+
+
+def test_reingest_replaces_terms(tmp_path):
+    dump = tmp_path / "ncit.obo"
+    dump.write_text(OBO_SAMPLE)
+    path = tmp_path / "store.sqlite"
+    with OntologyStore(path) as store:
+        store.ingest(dump, prefixes=PREFIXES)
+    dump.write_text(OBO_SAMPLE.replace('"EIA" RELATED', '"ELISA test" EXACT'))
+    with OntologyStore(path) as store:
+        store.ingest(dump, prefixes=PREFIXES)
+        term = store.lookup("http://purl.obolibrary.org/obo/NCIT_C16553")
+        assert len(store) == 2
+
+    assert term["synonyms"] == ["Enzyme-linked Immunosorbent Assay", "ELISA test"]
@@ -0,0 +1,112 @@
+"""Tests for process_schema (utils/gen-json-schema-class.py) and the schema_passes.py pipeline."""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("synapseclient")
+
+UTILS_DIR = Path(__file__).resolve().parent.parent / "utils"
+sys.path.insert(0, str(UTILS_DIR))
+
+from schema_passes import CONTENTTYPE_CONDITIONAL, SUPERDATASET_ID, run_pipeline, schema_json
+spec = importlib.util.spec_from_file_location("gen_json_schema_class", UTILS_DIR / "gen-json-schema-class.py")
+gen_json_schema_class = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gen_json_schema_class)
+
+
+def raw_schema():
+    """Trimmed JsonSchemaGenerator output for a template."""
+    return {
+        "$defs": {
+            "TimeUnit": {"description": "Units of time", "enum": ["days", "weeks"], "title": "TimeUnit", "type": "string"},
+            "SexEnum": {"description": "Sex", "enum": ["Female", "Male"], "title": "SexEnum", "type": "string"},
+            "UnknownEnum": {"description": "Unknown", "enum": ["Unknown"], "title": "UnknownEnum", "type": "string"},
+            "OtherTemplate": {"properties": {"unit": {"$ref": "#/$defs/TimeUnit"}}, "type": "object"},
+        },
+        "$id": "https://w3id.org/nf-osi/nf-metadata-dictionary",
+        "$schema": "https://json-schema.org/draft/2019-09/schema",
+        "additionalProperties": True,
+        "if": {"properties": {"age": {}}, "required": ["age"]},
+        "metamodel_version": "1.7.0",
+        "properties": {
+            "Component": {"type": "string"},
+            "age": {"anyOf": [{"type": "number"}, {"$ref": "#/$defs/UnknownEnum"}], "type": "string"},
+            "ageUnit": {"$ref": "#/$defs/TimeUnit", "description": "Unit of age"},
+            "sex": {"anyOf": [{"$ref": "#/$defs/SexEnum"}, {"$ref": "#/$defs/UnknownEnum"}], "type": "string"},
+            "timepointUnit": {"$ref": "#/$defs/TimeUnit"},
+        },
+        "required": ["Component", "sex"],
+        "then": {"properties": {"age": {"maximum": 90}, "ageUnit": {}}, "required": ["age", "ageUnit"]},
+        "title": "nf-metadata-dictionary",
+        "type": "object",
+        "version": "1.0",
+    }
+
+
+def test_process_schema_rewrites():
+    schema = gen_json_schema_class.process_schema(raw_schema(), "DemoTemplate")
+    assert schema["$id"].endswith("org.synapse.nf-demotemplate")
+    assert schema["$schema"] == "http://json-schema.org/draft-07/schema#"
+    for key in ("$defs", "additionalProperties", "metamodel_version", "version"):
+        assert key not in schema
+
+    properties = schema["properties"]
+    assert list(properties) == ["Component", "age", "ageUnit", "sex", "timepointUnit"]
+    assert properties["sex"] == {"type": "string", "enum": ["Female", "Male", "Unknown"], "description": "Sex", "title": "sex"}
+    assert "type" not in properties["age"]  # number or enum, so no top-level type
+    assert properties["age"]["anyOf"][1]["enum"] == ["Unknown"]
+    assert schema["then"]["required"] == ["ageUnit"]  # age only gets a maximum
+
+
+def test_shared_enums_keep_their_own_titles():
+    schema = gen_json_schema_class.process_schema(raw_schema(), "DemoTemplate")
+    properties = schema["properties"]
+    assert properties["ageUnit"]["title"] == "ageUnit"
+    assert properties["timepointUnit"]["title"] == "timepointUnit"
+    assert properties["ageUnit"]["enum"] is properties["timepointUnit"]["enum"]
+
+    # Enum lists and combinations are shared with later classes
+    other = gen_json_schema_class.process_schema(raw_schema(), "OtherTemplate")
+    assert other["properties"]["sex"]["enum"] is properties["sex"]["enum"]
+    assert json.dumps(other["properties"]) == json.dumps(properties)
+
+
+def test_property_orders_follow_is_a_chain():
+    model = {
+        "classes": {
+            "Template": {"slots": ["Component", "Filename"]},
+            "AssayTemplate": {"is_a": "Template", "slots": ["assay", "platform"]},
+            "RNASeqTemplate": {"is_a": "AssayTemplate", "slots": ["libraryStrand", "assay"]},
+            "PortalDataset": {"attributes": {"title": {}, "creator": {}}},
+        }
+    }
+    orders = gen_json_schema_class.property_orders(model)
+    assert orders["RNASeqTemplate"] == ["libraryStrand", "assay", "platform", "Component", "Filename"]
+    assert orders["PortalDataset"] == ["title", "creator"]
+
+    properties = {name: {} for name in ["zeta", "platform", "assay", "libraryStrand"]}
+    raw = {"properties": properties, "type": "object"}
+    schema = gen_json_schema_class.process_schema(raw, "RNASeqTemplate", property_order=orders["RNASeqTemplate"])
+    assert list(schema["properties"]) == ["libraryStrand", "assay", "platform", "zeta"]
+
+
+def test_pipeline_passes_and_derived_schemas():
+    schema = gen_json_schema_class.process_schema(raw_schema(), "PortalDataset")
+    outputs = run_pipeline(schema, "PortalDataset", ["strip-manifest-columns", "contenttype"], derived=["Superdataset"])
+    assert list(outputs) == ["PortalDataset", "Superdataset"]
+    assert "Component" not in schema["properties"] and schema["required"] == ["sex"]
+    assert "allOf" not in schema  # contenttype only applies to templates
+
+    superdataset = outputs["Superdataset"]
+    assert superdataset["$id"] == SUPERDATASET_ID
+    assert "required" not in superdataset and superdataset["then"]["properties"]["contentType"] == {"const": "dataset"}
+    assert schema_json("Superdataset", superdataset).endswith("}\n")
+
+    template = gen_json_schema_class.process_schema(raw_schema(), "DemoTemplate")
+    for _ in range(2):
+        run_pipeline(template, "DemoTemplate", ["contenttype"])
+    assert template["allOf"] == [CONTENTTYPE_CONDITIONAL]
@@ -0,0 +1,68 @@
+"""Tests for the sorted N-Triples bundle used by the docs SPARQL explorer."""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+rdflib = pytest.importorskip("rdflib")
+from rdflib.compare import isomorphic
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from rdf_bundle import ENUMS_GRAPH, build_bundle
+
+TTL = """
+@prefix linkml: <https://w3id.org/linkml/> .
+@prefix nf: <https://w3id.org/synapse/nfosi/vocab/> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+
+nf:platform a linkml:SlotDefinition ;
+    linkml:any_of [ linkml:range nf:PlatformEnum ], [ linkml:range nf:OtherEnum ] .
+
+nf:RNASeqTemplate sh:rule [ linkml:postconditions [ linkml:slot_conditions nf:platform ] ],
+                          [ linkml:postconditions [ linkml:slot_conditions nf:platform ] ] .
+
+nf:PlatformEnum a linkml:EnumDefinition ;
+    linkml:permissible_values nf:NovaSeq .
+nf:NovaSeq linkml:meaning <http://purl.obolibrary.org/obo/OBI_0002630> ;
+    linkml:annotations [ linkml:value "x" ] .
+"""
+
+
+def test_bundle_is_byte_stable_and_complete(tmp_path):
+    ttl = tmp_path / "NF.ttl"
+    ttl.write_text(TTL)
+
+    first = build_bundle(ttl, tmp_path / "a")
+    second = build_bundle(ttl, tmp_path / "b")
+    assert first == second
+    assert (tmp_path / "a" / "NF.nt.gz").read_bytes() == (tmp_path / "b" / "NF.nt.gz").read_bytes()
+
+    lines = gzip.decompress((tmp_path / "a" / "NF.nt.gz").read_bytes()).decode().splitlines()
+    assert lines == sorted(lines)
+    original = rdflib.Graph().parse(data=TTL, format="turtle")
+    restored = rdflib.Graph().parse(data="\n".join(lines), format="nt")
+    assert isomorphic(original, restored)
+
+
+def test_split_moves_enum_values_to_named_graph(tmp_path):
+    ttl = tmp_path / "NF.ttl"
+    ttl.write_text(TTL)
+
+    manifest = build_bundle(ttl, tmp_path, split=True)
+    assert json.loads((tmp_path / "NF.rdf.json").read_text()) == manifest
+
+    files = {entry["file"]: entry for entry in manifest["files"]}
+    assert files["NF.model.nt.gz"]["graph"] is None
+    assert files["NF.enums.nt.gz"]["graph"] == ENUMS_GRAPH
+
+    enums = gzip.decompress((tmp_path / "NF.enums.nt.gz").read_bytes()).decode()
+    model = gzip.decompress((tmp_path / "NF.model.nt.gz").read_bytes()).decode()
+    assert "permissible_values" in enums and "OBI_0002630" in enums and '"x"' in enums
+    assert "NovaSeq" not in model and "EnumDefinition" in model
+    assert files["NF.model.nt.gz"]["triples"] + files["NF.enums.nt.gz"]["triples"] == len(
+        rdflib.Graph().parse(data=TTL, format="turtle")
+    )
@@ -0,0 +1,61 @@
+"""Tests for the change detection in utils/register-schemas.py."""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("synapseclient")
+
+UTILS_DIR = Path(__file__).resolve().parent.parent / "utils"
+spec = importlib.util.spec_from_file_location("register_schemas", UTILS_DIR / "register-schemas.py")
+register_schemas = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(register_schemas)
+
+SCHEMA = {
+    "$id": "https://repo-prod.prod.sagebase.org/repo/v1/schema/type/registered/org.synapse.nf-demotemplate-1.1.0",
+    "properties": {"b": {"maximum": 2, "type": "integer"}, "a": {"enum": ["x", "y"]}},
+    "type": "object",
+}
+
+
+class FakeSynapse:
+    """Answers the two schema endpoints from a fixed registered version."""
+
+    def __init__(self, registered: dict):
+        self.registered = registered
+        self.gets = 0
+
+    def restPOST(self, uri, body):
+        assert uri == "/schema/version/list"
+        return {"page": [
+            {"versionId": "1", "semanticVersion": "1.0.0", "$id": "org.synapse.nf-demotemplate-1.0.0"},
+            {"versionId": "7", "semanticVersion": "1.0.10", "$id": "org.synapse.nf-demotemplate-1.0.10"},
+        ]}
+
+    def restGET(self, uri):
+        assert uri == "/schema/type/registered/org.synapse.nf-demotemplate-1.0.10"
+        self.gets += 1
+        return self.registered
+
+
+def test_canonical_json_ignores_key_order_numbers_and_id():
+    reordered = json.loads(json.dumps(SCHEMA))
+    reordered["$id"] = reordered["$id"].replace("1.1.0", "1.2.0")
+    reordered["properties"]["b"] = {"type": "integer", "maximum": 2.0}
+    assert register_schemas.content_hash(reordered) == register_schemas.content_hash(SCHEMA)
+
+    # Property order is what Synapse displays, so it is a change
+    reordered["properties"] = dict(reversed(list(reordered["properties"].items())))
+    assert register_schemas.content_hash(reordered) != register_schemas.content_hash(SCHEMA)
+
+
+def test_latest_registered_hash_is_cached_by_version_id():
+    assert register_schemas.schema_name(SCHEMA) == ("org.synapse.nf", "demotemplate")
+    syn = FakeSynapse(dict(SCHEMA, **{"$id": "org.synapse.nf-demotemplate-1.0.10"}))
+    cache = {}
+    expected = (register_schemas.content_hash(SCHEMA), "1.0.10")
+    assert register_schemas.latest_registered_hash(syn, "org.synapse.nf", "demotemplate", cache) == expected
+    assert register_schemas.latest_registered_hash(syn, "org.synapse.nf", "demotemplate", cache) == expected
+    assert syn.gets == 1
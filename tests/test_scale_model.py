@@ -0,0 +1,52 @@
+"""Tests for the synthetic scaled-model generator."""
+
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from build import merge_modules, module_files, strip_keys
+from scale_model import dangling_references, scale_modules
+from schema_index import SchemaIndex
+
+MODULE = {
+    "enums": {"AssayEnum": {"permissible_values": {"RNA-seq": {"meaning": "OBI:0001271"}, "RNA-seq 2": None}}},
+    "slots": {"assay": {"range": "AssayEnum"}, "Filename": {"range": "string"}},
+    "classes": {
+        "Template": {"abstract": True},
+        "DataTemplate": {"is_a": "Template", "abstract": True, "slots": ["Filename"]},
+        "RNASeqTemplate": {
+            "is_a": "DataTemplate",
+            "slots": ["assay"],
+            "slot_usage": {"assay": {"required": True}},
+            "rules": [{"postconditions": {"slot_conditions": {"assay": {"equals_string": "RNA-seq"}}}}],
+        },
+    },
+}
+
+
+def test_scale_modules_multiplies_and_keeps_references(tmp_path):
+    (tmp_path / "modules" / "Template").mkdir(parents=True)
+    (tmp_path / "modules" / "Template" / "Data.yaml").write_text(yaml.safe_dump(MODULE, sort_keys=False))
+    (tmp_path / "modules" / "props.yaml").write_text("slots: {}\n")
+    (tmp_path / "header.yaml").write_text("id: nf\n")
+
+    counts = scale_modules(tmp_path / "modules", 3, tmp_path / "x3")
+    assert counts == {"permissible_values": 6, "templates": 3, "slot_usage": 3, "rules": 3}
+
+    model = strip_keys(merge_modules(module_files(tmp_path / "header.yaml", tmp_path / "x3")))
+    values = model["enums"]["AssayEnum"]["permissible_values"]
+    assert len(values) == 6 and len(set(values)) == 6  # "RNA-seq 2" already existed
+    assert values["RNA-seq 3"] == {"meaning": "OBI:0001271"}
+
+    index = SchemaIndex(model)
+    assert index.templates() == ["RNASeqTemplate", "RNASeqTemplateScaled2", "RNASeqTemplateScaled3"]
+    assert index.induced_slot("RNASeqTemplateScaled3", "assay").required is True
+    assert dangling_references(model) == set()
+
+
+def test_dangling_references():
+    model = {"classes": {"A": {"is_a": "Missing", "slots": ["s"], "slot_usage": {"s": {"range": "NoEnum"}}}}, "slots": {"s": {}}}
+    assert dangling_references(model) == {("is_a", "A", "Missing"), ("range", "A.s", "NoEnum")}
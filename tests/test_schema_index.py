@@ -0,0 +1,71 @@
+"""Tests for the class hierarchy and induced-slot index."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from schema_index import SchemaIndex
+
+MODEL = {
+    "default_range": "string",
+    "slots": {
+        "platform": {"range": "PlatformEnum"},
+        "assay": {"any_of": [{"range": "AssayEnum"}, {"range": "string"}]},
+        "Filename": {"required": True},
+    },
+    "classes": {
+        "Template": {"abstract": True},
+        "FileBasedTemplate": {"is_a": "Template", "abstract": True, "slots": ["Filename"]},
+        "SequencingTemplate": {
+            "is_a": "FileBasedTemplate",
+            "slots": ["assay", "platform"],
+            "slot_usage": {"assay": {"range": "SequencingAssayEnum"}},
+        },
+        "RNASeqTemplate": {
+            "is_a": "SequencingTemplate",
+            "slot_usage": {"platform": {"any_of": [{"range": "SequencingPlatformEnum"}, {"range": "OtherEnum"}]}},
+            "attributes": {"libraryKit": {"range": "KitEnum"}},
+        },
+    },
+}
+
+
+def test_hierarchy_closure():
+    index = SchemaIndex(MODEL)
+
+    assert index.children("FileBasedTemplate") == ("SequencingTemplate",)
+    assert index.ancestors("RNASeqTemplate") == ("SequencingTemplate", "FileBasedTemplate", "Template")
+    assert index.descendants("FileBasedTemplate") == {"SequencingTemplate", "RNASeqTemplate"}
+    assert index.is_subclass("RNASeqTemplate", "Template")
+    assert not index.is_subclass("Template", "RNASeqTemplate")
+    assert index.templates() == ["RNASeqTemplate", "SequencingTemplate"]
+
+
+def test_induced_slots_apply_slot_usage_root_first():
+    index = SchemaIndex(MODEL)
+
+    # Own slots first, then the nearest parent's (the JSON Schema property order)
+    assert list(index.induced_slots("RNASeqTemplate")) == ["libraryKit", "assay", "platform", "Filename"]
+    assert index.effective_range("SequencingTemplate", "platform") == ("PlatformEnum",)
+    assert index.effective_range("RNASeqTemplate", "platform") == ("SequencingPlatformEnum", "OtherEnum")
+    # A range in slot_usage replaces the inherited any_of
+    assert index.effective_range("RNASeqTemplate", "assay") == ("SequencingAssayEnum",)
+    assert index.effective_range("RNASeqTemplate", "libraryKit") == ("KitEnum",)
+    assert index.induced_slot("RNASeqTemplate", "Filename").ranges == ("string",)
+    assert index.induced_slot("RNASeqTemplate", "Filename").required
+    assert index.effective_range("Template", "platform") == ()
+
+
+def test_modules_hierarchy_matches_is_a_scan():
+    index = SchemaIndex.from_modules()
+
+    def scan(base):
+        found = set()
+        for name, definition in index.classes.items():
+            if (definition or {}).get("is_a") == base:
+                found |= {name} | scan(name)
+        return found
+
+    assert index.descendants("FileBasedTemplate") == scan("FileBasedTemplate")
+    assert index.descendants("Template") == scan("Template")
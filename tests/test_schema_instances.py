@@ -12,9 +12,13 @@ Each fixture file contains one or more documents with the structure:
 
 Instances marked expected: valid must pass schema validation.
 Instances marked expected: invalid must fail schema validation.
+
+Each instance is also run through the generated validator for its schema
+(utils/schema_validators.py), which must report the same errors.
 """
 
 import json
+import sys
 from pathlib import Path
 
 import jsonschema
@@ -25,21 +29,28 @@ TESTS_DIR = Path(__file__).resolve().parent
 REPO_ROOT = TESTS_DIR.parent
 SCHEMAS_DIR = REPO_ROOT / "registered-json-schemas"
 
+sys.path.insert(0, str(REPO_ROOT / "utils"))
+from schema_validators import load_validator
+
 
-def _load_cases():
+def _load_cases(xfail_invalid=True):
+    """One param per fixture instance; with xfail_invalid, `expected: invalid` ones are strict xfails."""
+    cases = []
     for fixture in sorted(TESTS_DIR.glob("test_registry*.yaml")):
         for doc in yaml.safe_load_all(fixture.read_text()):
             if not doc:
                 continue
             schema_name = doc["schema"]
             for instance in doc["instances"]:
-                yield pytest.param(
+                invalid = instance["expected"] == "invalid"
+                cases.append(pytest.param(
                     schema_name,
                     instance["file"],
                     instance["expected"],
                     id=f"{schema_name}/{Path(instance['file']).stem}[{instance['expected']}]",
-                    marks=pytest.mark.xfail(strict=True, reason=instance.get("reason", "")) if instance["expected"] == "invalid" else [],
-                )
+                    marks=pytest.mark.xfail(strict=True, reason=instance.get("reason", "")) if invalid and xfail_invalid else [],
+                ))
+    return cases
 
 
 @pytest.mark.parametrize("schema_name,file,expected", _load_cases())
@@ -49,3 +60,21 @@ def test_instance(schema_name, file, expected):
     validator = jsonschema.Draft7Validator(schema)
     errors = list(validator.iter_errors(instance))
     assert not errors, "\n".join(f"  - {e.message}" for e in errors)
+
+
+# Not xfailed: the parity checks must pass on the invalid fixtures too (they
+# exercise the if/then conditionals); only their final assertion is expected to fail
+@pytest.mark.parametrize("schema_name,file,expected", _load_cases(xfail_invalid=False))
+def test_instance_generated(schema_name, file, expected):
+    schema = json.loads((SCHEMAS_DIR / f"{schema_name}.json").read_text())
+    instance = json.loads((TESTS_DIR / file).read_text())
+    expected_errors = sorted((tuple(e.absolute_path), e.validator) for e in jsonschema.Draft7Validator(schema).iter_errors(instance))
+    validator = load_validator(schema_name, SCHEMAS_DIR)
+    errors = validator.errors(instance)
+    assert sorted((path, keyword) for path, keyword, _ in errors) == expected_errors
+    assert validator.is_valid(instance) == (not errors)
+    if expected == "invalid":
+        # The strict xfail of test_instance, for the final assertion only
+        assert errors, "expected validation errors, got none"
+        pytest.xfail("expected: invalid")
+    assert not errors, "\n".join(f"  - {message}" for _, _, message in errors)
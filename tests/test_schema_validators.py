@@ -0,0 +1,105 @@
+"""Differential tests: generated validators (utils/schema_validators.py) against jsonschema."""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+from jsonschema import Draft7Validator
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCHEMAS_DIR = REPO_ROOT / "registered-json-schemas"
+sys.path.insert(0, str(REPO_ROOT / "utils"))
+
+from schema_validators import UnsupportedSchema, compile_schema, load_validator, schema_digest, write_validators
+
+# Values tried for every property: wrong types, edge numbers, and the strings the conditionals test for
+CANDIDATES = ["x", 0, 1.5, True, None, ["x"], {}, "org.sagebionetworks.repo.model.Folder", "Raw Data", "dataset"]
+
+
+def _expected(validator, instance):
+    return sorted((tuple(e.absolute_path), e.validator) for e in validator.iter_errors(instance))
+
+
+def _generated(module, instance):
+    return sorted((path, keyword) for path, keyword, _ in module.errors(instance))
+
+
+def _instances(schema, rng, n=20):
+    properties = schema.get("properties", {})
+    base = {}
+    for name, prop in properties.items():
+        enums = [prop.get("enum")] + [option.get("enum") for option in prop.get("anyOf", [])]
+        values = next((e for e in enums if e), None)
+        if values:
+            base[name] = values[0]
+    yield {}
+    yield base
+    for name in properties:
+        for value in CANDIDATES:
+            yield {**base, name: value}
+    for _ in range(n):
+        pool = CANDIDATES + list(base.values())
+        yield {name: rng.choice(pool) for name in properties if rng.random() < 0.5}
+
+
+@pytest.mark.parametrize("path", sorted(SCHEMAS_DIR.glob("*.json")), ids=lambda p: p.stem)
+def test_matches_jsonschema(path):
+    schema = json.loads(path.read_text())
+    validator = Draft7Validator(schema)
+    module = load_validator(path.stem, SCHEMAS_DIR)
+    for instance in _instances(schema, random.Random(path.stem)):
+        expected = _expected(validator, instance)
+        assert _generated(module, instance) == expected, instance
+        assert module.is_valid(instance) == (not expected), instance
+
+
+def test_keyword_semantics():
+    schema = {
+        "type": "object",
+        "properties": {
+            "n": {"type": "integer", "minimum": 1, "exclusiveMaximum": 10},
+            "tags": {"type": "array", "items": {"enum": ["a", 1, True]}, "minItems": 1},
+            "id": {"type": "string", "pattern": "^syn[0-9]+$", "maxLength": 12},
+            "pair": {"items": [{"type": "string"}, {"type": "number"}]},
+            "one": {"oneOf": [{"type": "string"}, {"const": "x"}]},
+        },
+        "if": {"properties": {"n": {"const": 5}}, "required": ["n"]},
+        "then": {"required": ["id"]},
+        "else": {"not": {"required": ["id"]}},
+    }
+    validator = Draft7Validator(schema)
+    namespace = {}
+    exec(compile_schema(schema, "Demo"), namespace)
+    instances = [
+        {"n": 5}, {"n": 5.0, "id": "syn123"}, {"n": True}, {"n": 10}, {"n": 0, "id": "syn1"},
+        {"tags": []}, {"tags": [1.0, "b", 1]}, {"tags": [True, 1, "a"]}, {"tags": "a"},
+        {"id": "SYN1"}, {"id": "syn1234567890"}, {"pair": ["a", "b", 3]}, {"pair": [1]}, {"one": "x"}, {"one": "y"},
+    ]
+    for instance in instances:
+        expected = _expected(validator, instance)
+        assert sorted((p, k) for p, k, _ in namespace["errors"](instance)) == expected, instance
+        assert namespace["is_valid"](instance) == (not expected), instance
+
+
+def test_unsupported_keyword():
+    with pytest.raises(UnsupportedSchema, match="patternProperties"):
+        compile_schema({"patternProperties": {"^x": {"type": "string"}}}, "Demo")
+
+
+def test_load_prefers_current_modules(tmp_path):
+    schemas_dir, validators_dir = tmp_path / "schemas", tmp_path / "validators"
+    schemas_dir.mkdir()
+    (schemas_dir / "Demo.json").write_text(json.dumps({"$id": "demo", "required": ["a"]}))
+    write_validators(schemas_dir, validators_dir)
+    module = load_validator("Demo", schemas_dir, validators_dir)
+    assert module.__file__ == str(validators_dir / "Demo.py")
+    assert module.SCHEMA_SHA256 == schema_digest((schemas_dir / "Demo.json").read_text())
+    assert not module.is_valid({}) and module.errors({"a": 1}) == []
+
+    # A schema edited after the build is compiled in memory instead of using the stale module
+    (schemas_dir / "Other.json").write_text(json.dumps({"$id": "other", "required": ["b"]}))
+    (validators_dir / "Other.py").write_text((validators_dir / "Demo.py").read_text())
+    assert load_validator("Other", schemas_dir, validators_dir).errors({"a": 1})[0][1] == "required"
+    assert not hasattr(load_validator("Other", schemas_dir, validators_dir), "__file__")
@@ -0,0 +1,48 @@
+"""Tests for the opt-in stage profiler."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+import stage_profiling
+from stage_profiling import call_in_worker, record_event, span, start_profiling
+
+
+@pytest.fixture
+def profiler(tmp_path, monkeypatch):
+    monkeypatch.setattr(stage_profiling, "_PROFILER", None)
+    monkeypatch.setattr(stage_profiling.atexit, "register", lambda fn: None)
+    yield start_profiling("test", str(tmp_path / "trace.json"))
+
+
+def test_spans_are_off_by_default(monkeypatch):
+    monkeypatch.setattr(stage_profiling, "_PROFILER", None)
+    monkeypatch.delenv(stage_profiling.PROFILE_ENV, raising=False)
+    assert start_profiling("test") is None
+    with span("ignored"):
+        pass
+
+
+def test_nested_spans_and_trace(profiler):
+    with span("build"):
+        with span("yaml load", "io", path="NF.yaml"):
+            sum(range(10_000))
+        with span("dump", "io"):
+            pass
+    _, event = call_in_worker("emit", lambda: 42)
+    record_event(event)
+
+    profiler.finish()
+    trace = json.loads(profiler.output.read_text())
+    events = {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+    assert set(events) == {"build", "yaml load", "dump", "emit"}
+
+    outer, inner = events["build"], events["yaml load"]
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert inner["cat"] == "io" and inner["args"]["path"] == "NF.yaml"
+    assert inner["args"]["cpu_ms"] >= 0
+    assert "yaml load" in profiler.summary()
@@ -0,0 +1,91 @@
+"""Tests for the per-template attribute artifact."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from schema_index import SchemaIndex
+from template_attributes import DEFAULT_OUTPUT, load_attributes, template_record, write_attributes
+
+SCHEMAS_DIR = Path(__file__).resolve().parent.parent / "registered-json-schemas"
+
+MODEL = {
+    "slots": {
+        "Filename": {"required": True},
+        "assay": {"range": "AssayEnum", "required": True},
+        "age": {"any_of": [{"range": "float"}, {"range": "AgeMask"}]},
+        "readLength": {"range": "integer"},
+        "keywords": {"range": "string", "multivalued": True},
+        "platform": {"range": "PlatformEnum", "multivalued": True},
+    },
+    "enums": {
+        "AssayEnum": {"permissible_values": {"RNA-seq": {}, "whole genome sequencing": {}}},
+        "AgeMask": {"permissible_values": {">= 90": {}}},
+        "PlatformEnum": {"permissible_values": {"Illumina NovaSeq X": {}}},
+    },
+    "classes": {
+        "Template": {"abstract": True},
+        "FileBasedTemplate": {"is_a": "Template", "abstract": True, "slots": ["Filename"]},
+        "SequencingTemplate": {
+            "is_a": "FileBasedTemplate",
+            "slots": ["assay", "age", "readLength", "keywords", "platform"],
+            "rules": [{"preconditions": {"slot_conditions": {"age": {"value_presence": "PRESENT"}}}}],
+        },
+        "RNASeqTemplate": {
+            "is_a": "SequencingTemplate",
+            "rules": [{"postconditions": {"slot_conditions": {"readLength": {"minimum_value": 1}}}}],
+        },
+    },
+}
+
+
+def test_template_record():
+    record = template_record(SchemaIndex(MODEL), "RNASeqTemplate", {"templateUsage": "most_common"})
+    attributes = {a["name"]: a for a in record["attributes"]}
+
+    assert "Filename" not in attributes
+    assert list(attributes) == ["assay", "age", "readLength", "keywords", "platform"]
+    assert record["templateType"] == "file"
+    assert record["depth"] == 3
+    assert record["templateUsage"] == "most_common"
+    assert len(record["rules"]) == 2  # inherited rule first
+
+    assert attributes["assay"]["columnType"] == "STRING"
+    assert attributes["assay"]["required"] is True
+    assert attributes["assay"]["enumValues"] == 2
+    assert attributes["assay"]["maxLength"] == len("whole genome sequencing")
+    assert attributes["age"]["types"] == ["number", "string"]
+    assert attributes["age"]["columnType"] == "STRING"
+    assert attributes["readLength"]["columnType"] == "INTEGER"
+    assert attributes["readLength"]["maxLength"] is None
+    assert attributes["keywords"]["columnType"] == "STRING_LIST"
+    assert attributes["platform"]["columnType"] == "STRING_LIST"
+    assert attributes["platform"]["enums"] == ["PlatformEnum"]
+
+
+def test_round_trip_and_version_check(tmp_path):
+    index = SchemaIndex(MODEL)
+    header = {"format": "nf-template-attributes", "version": 1}
+    path = tmp_path / "NF.attributes.jsonl"
+    write_attributes([header, template_record(index, "RNASeqTemplate")], path)
+
+    assert set(load_attributes(path)) == {"RNASeqTemplate"}
+
+    path.write_text(json.dumps({**header, "version": 0}) + "\n")
+    with pytest.raises(ValueError):
+        load_attributes(path)
+
+
+@pytest.mark.skipif(not DEFAULT_OUTPUT.exists(), reason="dist/NF.attributes.jsonl not built")
+def test_attribute_order_matches_registered_schemas():
+    # Entity views get the same column order from the artifact as from the JSON Schema
+    for name, record in load_attributes(DEFAULT_OUTPUT).items():
+        schema_path = SCHEMAS_DIR / f"{name}.json"
+        if not schema_path.exists():
+            continue
+        properties = list(json.loads(schema_path.read_text()).get("properties") or {})
+        assert [a["name"] for a in record["attributes"] if a["name"] in properties] == properties, name
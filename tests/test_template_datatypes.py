@@ -1,13 +1,15 @@
 """Tests that ensure template classes declare dataType coverage via annotations."""
 
-from pathlib import Path
 import re
-import yaml
+import sys
+from functools import lru_cache
+from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
-TEMPLATE_DIR = REPO_ROOT / "modules" / "Template"
-DATA_ENUM_DIR = REPO_ROOT / "modules" / "Data"
-DATA_BASE_FILE = DATA_ENUM_DIR / "Data.yaml"
+sys.path.insert(0, str(REPO_ROOT / "utils"))
+
+from schema_index import SchemaIndex
+
 OPTIONAL_DATATYPE_TEMPLATES = {
     "AnimalIndividualTemplate",
     "PortalDataset",
@@ -17,30 +19,27 @@ OPTIONAL_DATATYPE_TEMPLATES = {
     "DataLandscape",
     "ProtocolTemplate",
 }
-DATA_FILE = REPO_ROOT / "modules" / "Data" / "Data.yaml"
+
+
+@lru_cache(maxsize=None)
+def _index():
+    """Index of the source modules: load_index() reads dist/NF.yaml, which has no annotations."""
+    return SchemaIndex.from_modules(REPO_ROOT / "modules")
 
 
 def _load_valid_data_types():
     """Return the set of permissible values for Data + Metadata enums."""
+    enums = _index().enums
     values = set()
-    for yaml_path in sorted(DATA_ENUM_DIR.glob("Data*.yaml")):
-        parsed = yaml.safe_load(yaml_path.read_text()) or {}
-        enums = parsed.get("enums") or {}
-        data_enum = enums.get("Data") or {}
-        pv = data_enum.get("permissible_values") or {}
-        values.update(pv.keys())
-    base = yaml.safe_load(DATA_BASE_FILE.read_text())
-    values.update(base["enums"]["MetadataEnum"]["permissible_values"].keys())
+    for enum_name in ("Data", "MetadataEnum"):
+        values.update((enums.get(enum_name) or {}).get("permissible_values") or {})
     return values
 
 
 def _iter_template_classes():
-    """Yield (path, class_name, class_config) for each template class."""
-    for yaml_path in sorted(TEMPLATE_DIR.rglob("*.yaml")):
-        parsed = yaml.safe_load(yaml_path.read_text())
-        classes = parsed.get("classes") or {}
-        for name, config in classes.items():
-            yield yaml_path, name, config
+    """Yield (class_name, class_config) for each template class (every class is defined in modules/Template)."""
+    for name, config in _index().classes.items():
+        yield name, config or {}
 
 
 def test_templates_have_datatype_annotations():
@@ -49,7 +48,7 @@ def test_templates_have_datatype_annotations():
     missing = []
     invalid = []
 
-    for path, name, config in _iter_template_classes():
+    for name, config in _iter_template_classes():
         if config.get("abstract"):
             continue
         annotations = config.get("annotations") or {}
@@ -58,22 +57,22 @@ def test_templates_have_datatype_annotations():
         if not data_types:
             if name in OPTIONAL_DATATYPE_TEMPLATES:
                 continue
-            missing.append((path, name))
+            missing.append(name)
             continue
         if name in OPTIONAL_DATATYPE_TEMPLATES:
             continue
         for value in data_types:
             if value not in valid_values:
-                invalid.append((path, name, value))
+                invalid.append((name, value))
 
     assert not missing, (
         "Missing dataType annotation for templates: "
-        + ", ".join(f"{name} ({path})" for path, name in missing)
+        + ", ".join(missing)
     )
     assert not invalid, (
         "Templates reference undefined dataType values: "
         + ", ".join(
-            f"{name} -> {value} ({path})" for path, name, value in invalid
+            f"{name} -> {value}" for name, value in invalid
         )
     )
 
@@ -84,7 +83,7 @@ def test_template_datatype_defaults_are_valid():
     bad_defaults = []
     pattern = re.compile(r"^string\((.+)\)$")
 
-    for path, name, config in _iter_template_classes():
+    for name, config in _iter_template_classes():
         slot_usage = config.get("slot_usage") or {}
         data_usage = slot_usage.get("dataType") or {}
         if "ifabsent" not in data_usage:
@@ -93,11 +92,11 @@ def test_template_datatype_defaults_are_valid():
         match = pattern.match(raw_value)
         value = match.group(1) if match else raw_value
         if value not in valid_values:
-            bad_defaults.append((path, name, value))
+            bad_defaults.append((name, value))
 
     assert not bad_defaults, (
         "Templates have invalid dataType defaults: "
         + ", ".join(
-            f"{name} -> {value} ({path})" for path, name, value in bad_defaults
+            f"{name} -> {value}" for name, value in bad_defaults
         )
     )
@@ -0,0 +1,47 @@
+"""Tests for the IRI-keyed term cache shared by the synonym tools."""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "utils"))
+
+from term_cache import TermCache
+
+NCIT_ELISA = "http://purl.obolibrary.org/obo/NCIT_C16553"
+NCIT_HPLC = "http://purl.obolibrary.org/obo/NCIT_C16434"
+
+
+def test_put_get_roundtrip(tmp_path):
+    with TermCache(tmp_path / "cache.sqlite") as cache:
+        cache.put(NCIT_ELISA, "ols4", ["Enzyme-linked Immunosorbent Assay"], label="ELISA")
+        entry = cache.get(NCIT_ELISA)
+
+    assert entry.source == "ols4"
+    assert entry.label == "ELISA"
+    assert entry.synonyms == ("Enzyme-linked Immunosorbent Assay",)
+    assert not entry.obsolete
+
+
+def test_cache_persists_between_sessions(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    with TermCache(path) as cache:
+        cache.put(NCIT_ELISA, "none")
+    with TermCache(path) as cache:
+        assert len(cache) == 1
+        assert cache.get(NCIT_ELISA).synonyms == ()
+
+
+def test_partition_dedupes_and_respects_ttl(tmp_path):
+    with TermCache(tmp_path / "cache.sqlite", ttl_days=1) as cache:
+        cache.put(NCIT_ELISA, "ols4", ["EIA"])
+        cache.put(NCIT_HPLC, "ols4", ["High Performance Liquid Chromatography"],
+                  fetched_at=time.time() - 2 * 86400)
+
+        hits, to_fetch = cache.partition([NCIT_ELISA, NCIT_ELISA, NCIT_HPLC, "http://example.org/new"])
+        assert set(hits) == {NCIT_ELISA}
+        assert to_fetch == [NCIT_HPLC, "http://example.org/new"]
+
+        hits, to_fetch = cache.partition([NCIT_ELISA, NCIT_HPLC], refresh_stale=False)
+        assert set(hits) == {NCIT_ELISA, NCIT_HPLC}
+        assert to_fetch == []
@@ -7,38 +7,20 @@ in the Data Curator App, which requires folders to have contentType='dataset'.
 """
 
 import json
+import sys
 from pathlib import Path
 
-# The conditional to add (same as in Superdataset.json)
-CONTENTTYPE_CONDITIONAL = {
-    "if": {
-        "properties": {
-            "concreteType": {
-                "const": "org.sagebionetworks.repo.model.Folder"
-            }
-        },
-        "not": {
-            "properties": {
-                "name": {
-                    "const": "Raw Data"
-                }
-            }
-        }
-    },
-    "then": {
-        "properties": {
-            "contentType": {
-                "const": "dataset"
-            }
-        }
-    }
-}
+sys.path.insert(0, str(Path(__file__).parent))
+from schema_passes import add_contenttype_conditional
 
 
 def add_contenttype_to_schema(schema_path: Path) -> bool:
     """
     Add contentType conditional to a schema if it doesn't already have it.
 
+    The same rewrite runs in memory during generation with
+    `--schema-pass contenttype`; this fixes up already written files.
+
     Args:
         schema_path: Path to the JSON schema file
 
@@ -48,28 +30,11 @@ def add_contenttype_to_schema(schema_path: Path) -> bool:
     with open(schema_path, 'r') as f:
         schema = json.load(f)
 
-    # Check if schema already has contentType in allOf or at root level
-    if 'allOf' in schema:
-        for item in schema['allOf']:
-            if 'then' in item and 'properties' in item['then']:
-                if 'contentType' in item['then']['properties']:
-                    print(f"  ✓ {schema_path.name} already has contentType")
-                    return False
-
-    if 'if' in schema and 'then' in schema:
-        if 'properties' in schema['then'] and 'contentType' in schema['then']['properties']:
-            print(f"  ✓ {schema_path.name} already has contentType at root level")
-            return False
-
-    # Add the conditional
-    if 'allOf' in schema:
-        # Add to existing allOf array
-        schema['allOf'].append(CONTENTTYPE_CONDITIONAL)
-        print(f"  ✓ Added contentType to {schema_path.name} (in allOf)")
-    else:
-        # Create allOf array if it doesn't exist
-        schema['allOf'] = [CONTENTTYPE_CONDITIONAL]
-        print(f"  ✓ Added contentType to {schema_path.name} (created allOf)")
+    had_allof = 'allOf' in schema
+    if not add_contenttype_conditional(schema):
+        print(f"  ✓ {schema_path.name} already has contentType")
+        return False
+    print(f"  ✓ Added contentType to {schema_path.name} ({'in allOf' if had_allof else 'created allOf'})")
 
     # Write back with pretty formatting
     with open(schema_path, 'w') as f:
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Resolve free-text annotation values to canonical enum permissible values.
+
+The resolver is built once from the merged model (dist/NF.yaml) and indexes
+every permissible value and alias of every enum:
+
+- exact index:      value or alias -> canonical value (per enum)
+- normalized index: case/whitespace/punctuation-insensitive key -> canonical
+- fuzzy index:      single-character deletions of each normalized key
+                    (SymSpell-style), catching one-typo variants (the
+                    candidate pairs are confirmed as a single edit)
+
+All three are hash lookups, so resolving a value is O(1) in the size of the
+model. For values that do not resolve, CandidateIndex ranks the closest
+permissible values by trigram similarity through an inverted index.
+review_annotations.py uses it to propose mappings for values that are just
+variants of existing terms, and the `normalize` command rewrites manifest
+columns in bulk.
+
+Usage:
+    # Resolve single values
+    python utils/alias_resolver.py resolve "rna seq" "Whole genome sequencing"
+
+    # Closest permissible values for an unresolved value
+    python utils/alias_resolver.py search "neurofibroma plexiform" --enum Tumor
+
+    # Normalize the enum-valued columns of a manifest
+    python utils/alias_resolver.py normalize manifest.csv --output manifest.normalized.csv
+"""
+
+import argparse
+import csv
+import re
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+
+import yaml
+
+DIST_SCHEMA = Path(__file__).parent.parent / "dist" / "NF.yaml"
+
+# Shortest normalized key eligible for fuzzy (one-edit) matching; below this
+# a single edit changes too much of the string to be a safe mapping
+MIN_FUZZY_LENGTH = 5
+
+_IGNORED = re.compile(r'[^\w+]+|_')
+_WORDS = re.compile(r'[^\W_]+')
+
+
+def normalize_key(text: str) -> str:
+    """Lowercase and drop whitespace and punctuation ('+' is kept, as in Nf1+/-)."""
+    return _IGNORED.sub('', str(text).casefold())
+
+
+def _one_edit(query: str, key: str) -> bool:
+    """
+    True if query and key differ by one substitution, adjacent transposition,
+    or an interior insertion/deletion.
+
+    A character added or dropped at either end is not accepted: it usually
+    means a different term ('NovaSeq' vs 'NovaSeq X'), not a typo.
+    """
+    if len(query) == len(key):
+        diffs = [i for i, (a, b) in enumerate(zip(query, key)) if a != b]
+        if len(diffs) == 1:
+            return True
+        return (len(diffs) == 2 and diffs[1] == diffs[0] + 1
+                and query[diffs[0]] == key[diffs[1]] and query[diffs[1]] == key[diffs[0]])
+    longer, shorter = (query, key) if len(query) > len(key) else (key, query)
+    if len(longer) != len(shorter) + 1:
+        return False
+    return any(longer[:i] + longer[i + 1:] == shorter for i in range(1, len(longer) - 1))
+
+
+def load_model(model_path: Path = DIST_SCHEMA) -> dict:
+    """Load a merged LinkML model (C loader when available)."""
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(model_path, 'r') as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+def iter_terms(enums: dict):
+    """Yield (enum_name, canonical value, text) for every value and alias."""
+    for enum_name, enum_data in (enums or {}).items():
+        for value, value_data in ((enum_data or {}).get('permissible_values') or {}).items():
+            value = str(value)
+            yield enum_name, value, value
+            aliases = value_data.get('aliases') if isinstance(value_data, dict) else None
+            if isinstance(aliases, str):
+                aliases = [aliases]
+            for alias in aliases or []:
+                yield enum_name, value, str(alias)
+
+
+def _deletes(key: str):
+    """All strings obtained by deleting one character from key."""
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """How a free-text value maps onto a permissible value."""
+    value: str
+    enum: str
+    canonical: str
+    match: str  # 'exact', 'alias', 'normalized' or 'fuzzy'
+
+
+class AliasResolver:
+    """Hash-indexed lookup of permissible values and aliases across enums."""
+
+    def __init__(self, enums: dict):
+        """
+        Args:
+            enums: The `enums` section of a LinkML model
+                   ({enum_name: {'permissible_values': {value: {...}}}})
+        """
+        self._exact = defaultdict(dict)        # enum -> {text: (canonical, match)}
+        self._normalized = defaultdict(dict)   # normalized key -> {enum: {canonical}}
+        self._fuzzy = defaultdict(dict)        # deleted key -> {enum: {(canonical, key)}}
+        self.enum_names = []
+
+        for enum_name, enum_data in (enums or {}).items():
+            pvs = (enum_data or {}).get('permissible_values') or {}
+            if not pvs:
+                continue
+            self.enum_names.append(enum_name)
+            exact = self._exact[enum_name]
+            for value, value_data in pvs.items():
+                value = str(value)
+                aliases = (value_data or {}).get('aliases') if isinstance(value_data, dict) else None
+                if isinstance(aliases, str):
+                    aliases = [aliases]
+                exact[value] = (value, 'exact')
+                for alias in aliases or []:
+                    exact.setdefault(str(alias), (value, 'alias'))
+                for text in [value, *(aliases or [])]:
+                    key = normalize_key(text)
+                    if not key:
+                        continue
+                    self._normalized[key].setdefault(enum_name, set()).add(value)
+                    if len(key) >= MIN_FUZZY_LENGTH:
+                        for deleted in _deletes(key) | {key}:
+                            self._fuzzy[deleted].setdefault(enum_name, set()).add((value, key))
+
+    @classmethod
+    def from_model(cls, model_path: Path = DIST_SCHEMA) -> "AliasResolver":
+        """Build a resolver from a merged LinkML model file."""
+        return cls(load_model(model_path).get('enums') or {})
+
+    def __len__(self) -> int:
+        return sum(len(exact) for exact in self._exact.values())
+
+    def resolve(self, value: str, enums=None, fuzzy: bool = True) -> Resolution | None:
+        """
+        Map a free-text value to a canonical permissible value.
+
+        Args:
+            value: The annotation value
+            enums: Enum names to search, in order of preference (default: all)
+            fuzzy: Also accept a single-character edit of a normalized key
+
+        Returns:
+            The best Resolution, or None if nothing matches or the match is
+            ambiguous between several canonical values
+        """
+        value = str(value).strip()
+        enums = self.enum_names if enums is None else [e for e in enums if e in self._exact]
+
+        for enum_name in enums:
+            hit = self._exact[enum_name].get(value)
+            if hit:
+                return Resolution(value, enum_name, hit[0], hit[1])
+
+        key = normalize_key(value)
+        if not key:
+            return None
+        by_enum = self._normalized.get(key, {})
+        for enum_name in enums:
+            if enum_name in by_enum:
+                if len(by_enum[enum_name]) > 1:
+                    return None  # e.g. 'nf1' for both Nf1-/- and Nf1+/-
+                return Resolution(value, enum_name, next(iter(by_enum[enum_name])), 'normalized')
+
+        if not fuzzy or len(key) < MIN_FUZZY_LENGTH:
+            return None
+        candidates = defaultdict(set)
+        for probe in _deletes(key) | {key}:
+            for enum_name, entries in self._fuzzy.get(probe, {}).items():
+                candidates[enum_name].update(c for c, k in entries if _one_edit(key, k))
+        for enum_name in enums:
+            if len(candidates.get(enum_name, ())) == 1:
+                return Resolution(value, enum_name, next(iter(candidates[enum_name])), 'fuzzy')
+        return None
+
+    def normalize_values(self, values, enums=None, fuzzy: bool = True) -> dict[str, str]:
+        """
+        Resolve many values at once.
+
+        Returns:
+            {value: canonical} for every value that resolves to a different string
+        """
+        mapping = {}
+        for value in set(values):
+            resolution = self.resolve(value, enums, fuzzy)
+            if resolution and resolution.canonical != value:
+                mapping[value] = resolution.canonical
+        return mapping
+
+
+def trigrams(text: str) -> set[str]:
+    """Padded word trigrams of a case-folded string (as in PostgreSQL pg_trgm)."""
+    grams = set()
+    for word in _WORDS.findall(str(text).casefold()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """A permissible value close to a free-text value."""
+    canonical: str
+    enum: str
+    matched: str   # the value or alias that matched
+    score: float   # trigram Jaccard similarity, 0-1
+
+
+class CandidateIndex:
+    """
+    Trigram inverted index over every permissible value and alias.
+
+    Posting lists are also kept per enum, so a query restricted to a slot's
+    enums only visits the lists of its own trigrams in those enums.
+    """
+
+    def __init__(self, enums: dict):
+        self._entries = []   # (text, canonical, enum)
+        self._sizes = []     # trigram count per entry
+        self._postings = {}  # enum -> {trigram: [entry id]}
+        self._all = defaultdict(list)  # trigram -> [entry id], across enums
+        for enum_name, canonical, text in iter_terms(enums):
+            grams = trigrams(text)
+            if not grams:
+                continue
+            entry_id = len(self._entries)
+            self._entries.append((text, canonical, enum_name))
+            self._sizes.append(len(grams))
+            postings = self._postings.setdefault(enum_name, defaultdict(list))
+            for gram in grams:
+                postings[gram].append(entry_id)
+                self._all[gram].append(entry_id)
+
+    @classmethod
+    def from_model(cls, model_path: Path = DIST_SCHEMA) -> "CandidateIndex":
+        """Build an index from a merged LinkML model file."""
+        return cls(load_model(model_path).get('enums') or {})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(self, value: str, enums=None, k: int = 5, min_score: float = 0.3) -> list[Candidate]:
+        """
+        Rank permissible values by trigram similarity to value.
+
+        Args:
+            value: Free-text value
+            enums: Only return values of these enums (default: all)
+            k: Maximum number of candidates (one per canonical value)
+            min_score: Minimum Jaccard similarity
+
+        Returns:
+            Up to k Candidates, best first
+        """
+        grams = trigrams(value)
+        if not grams:
+            return []
+        empty = ()
+        overlap = Counter()
+        for postings in ([self._all] if enums is None else [self._postings.get(e) for e in enums]):
+            if postings:
+                overlap.update(chain.from_iterable(postings.get(gram, empty) for gram in grams))
+
+        best = {}
+        n = len(grams)
+        # shared / (n + size - shared) >= min_score implies shared >= min_score * n
+        needed = min_score * n
+        for entry_id, shared in overlap.items():
+            if shared < needed:
+                continue
+            score = shared / (n + self._sizes[entry_id] - shared)
+            if score < min_score:
+                continue
+            text, canonical, enum_name = self._entries[entry_id]
+            key = (enum_name, canonical)
+            if key not in best or score > best[key].score:
+                best[key] = Candidate(canonical, enum_name, text, round(score, 3))
+        return sorted(best.values(), key=lambda c: (-c.score, c.canonical))[:k]
+
+
+def slot_enum_ranges(model: dict) -> dict[str, list[str]]:
+    """Map each slot of a merged model to the enums in its range / any_of."""
+    enum_names = set(model.get('enums') or {})
+    ranges = {}
+    for slot_name, slot in (model.get('slots') or {}).items():
+        slot = slot or {}
+        options = [slot.get('range')] + [o.get('range') for o in slot.get('any_of') or [] if isinstance(o, dict)]
+        enums = [r for r in options if r in enum_names]
+        if enums:
+            ranges[slot_name] = enums
+    return ranges
+
+
+def normalize_manifest(input_path: Path, output_path: Path, model_path: Path = DIST_SCHEMA,
+                       fuzzy: bool = True, delimiter: str = ',') -> dict[str, dict[str, str]]:
+    """
+    Rewrite enum-valued manifest columns to their canonical values.
+
+    Columns are matched to slots by name. Cells of multivalued slots are
+    comma-separated lists and are normalized item by item; any other cell is
+    one value, commas included. A cell is rewritten only when one of its
+    values changes.
+
+    Returns:
+        {column: {original value: canonical value}} for every change made
+    """
+    model = load_model(model_path)
+    resolver = AliasResolver(model.get('enums') or {})
+    ranges = slot_enum_ranges(model)
+    slots = model.get('slots') or {}
+
+    with open(input_path, 'r', newline='') as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        fieldnames = reader.fieldnames or []
+        rows = list(reader)
+
+    changes = {}
+    for column in fieldnames:
+        if column not in ranges:
+            continue
+        multivalued = bool((slots.get(column) or {}).get('multivalued'))
+
+        def cell_items(cell):
+            items = cell.split(',') if multivalued else [cell]
+            return [item.strip() for item in items]
+
+        items = {item for row in rows for item in cell_items(row.get(column) or '') if item}
+        mapping = resolver.normalize_values(items, ranges[column], fuzzy)
+        if not mapping:
+            continue
+        changes[column] = mapping
+        for row in rows:
+            cell_values = cell_items(row.get(column) or '')
+            if any(item in mapping for item in cell_values):
+                row[column] = ', '.join(mapping.get(item, item) for item in cell_values)
+
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=delimiter)
+        writer.writeheader()
+        writer.writerows(rows)
+    return changes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Resolve annotation values to canonical enum values")
+    parser.add_argument('--model', type=Path, default=DIST_SCHEMA, help='Merged model (default: dist/NF.yaml)')
+    parser.add_argument('--no-fuzzy', action='store_false', dest='fuzzy', help='Disable one-edit fuzzy matching')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    resolve = sub.add_parser('resolve', help='Resolve individual values')
+    resolve.add_argument('values', nargs='+')
+    resolve.add_argument('--enum', action='append', dest='enums', help='Restrict to this enum (repeatable)')
+
+    search = sub.add_parser('search', help='Rank the closest permissible values')
+    search.add_argument('values', nargs='+')
+    search.add_argument('--enum', action='append', dest='enums', help='Restrict to this enum (repeatable)')
+    search.add_argument('-k', type=int, default=5, help='Number of candidates (default: 5)')
+
+    normalize = sub.add_parser('normalize', help='Normalize enum-valued columns of a CSV/TSV manifest')
+    normalize.add_argument('manifest', type=Path)
+    normalize.add_argument('--output', type=Path, required=True)
+
+    args = parser.parse_args()
+
+    if args.command == 'resolve':
+        resolver = AliasResolver.from_model(args.model)
+        for value in args.values:
+            r = resolver.resolve(value, args.enums, args.fuzzy)
+            print(f"{value!r} -> {r.canonical!r} ({r.enum}, {r.match})" if r else f"{value!r} -> no match")
+        return 0
+
+    if args.command == 'search':
+        index = CandidateIndex.from_model(args.model)
+        for value in args.values:
+            print(f"{value!r}:")
+            for c in index.search(value, args.enums, args.k):
+                print(f"  {c.score:.3f}  {c.canonical!r} ({c.enum})" + (f" via {c.matched!r}" if c.matched != c.canonical else ""))
+        return 0
+
+    delimiter = '\t' if args.manifest.suffix == '.tsv' else ','
+    changes = normalize_manifest(args.manifest, args.output, args.model, args.fuzzy, delimiter)
+    for column, mapping in sorted(changes.items()):
+        print(f"{column}:")
+        for original, canonical in sorted(mapping.items()):
+            print(f"  {original!r} -> {canonical!r}")
+    print(f"Wrote {args.output} ({sum(len(m) for m in changes.values())} distinct values normalized)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
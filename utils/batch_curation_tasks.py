@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Provision many curation tasks from a CSV manifest in one run.
+
+Each manifest row describes one folder:
+
+    folder,template,instructions,recordset_name
+    syn11111111,RNASeqTemplate,Please annotate RNA-seq files,
+    syn22222222,ImagingAssayTemplate,,
+    syn33333333,DataLandscape,Please fill out records,Smith_2026_Landscape
+
+Rows with a recordset_name create a record-based task (create_recordset_task.py),
+all others create a file-based task (create_curation_task.py). Only folder and
+template are required.
+
+Compared with running the single-folder scripts once per folder, this:
+- Logs in once and shares the Synapse session across all rows
+- Caches project resolution, so sibling folders don't re-traverse the hierarchy
+- Loads each template schema once
+- Lists CurationTasks once per project into a folder-keyed index (replace mode)
+- Provisions tasks concurrently
+
+Requirements:
+  pip install git+https://github.com/Sage-Bionetworks/synapsePythonClient.git@develop
+"""
+
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from create_curation_task import (
+    create_curation_task,
+    fetch_schema,
+    index_curation_tasks,
+    load_schema_uri,
+    login,
+    resolve_project_id,
+)
+from create_recordset_task import create_recordset_task
+
+DEFAULT_FILE_INSTRUCTIONS = "Please add metadata for your files"
+DEFAULT_RECORD_INSTRUCTIONS = "Please update records"
+MAX_WORKERS = 4
+
+
+def read_manifest(manifest_path: str) -> list[dict]:
+    """
+    Read and validate a batch manifest CSV.
+
+    Args:
+        manifest_path: Path to CSV with columns folder, template and optionally
+                       instructions and recordset_name
+
+    Returns:
+        List of row dicts with keys folder, template, instructions, recordset_name
+
+    Raises:
+        ValueError: If required columns are missing or a folder is listed twice
+    """
+    with open(manifest_path, 'r', newline='') as f:
+        reader = csv.DictReader(f)
+        columns = set(reader.fieldnames or [])
+        missing = {"folder", "template"} - columns
+        if missing:
+            raise ValueError(f"Manifest {manifest_path} is missing required column(s): {', '.join(sorted(missing))}")
+
+        rows = []
+        seen = set()
+        for line_num, raw in enumerate(reader, start=2):
+            folder = (raw.get("folder") or "").strip()
+            template = (raw.get("template") or "").strip()
+            if not folder and not template:
+                continue  # blank line
+            if not folder or not template:
+                raise ValueError(f"Manifest line {line_num}: both folder and template are required")
+            if folder in seen:
+                raise ValueError(f"Manifest line {line_num}: folder {folder} is listed more than once")
+            seen.add(folder)
+            rows.append({
+                "folder": folder,
+                "template": template,
+                "instructions": (raw.get("instructions") or "").strip() or None,
+                "recordset_name": (raw.get("recordset_name") or "").strip() or None,
+            })
+    return rows
+
+
+@lru_cache(maxsize=None)
+def load_schema(template: str) -> tuple[str, dict]:
+    """
+    Load (schema_uri, schema_dict) for a template once per run.
+
+    External URIs are fetched here so every row using them shares one request.
+    """
+    schema_uri, json_schema = load_schema_uri(template)
+    if json_schema is None:
+        json_schema = fetch_schema(schema_uri)
+    return schema_uri, json_schema
+
+
+def provision_row(row: dict, syn, project_id: str, task_index: dict, bind_schema: bool, replace: bool) -> dict:
+    """
+    Create the curation task for one manifest row.
+
+    Args:
+        row: Manifest row from read_manifest
+        syn: Shared authenticated Synapse client
+        project_id: Pre-resolved project ID for the row's folder
+        task_index: Folder-keyed CurationTask index of the project (replace mode)
+        bind_schema: Whether to bind the JSON schema
+        replace: Whether to replace an existing file-based task for the folder
+
+    Returns:
+        Result dictionary from the underlying create function
+    """
+    if row["recordset_name"]:
+        return create_recordset_task(
+            folder_id=row["folder"],
+            record_set_name=row["recordset_name"],
+            template=row["template"],
+            instructions=row["instructions"] or DEFAULT_RECORD_INSTRUCTIONS,
+            bind_schema=bind_schema,
+            syn=syn,
+            project_id=project_id,
+            schema=load_schema(row["template"]),
+        )
+    return create_curation_task(
+        upload_folder_id=row["folder"],
+        template=row["template"],
+        instructions=row["instructions"] or DEFAULT_FILE_INSTRUCTIONS,
+        bind_schema=bind_schema,
+        replace=replace,
+        syn=syn,
+        project_id=project_id,
+        schema=load_schema(row["template"]),
+        task_index=task_index,
+    )
+
+
+def provision_batch(
+    rows: list[dict],
+    bind_schema: bool = True,
+    replace: bool = False,
+    max_workers: int = MAX_WORKERS,
+    auth_token: str = None
+) -> list[dict]:
+    """
+    Provision curation tasks for every manifest row with one shared session.
+
+    Project IDs, schemas and (in replace mode) per-project task indexes are
+    resolved up front; the tasks themselves are then created concurrently.
+
+    Args:
+        rows: Manifest rows from read_manifest
+        bind_schema: Whether to bind JSON schemas to folders/RecordSets
+        replace: Replace existing file-based tasks for the listed folders
+        max_workers: Number of tasks provisioned concurrently
+        auth_token: Synapse authentication token (if None, reads from env)
+
+    Returns:
+        One dict per row with folder, template, ok, and either result or error
+    """
+    syn = login(auth_token)
+
+    print(f"Resolving projects for {len(rows)} folder(s)...")
+    project_cache = {}
+    project_ids = {}
+    results = {}
+    for row in rows:
+        try:
+            project_ids[row["folder"]] = resolve_project_id(row["folder"], syn, cache=project_cache)
+        except Exception as e:
+            print(f"✗ {row['folder']}: {e}")
+            results[row["folder"]] = {"folder": row["folder"], "template": row["template"], "ok": False, "error": str(e)}
+
+    print("\nLoading schemas...")
+    for template in sorted({row["template"] for row in rows}):
+        try:
+            print(f"  {load_schema(template)[0]}")
+        except Exception as e:
+            print(f"✗ {template}: {e}")
+            for row in rows:
+                if row["template"] == template and row["folder"] not in results:
+                    results[row["folder"]] = {"folder": row["folder"], "template": template, "ok": False, "error": str(e)}
+
+    # Each folder owns its own index entry, so concurrent pops don't collide
+    task_indexes = {}
+    if replace:
+        for project_id in sorted(set(project_ids.values())):
+            print(f"\nIndexing curation tasks in project {project_id}...")
+            task_indexes[project_id] = index_curation_tasks(project_id)
+            print(f"  {sum(len(t) for t in task_indexes[project_id].values())} task(s) across {len(task_indexes[project_id])} folder(s)")
+
+    pending = [row for row in rows if row["folder"] not in results]
+    print(f"\nProvisioning {len(pending)} task(s) with {max_workers} worker(s)...")
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(
+                provision_row,
+                row,
+                syn,
+                project_ids[row["folder"]],
+                task_indexes.get(project_ids[row["folder"]]),
+                bind_schema,
+                replace,
+            ): row
+            for row in pending
+        }
+        for future in as_completed(futures):
+            row = futures[future]
+            try:
+                result = future.result()
+                results[row["folder"]] = {"folder": row["folder"], "template": row["template"], "ok": True, "result": result}
+                print(f"✅ {row['folder']} ({row['template']}): task {result['task_id']}")
+            except Exception as e:
+                results[row["folder"]] = {"folder": row["folder"], "template": row["template"], "ok": False, "error": str(e)}
+                print(f"❌ {row['folder']} ({row['template']}): {e}")
+
+    return [results[row["folder"]] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Provision Synapse curation tasks for many folders from a CSV manifest",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Provision every folder in the manifest
+  python batch_curation_tasks.py --manifest onboarding.csv
+
+  # Replace existing tasks (e.g. after switching templates)
+  python batch_curation_tasks.py --manifest onboarding.csv --replace
+
+  # Validate the manifest without touching Synapse
+  python batch_curation_tasks.py --manifest onboarding.csv --dry-run
+
+Environment Variables:
+  SYNAPSE_AUTH_TOKEN    Synapse authentication token (required)
+        """
+    )
+    parser.add_argument('--manifest', required=True,
+                        help='CSV with columns folder, template[, instructions, recordset_name]')
+    parser.add_argument('--no-bind-schema', action='store_false', dest='bind_schema',
+                        help='Skip binding JSON schemas')
+    parser.add_argument('--replace', action='store_true', default=False,
+                        help='Delete existing file-based tasks for the listed folders before creating new ones')
+    parser.add_argument('--max-workers', type=int, default=MAX_WORKERS,
+                        help=f'Number of tasks provisioned concurrently (default: {MAX_WORKERS})')
+    parser.add_argument('--output', default=None,
+                        help='Write per-row results as JSON to this file (default: stdout)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Validate the manifest and schemas, then exit')
+
+    args = parser.parse_args()
+
+    try:
+        rows = read_manifest(args.manifest)
+        print(f"Loaded {len(rows)} row(s) from {args.manifest}")
+
+        if args.dry_run:
+            for row in rows:
+                kind = "record-based" if row["recordset_name"] else "file-based"
+                load_schema_uri(row["template"])
+                print(f"  {row['folder']}: {row['template']} ({kind})")
+            return 0
+
+        results = provision_batch(
+            rows,
+            bind_schema=args.bind_schema,
+            replace=args.replace,
+            max_workers=args.max_workers,
+        )
+    except Exception as e:
+        print(f"\n✗ Error: {e}", file=sys.stderr)
+        return 1
+
+    failed = [r for r in results if not r["ok"]]
+    print(f"\n🎉 Batch complete: {len(results) - len(failed)} created, {len(failed)} failed")
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"Results written to {args.output}")
+    else:
+        print("\nResult:")
+        print(output)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Build every dist artifact from one merged, once-loaded model.
+
+`make all` plus gen-json-schema-class.py run yq several times and then start
+a separate gen-rdf, gen-sssom, gen-jsonld and ~70 gen-json-schema processes,
+each of which parses and induces dist/NF.yaml again. This script:
+
+1. merges header.yaml and the modules in-process (same deep merge and
+   annotation/enum_range/in_subset stripping as the Makefile) and writes
+   dist/NF.yaml, through one yq call when yq is installed so the file stays
+   byte-identical to the Makefile's (without yq, PyYAML writes the same
+   model formatted differently, so the file and its hash differ)
+2. loads it into a LinkML SchemaDefinition once
+3. runs the emitters concurrently in forked workers: one JSON Schema per
+   class from that shared, loaded schema (post-processed exactly like
+   gen-json-schema-class.py, through the schema_passes.py pipeline), with
+   Superdataset.json derived in memory from PortalDataset, and NF.ttl,
+   NF.sssom.tsv and NF_linkml.jsonld through the gen-rdf, gen-sssom and
+   gen-jsonld commands themselves, run in the worker (tests/test_build.py
+   checks them against the CLIs)
+4. writes the memory-mappable enum lookup NF.lookup from the merged enums
+   (see enum_lookup.py)
+5. compiles every registered JSON Schema into a Python validator module in
+   dist/validators/ (see schema_validators.py)
+
+Synapse validation of the JSON Schemas stays in gen-json-schema-class.py.
+
+Usage:
+    python utils/build.py                              # everything
+    python utils/build.py --only yaml ttl              # selected stages
+    python utils/build.py --jobs 4 --version 9.14.0
+    python utils/build.py --no-cache                   # ignore .cache/nf-build
+
+Stages are cached by the content of their inputs (see build_cache.py), so a
+checkout whose modules are unchanged restores the artifacts instead of
+regenerating them.
+"""
+
+import argparse
+import contextlib
+import copy
+import dataclasses
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent))
+from build_cache import DEFAULT_CACHE_DIR, BuildCache, stage_key
+from enum_lookup import write_lookup
+from schema_passes import DEFAULT_PASSES, SCHEMA_PASSES, SUPER_RULES, run_pipeline, schema_json, superdataset
+from schema_validators import write_validators
+from stage_profiling import add_profile_argument, call_in_worker, record_event, span, start_profiling
+from template_attributes import build_attributes, write_attributes
+
+ROOT = Path(__file__).parent.parent
+HEADER = ROOT / "header.yaml"
+MODULES_DIR = ROOT / "modules"
+DIST_DIR = ROOT / "dist"
+SCHEMAS_DIR = ROOT / "registered-json-schemas"
+
+STAGES = ("yaml", "ttl", "sssom", "jsonld", "attributes", "lookup", "json-schemas", "superdataset", "validators")
+
+# utils/ scripts whose code shapes each stage's output, hashed into its cache
+# key next to its data inputs. The actions/cache keys in .github/workflows
+# hash these same files (tests/test_build.py checks that they cover them).
+STAGE_SCRIPTS = {
+    "yaml": ("build.py", "build_cache.py"),
+    "ttl": ("build.py", "build_cache.py"),
+    "sssom": ("build.py", "build_cache.py"),
+    "jsonld": ("build.py", "build_cache.py"),
+    "attributes": ("build.py", "build_cache.py", "template_attributes.py", "schema_index.py"),
+    "lookup": ("build.py", "build_cache.py", "enum_lookup.py", "alias_resolver.py"),
+    "json-schemas": ("build.py", "build_cache.py", "gen-json-schema-class.py", "schema_index.py", "schema_passes.py"),
+    "superdataset": ("build.py", "build_cache.py", "schema_passes.py"),
+    "validators": ("build.py", "build_cache.py", "schema_validators.py"),
+}
+
+# Keys removed from the merged model (annotations are kept in modules only)
+STRIPPED_KEYS = ("annotations", "enum_range", "in_subset")
+
+YQ_MERGE = (
+    '. as $item ireduce ({}; . * $item )'
+    ' | del(.. | select(has("annotations")).annotations)'
+    ' | del(.. | select(has("enum_range")).enum_range)'
+    ' | del(.. | select(has("in_subset")).in_subset)'
+)
+
+# Set in the parent before workers fork, so every emitter shares one loaded schema
+_SCHEMA = None
+
+
+def module_files(header: Path = HEADER, modules_dir: Path = MODULES_DIR) -> list[Path]:
+    """Merge inputs in Makefile order: header, props.yaml, then modules/*/*.yaml."""
+    modules_dir = Path(modules_dir)
+    return [Path(header), modules_dir / "props.yaml", *sorted(modules_dir.glob("*/*.yaml"))]
+
+
+def deep_merge(base, override):
+    """yq `*` merge: maps merge recursively, anything else is replaced."""
+    if isinstance(base, dict) and isinstance(override, dict):
+        merged = dict(base)
+        for key, value in override.items():
+            merged[key] = deep_merge(merged[key], value) if key in merged else value
+        return merged
+    return override
+
+
+def strip_keys(node, keys=STRIPPED_KEYS):
+    if isinstance(node, dict):
+        return {k: strip_keys(v, keys) for k, v in node.items() if k not in keys}
+    if isinstance(node, list):
+        return [strip_keys(v, keys) for v in node]
+    return node
+
+
+def merge_modules(files: list[Path]) -> dict:
+    """Deep-merge the module files in order (annotations still included)."""
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    merged = {}
+    for path in files:
+        with span("yaml load", "io", path=path.name), open(path) as f:
+            merged = deep_merge(merged, yaml.load(f, Loader=loader) or {})
+    return merged
+
+
+def _has_mikefarah_yq() -> bool:
+    """The Makefile's yq (github.com/mikefarah/yq), not the jq wrapper of the same name."""
+    if not shutil.which("yq"):
+        return False
+    result = subprocess.run(["yq", "--version"], capture_output=True, text=True)
+    return "mikefarah" in result.stdout + result.stderr
+
+
+def write_merged_yaml(model: dict, files: list[Path], output: Path) -> str:
+    """Write the stripped model to output; returns the tool used ("yq" or "python").
+
+    Only yq reproduces the Makefile's NF.yaml byte for byte. The PyYAML
+    fallback writes the same model with different quoting and line breaks,
+    so the artifacts' modelSha256 won't match a yq-built NF.yaml.
+    """
+    if _has_mikefarah_yq():
+        with span("yq merge", "subprocess"), open(output, "w") as f:
+            subprocess.run(["yq", "eval-all", YQ_MERGE, *map(str, files)], check=True, stdout=f, text=True)
+        return "yq"
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    with span("yaml dump", "io", path=output.name), open(output, "w") as f:
+        yaml.dump(model, f, Dumper=dumper, sort_keys=False, allow_unicode=True, width=2**31 - 1)
+    return "python"
+
+
+def _generator_kwargs(generator_class, **kwargs) -> dict:
+    """Keep only the options this LinkML version's generator accepts."""
+    names = {f.name for f in dataclasses.fields(generator_class)}
+    return {k: v for k, v in kwargs.items() if k in names}
+
+
+def _load_schema(yaml_path: Path):
+    from linkml_runtime.linkml_model import SchemaDefinition
+    from linkml_runtime.loaders import yaml_loader
+
+    return yaml_loader.load(str(yaml_path), SchemaDefinition)
+
+
+def _load_schema_module():
+    """gen-json-schema-class.py, for its process_schema post-processing."""
+    spec = importlib.util.spec_from_file_location("gen_json_schema_class", Path(__file__).parent / "gen-json-schema-class.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Loaded once, before workers fork, so every worker inherits one copy and its
+# interned enum lists (_ENUM_VALUES/_COMBINED_ENUMS) carry over between classes
+_SCHEMA_MODULE = _load_schema_module()
+
+
+def _run_generator_cli(generator: str, args: list[str]) -> str:
+    """Run a LinkML gen-* command's click entry point in this process; returns what it prints.
+
+    The ttl, jsonld and sssom stages go through the commands the Makefile
+    runs (same options and defaults, e.g. gen-rdf's --context and
+    gen-jsonld's trailing newline), so their output is that of `make`. They
+    only save each command's interpreter start and linkml import.
+    """
+    from linkml.generators import jsonldgen, rdfgen, sssomgen
+
+    cli = {"gen-rdf": rdfgen.cli, "gen-jsonld": jsonldgen.cli, "gen-sssom": sssomgen.cli}[generator]
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        cli.main(args, prog_name=generator, standalone_mode=False)
+    return buffer.getvalue()
+
+
+def _emit_ttl(yaml_path: Path, output: Path) -> str:
+    """`gen-rdf dist/NF.yaml > dist/NF.ttl`"""
+    output.write_text(_run_generator_cli("gen-rdf", [str(yaml_path)]))
+    return output.name
+
+
+def _emit_jsonld(yaml_path: Path, output: Path) -> str:
+    """`gen-jsonld dist/NF.yaml > dist/NF_linkml.jsonld`"""
+    output.write_text(_run_generator_cli("gen-jsonld", [str(yaml_path)]))
+    return output.name
+
+
+def _emit_sssom(yaml_path: Path, output: Path) -> str:
+    """`gen-sssom dist/NF.yaml -o dist/NF.sssom.tsv`"""
+    _run_generator_cli("gen-sssom", [str(yaml_path), "-o", str(output)])
+    return output.name
+
+
+def _emit_json_schema(cls_name: str, output_dir: Path, property_order: list[str], version: str | None,
+                      passes=DEFAULT_PASSES, derived=()) -> str:
+    from linkml.generators.jsonschemagen import JsonSchemaGenerator
+
+    options = _generator_kwargs(
+        JsonSchemaGenerator, top_class=cls_name, not_closed=True, metadata=False, inline=True, mergeimports=True
+    )
+    raw_schema = json.loads(JsonSchemaGenerator(copy.deepcopy(_SCHEMA), **options).serialize())
+    final_schema = _SCHEMA_MODULE.process_schema(raw_schema, cls_name, version, property_order)
+    for name, schema in run_pipeline(final_schema, cls_name, passes, derived).items():
+        (Path(output_dir) / f"{name}.json").write_text(schema_json(name, schema))
+    return cls_name
+
+
+def write_superdataset(schemas_dir: Path = SCHEMAS_DIR, rules: Path = SUPER_RULES) -> Path:
+    """Superdataset.json from an already written PortalDataset.json (see schema_passes.superdataset)."""
+    schema = superdataset(json.loads((schemas_dir / "PortalDataset.json").read_text()), rules)
+    output = schemas_dir / "Superdataset.json"
+    output.write_text(schema_json("Superdataset", schema))
+    return output
+
+
+def _pool(jobs: int) -> ProcessPoolExecutor:
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=context)
+
+
+def tool_versions() -> dict:
+    """Versions of the tools whose output lands in the artifacts (part of every cache key)."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    versions = {"python": f"{sys.version_info.major}.{sys.version_info.minor}", "pyyaml": yaml.__version__}
+    try:
+        versions["linkml"] = version("linkml")
+    except PackageNotFoundError:
+        versions["linkml"] = None
+    if _has_mikefarah_yq():
+        versions["yq"] = subprocess.run(["yq", "--version"], capture_output=True, text=True).stdout.strip()
+    return versions
+
+
+def build(
+    stages=STAGES,
+    jobs: int | None = None,
+    version: str | None = None,
+    dist_dir: Path = DIST_DIR,
+    schemas_dir: Path = SCHEMAS_DIR,
+    header: Path = HEADER,
+    modules_dir: Path = MODULES_DIR,
+    cache: BuildCache | None = None,
+    passes=DEFAULT_PASSES,
+) -> dict[str, float]:
+    """Run the selected stages.
+
+    With a cache, each stage is keyed by its inputs (NF.yaml is keyed by the
+    module files, everything downstream by NF.yaml's content) plus the
+    build scripts and tool versions; a hit restores its outputs instead.
+    passes are the schema_passes.py passes applied to every JSON Schema.
+
+    Returns:
+        {stage: seconds}
+    """
+    global _SCHEMA
+    stages = set(stages)
+    dist_dir = Path(dist_dir)
+    schemas_dir = Path(schemas_dir)
+    yaml_path = dist_dir / "NF.yaml"
+    dist_dir.mkdir(parents=True, exist_ok=True)
+    timings = {}
+    versions = tool_versions()
+    scripts = {stage: [Path(__file__).parent / name for name in names] for stage, names in STAGE_SCRIPTS.items()}
+    files = module_files(header, modules_dir)
+    merged = None
+
+    # Inputs read (and hashed for the cache key) by stages that don't produce them in this run
+    required = {}
+    if stages & {"yaml", "attributes", "lookup"}:
+        required.update((path, "model source") for path in files)
+    if "yaml" not in stages and stages & {"ttl", "sssom", "jsonld", "attributes", "json-schemas"}:
+        required[yaml_path] = "build it with the yaml stage"
+    if "superdataset" in stages and "json-schemas" not in stages:
+        required[schemas_dir / "PortalDataset.json"] = "build it with the json-schemas stage"
+    missing = [f"{path} ({why})" for path, why in required.items() if not path.exists()]
+    if missing:
+        raise RuntimeError(f"Missing input(s) for --only {' '.join(s for s in STAGES if s in stages)}: {', '.join(missing)}")
+
+    def merged_model():
+        nonlocal merged
+        if merged is None:
+            merged = merge_modules(files)
+        return merged
+
+    def restore(stage, key):
+        if cache is None:
+            return False
+        start = time.perf_counter()
+        with span("cache restore", "io", stage=stage):
+            restored = cache.restore(stage, key)
+        if restored is None:
+            return False
+        timings[stage] = time.perf_counter() - start
+        print(f"♻️  {stage}: {len(restored)} file(s) restored from cache")
+        return True
+
+    def store(stage, key, outputs):
+        if cache is not None:
+            with span("cache store", "io", stage=stage):
+                cache.store(stage, key, outputs)
+
+    if "yaml" in stages:
+        key = stage_key("yaml", [*files, *scripts["yaml"]], versions=versions)
+        if not restore("yaml", key):
+            start = time.perf_counter()
+            with span("yaml"):
+                tool = write_merged_yaml(strip_keys(merged_model()), files, yaml_path)
+            timings["yaml"] = time.perf_counter() - start
+            store("yaml", key, [yaml_path])
+            print(f"✅ {yaml_path.name} ({len(files)} files merged, written with {tool}) in {timings['yaml']:.1f}s")
+            if tool == "python":
+                print(f"⚠️  mikefarah yq not found: {yaml_path.name} has the same content as `make NF.yaml` but not the same bytes")
+
+    if "attributes" in stages:
+        key = stage_key("attributes", [yaml_path, *files, *scripts["attributes"]], versions=versions)
+        if not restore("attributes", key):
+            start = time.perf_counter()
+            with span("attributes"):
+                annotations = {
+                    name: definition["annotations"]
+                    for name, definition in (merged_model().get("classes") or {}).items()
+                    if isinstance(definition, dict) and definition.get("annotations")
+                }
+                lines = build_attributes(yaml_path, modules_dir, model=strip_keys(merged_model()), annotations=annotations)
+                output = dist_dir / "NF.attributes.jsonl"
+                with span("jsonl dump", "io"):
+                    write_attributes(lines, output)
+            timings["attributes"] = time.perf_counter() - start
+            store("attributes", key, [output])
+            print(f"✅ NF.attributes.jsonl ({len(lines) - 1} templates) in {timings['attributes']:.1f}s")
+
+    if "lookup" in stages:
+        key = stage_key("lookup", [*files, *scripts["lookup"]], versions=versions)
+        if not restore("lookup", key):
+            start = time.perf_counter()
+            with span("lookup"):
+                output = write_lookup(strip_keys(merged_model()).get("enums") or {}, dist_dir / "NF.lookup")
+            timings["lookup"] = time.perf_counter() - start
+            store("lookup", key, [output])
+            print(f"✅ {output.name} ({output.stat().st_size / 1024:.0f} KB) in {timings['lookup']:.1f}s")
+
+    emitters = {"ttl": (_emit_ttl, "NF.ttl"), "sssom": (_emit_sssom, "NF.sssom.tsv"), "jsonld": (_emit_jsonld, "NF_linkml.jsonld")}
+    pending = {}
+    superdataset_written = False
+    for stage in ("ttl", "sssom", "jsonld", "json-schemas"):
+        if stage in stages:
+            options = {"passes": list(passes), "version": version} if stage == "json-schemas" else {}
+            key = stage_key(stage, [yaml_path, *scripts[stage]], versions=versions, **options)
+            if not restore(stage, key):
+                pending[stage] = key
+
+    if pending:
+        if "json-schemas" in pending:
+            start = time.perf_counter()
+            with span("linkml load", "io"):
+                _SCHEMA = _load_schema(yaml_path)
+            print(f"✅ Loaded {yaml_path.name} into LinkML once in {time.perf_counter() - start:.1f}s")
+
+        tasks = {}
+        outputs = {stage: [] for stage in pending}
+        with _pool(jobs or os.cpu_count() or 1) as pool:
+            for stage, (emit, filename) in emitters.items():
+                if stage in pending:
+                    tasks[pool.submit(call_in_worker, stage, emit, yaml_path, dist_dir / filename)] = (stage, time.perf_counter())
+                    outputs[stage].append(dist_dir / filename)
+            if "json-schemas" in pending:
+                schemas_dir.mkdir(parents=True, exist_ok=True)
+                orders = _SCHEMA_MODULE.property_orders(strip_keys(merged_model()))
+                # Superdataset is written by the PortalDataset worker, from the schema in memory
+                derived = ["Superdataset"] if "superdataset" in stages else []
+                superdataset_written = bool(derived) and "PortalDataset" in orders
+                for cls_name, order in orders.items():
+                    future = pool.submit(call_in_worker, "json-schema", _emit_json_schema, cls_name, schemas_dir, order, version, passes, derived)
+                    tasks[future] = ("json-schemas", time.perf_counter())
+                    outputs["json-schemas"].append(schemas_dir / f"{cls_name}.json")
+
+            failed = []
+            for future in as_completed(tasks):
+                stage, submitted = tasks[future]
+                try:
+                    name, event = future.result()
+                    record_event(event)
+                except Exception as e:
+                    failed.append(stage)
+                    print(f"  ❌ {stage}: {e}")
+                    continue
+                timings[stage] = max(timings.get(stage, 0.0), time.perf_counter() - submitted)
+                if stage != "json-schemas":
+                    print(f"  ✅ {name} in {timings[stage]:.1f}s")
+            if "json-schemas" in pending:
+                n_schemas = len(outputs["json-schemas"])
+                print(f"  ✅ {n_schemas - failed.count('json-schemas')}/{n_schemas} JSON schemas in {timings.get('json-schemas', 0.0):.1f}s")
+
+        for stage, key in pending.items():
+            if stage not in failed:
+                store(stage, key, outputs[stage])
+        if failed:
+            raise RuntimeError(f"{len(failed)} emitter task(s) failed: {', '.join(sorted(set(failed)))}")
+
+    if "superdataset" in stages:
+        key = stage_key("superdataset", [schemas_dir / "PortalDataset.json", SUPER_RULES, *scripts["superdataset"]], versions=versions)
+        if superdataset_written:
+            store("superdataset", key, [schemas_dir / "Superdataset.json"])
+            print("✅ Superdataset.json (written with PortalDataset.json)")
+        elif not restore("superdataset", key):
+            start = time.perf_counter()
+            with span("superdataset"):
+                output = write_superdataset(schemas_dir)
+            timings["superdataset"] = time.perf_counter() - start
+            store("superdataset", key, [output])
+            print(f"✅ {output.name} in {timings['superdataset']:.1f}s")
+
+    if "validators" in stages:
+        schema_files = sorted(schemas_dir.glob("*.json"))
+        validators_dir = dist_dir / "validators"
+        key = stage_key("validators", [*schema_files, *scripts["validators"]], versions=versions)
+        if not restore("validators", key):
+            start = time.perf_counter()
+            with span("validators"):
+                written = write_validators(schemas_dir, validators_dir)
+            timings["validators"] = time.perf_counter() - start
+            store("validators", key, written)
+            print(f"✅ {len(written)} validators in {validators_dir} in {timings['validators']:.1f}s")
+
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build all dist artifacts and JSON Schemas from one loaded model")
+    parser.add_argument("--only", nargs="+", choices=STAGES, default=list(STAGES), help="Stages to run (default: all)")
+    parser.add_argument("--jobs", type=int, default=None, help="Concurrent emitter processes (default: CPU count)")
+    parser.add_argument("--version", default=None, help="Semantic version to include in JSON Schema URIs")
+    parser.add_argument("--dist-dir", type=Path, default=DIST_DIR, help="Output directory for dist artifacts")
+    parser.add_argument("--schemas-dir", type=Path, default=SCHEMAS_DIR, help="Output directory for JSON Schemas")
+    parser.add_argument("--header", type=Path, default=HEADER, help="Model header (default: header.yaml)")
+    parser.add_argument("--modules-dir", type=Path, default=MODULES_DIR, help="Modules directory (default: modules)")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Stage cache (default: $NF_BUILD_CACHE or .cache/nf-build)")
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild every stage and leave the cache untouched")
+    parser.add_argument("--schema-pass", dest="schema_passes", action="append", default=[],
+                        choices=[name for name in SCHEMA_PASSES if name not in DEFAULT_PASSES],
+                        help="Extra in-memory JSON Schema pass (see schema_passes.py); repeatable")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profiling("build", args.profile)
+
+    cache = None if args.no_cache else BuildCache(args.cache_dir)
+    start = time.perf_counter()
+    try:
+        build(args.only, jobs=args.jobs, version=args.version, dist_dir=args.dist_dir, schemas_dir=args.schemas_dir,
+              header=args.header, modules_dir=args.modules_dir, cache=cache, passes=(*DEFAULT_PASSES, *args.schema_passes))
+    except (RuntimeError, ImportError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    summary = f" ({cache.hits} cached, {cache.misses} built)" if cache else ""
+    print(f"🎉 Build complete in {time.perf_counter() - start:.1f}s{summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
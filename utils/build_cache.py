@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for build.py stages.
+
+Make only compares mtimes, so a fresh CI checkout rebuilds every artifact.
+Here each stage is keyed by a hash of what it reads (file contents, tool
+versions, options) and its outputs are stored by content hash:
+
+    <cache dir>/objects/ab/abcdef...     output file contents, by sha256
+    <cache dir>/stages/<stage>/<key>.json  {relative output path: sha256}
+
+A stage whose key is already in the cache gets its outputs copied back
+instead of being rebuilt. Identical outputs from different keys are stored
+once. The directory can be persisted between CI runs (actions/cache).
+
+Usage:
+    python utils/build_cache.py stats
+    python utils/build_cache.py clear
+    python utils/build_cache.py prune --keep-days 14
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_CACHE_DIR = Path(os.environ.get("NF_BUILD_CACHE", ROOT / ".cache" / "nf-build"))
+
+# Bump when the key or manifest layout changes so old entries are ignored
+CACHE_VERSION = 1
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def stage_key(stage: str, files: list[Path] = (), **params) -> str:
+    """Cache key for one stage run.
+
+    Args:
+        stage: Stage name
+        files: Input files; their contents (not mtimes) go into the key
+        **params: Tool versions and options, anything JSON-serializable
+
+    Returns:
+        Hex sha256 of the stage, CACHE_VERSION, input contents and params
+    """
+    h = hashlib.sha256(f"{CACHE_VERSION}:{stage}\n".encode())
+    for path in files:
+        path = Path(path)
+        try:
+            label = path.resolve().relative_to(ROOT.resolve()).as_posix()
+        except ValueError:
+            label = path.name
+        h.update(f"{label} {file_digest(path)}\n".encode())
+    h.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class BuildCache:
+    """Store and restore stage outputs under a cache directory."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, root: Path = ROOT):
+        self.cache_dir = Path(cache_dir)
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+
+    def _object(self, digest: str) -> Path:
+        return self.cache_dir / "objects" / digest[:2] / digest
+
+    def _manifest(self, stage: str, key: str) -> Path:
+        return self.cache_dir / "stages" / stage / f"{key}.json"
+
+    def _relative(self, path: Path) -> str:
+        path = Path(path).resolve()
+        try:
+            return path.relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def restore(self, stage: str, key: str) -> list[Path] | None:
+        """Copy a stage's cached outputs into place.
+
+        Returns:
+            The restored paths, or None on a miss (nothing is written then)
+        """
+        manifest = self._manifest(stage, key)
+        try:
+            outputs = json.loads(manifest.read_text())["outputs"]
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        if not all(self._object(digest).exists() for digest in outputs.values()):
+            self.misses += 1
+            return None
+
+        restored = []
+        for relative, digest in outputs.items():
+            target = self.root / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if not (target.exists() and file_digest(target) == digest):
+                shutil.copyfile(self._object(digest), target)
+            restored.append(target)
+        os.utime(manifest)  # last use, for prune
+        self.hits += 1
+        return restored
+
+    def store(self, stage: str, key: str, outputs: list[Path]) -> None:
+        """Record a stage's freshly built outputs under key."""
+        entries = {}
+        for path in outputs:
+            digest = file_digest(path)
+            obj = self._object(digest)
+            if not obj.exists():
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                # Copy then rename, so a concurrent or interrupted run never sees a partial object
+                fd, tmp = tempfile.mkstemp(dir=obj.parent)
+                os.close(fd)
+                shutil.copyfile(path, tmp)
+                os.replace(tmp, obj)
+            entries[self._relative(path)] = digest
+
+        manifest = self._manifest(stage, key)
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = manifest.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"stage": stage, "created": time.time(), "outputs": entries}, indent=2))
+        os.replace(tmp, manifest)
+
+    def stats(self) -> dict:
+        manifests = list((self.cache_dir / "stages").glob("*/*.json"))
+        objects = list((self.cache_dir / "objects").glob("*/*"))
+        return {
+            "stages": sorted({m.parent.name for m in manifests}),
+            "entries": len(manifests),
+            "objects": len(objects),
+            "bytes": sum(o.stat().st_size for o in objects),
+        }
+
+    def prune(self, keep_days: float) -> int:
+        """Drop entries unused for keep_days, then objects no entry references.
+
+        Returns:
+            Number of entries removed
+        """
+        cutoff = time.time() - keep_days * 86400
+        removed = 0
+        referenced = set()
+        for manifest in (self.cache_dir / "stages").glob("*/*.json"):
+            if manifest.stat().st_mtime < cutoff:
+                manifest.unlink()
+                removed += 1
+                continue
+            referenced.update(json.loads(manifest.read_text())["outputs"].values())
+        for obj in (self.cache_dir / "objects").glob("*/*"):
+            if obj.name not in referenced:
+                obj.unlink()
+        return removed
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Inspect or clean the build.py stage cache")
+    parser.add_argument("command", choices=["stats", "clear", "prune"])
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Cache directory (default: $NF_BUILD_CACHE or .cache/nf-build)")
+    parser.add_argument("--keep-days", type=float, default=14, help="prune: keep entries used within this many days")
+    args = parser.parse_args()
+
+    cache = BuildCache(args.cache_dir)
+    if args.command == "clear":
+        cache.clear()
+        print(f"✅ Cleared {args.cache_dir}")
+    elif args.command == "prune":
+        removed = cache.prune(args.keep_days)
+        print(f"✅ Removed {removed} entries unused for {args.keep_days:g} days")
+    else:
+        stats = cache.stats()
+        print(f"📦 {args.cache_dir}: {stats['entries']} entries, {stats['objects']} objects, {stats['bytes'] / 1024:.0f} KB")
+        for stage in stats["stages"]:
+            print(f"  - {stage}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,15 @@ Checks against FILE VIEW configuration limits (stricter than JSON schema):
 Note: JSON schemas can have larger enums and longer strings for validation.
 File views require stricter limits due to 64KB row size constraint.
 Note: Synapse no longer enforces a 100-value limit on enums.
+
+String lengths are measured on the registered JSON schemas, which is what
+Synapse enforces: LinkML's JSON Schema generator drops a slot's any_of
+enums when a class restates the slot in slot_usage, so the effective ranges
+in the attribute artifact can list enums a registered schema doesn't have.
+Row sizes are counted from the per-template attribute artifact
+(dist/NF.attributes.jsonl, see template_attributes.py) when it exists, for
+the same registered Template schemas, and from the JSON schemas otherwise;
+both give the same report.
 """
 
 import json
@@ -17,6 +26,10 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Any
 
+sys.path.insert(0, str(Path(__file__).parent))
+from stage_profiling import add_profile_argument, span, start_profiling
+from template_attributes import DEFAULT_OUTPUT as ATTRIBUTES_PATH, load_attributes
+
 # Configuration from json_schema_entity_view.py and create_curation_task.py
 CONFIG = {
     'STRING_MAX_SIZE': 80,
@@ -100,39 +113,55 @@ def check_row_sizes(schemas_dir: Path) -> Dict[str, Any]:
     """
     schemas = []
 
-    for schema_file in schemas_dir.glob("*.json"):
-        if not schema_file.stem.endswith("Template"):
-            continue
-        try:
-            schema = json.loads(schema_file.read_text())
-            string_count = list_count = 0
+    for schema_file in _template_schemas(schemas_dir):
+        entry = _schema_row_entry(schema_file)
+        if entry:
+            schemas.append(entry)
 
-            for prop_def in schema.get("properties", {}).values():
-                prop_type = prop_def.get("type", "string")
-                if isinstance(prop_type, list):
-                    prop_type = next((t for t in prop_type if t != "null"), "string")
+    return _summarize_rows(schemas)
 
-                if prop_type == "array":
-                    list_count += 1
-                elif prop_type == "string":
-                    string_count += 1
-
-            row_size = (
-                (string_count * CONFIG['STRING_MAX_SIZE'] +
-                 list_count * CONFIG['LIST_MAX_SIZE'] * CONFIG['LIST_MAX_LENGTH']) * 4 +
-                CONFIG['SYSTEM_OVERHEAD']
-            )
-
-            schemas.append({
-                'name': schema_file.stem,
-                'fields': f"{string_count}/{list_count}",
-                'row_size': row_size,
-                'percent': round(row_size / CONFIG['ROW_LIMIT'] * 100, 1),
-                'headroom': CONFIG['ROW_LIMIT'] - row_size,
-            })
-        except:
-            pass
 
+def _template_schemas(schemas_dir: Path) -> List[Path]:
+    return sorted(f for f in Path(schemas_dir).glob("*.json") if f.stem.endswith("Template"))
+
+
+def _schema_row_entry(schema_file: Path) -> Dict[str, Any] | None:
+    """Row entry counted from a registered schema's properties (None if it can't be read)."""
+    try:
+        schema = json.loads(schema_file.read_text())
+        string_count = list_count = 0
+
+        for prop_def in schema.get("properties", {}).values():
+            prop_type = prop_def.get("type", "string")
+            if isinstance(prop_type, list):
+                prop_type = next((t for t in prop_type if t != "null"), "string")
+
+            if prop_type == "array":
+                list_count += 1
+            elif prop_type == "string":
+                string_count += 1
+
+        return _row_entry(schema_file.stem, string_count, list_count)
+    except:
+        return None
+
+
+def _row_entry(name: str, string_count: int, list_count: int) -> Dict[str, Any]:
+    row_size = (
+        (string_count * CONFIG['STRING_MAX_SIZE'] +
+         list_count * CONFIG['LIST_MAX_SIZE'] * CONFIG['LIST_MAX_LENGTH']) * 4 +
+        CONFIG['SYSTEM_OVERHEAD']
+    )
+    return {
+        'name': name,
+        'fields': f"{string_count}/{list_count}",
+        'row_size': row_size,
+        'percent': round(row_size / CONFIG['ROW_LIMIT'] * 100, 1),
+        'headroom': CONFIG['ROW_LIMIT'] - row_size,
+    }
+
+
+def _summarize_rows(schemas: List[Dict[str, Any]]) -> Dict[str, Any]:
     schemas.sort(key=lambda x: x['row_size'], reverse=True)
     exceeds = [s for s in schemas if s['row_size'] > CONFIG['ROW_LIMIT']]
     approaching = [s for s in schemas if CONFIG['ROW_WARNING'] < s['row_size'] <= CONFIG['ROW_LIMIT']]
@@ -145,6 +174,31 @@ def check_row_sizes(schemas_dir: Path) -> Dict[str, Any]:
     }
 
 
+def check_row_sizes_from_attributes(templates: Dict[str, Dict], schemas_dir: Path) -> Dict[str, Any]:
+    """Same as check_row_sizes, counting columns by their columnType in the attribute artifact.
+
+    Only the registered Template schemas in schemas_dir are counted, once
+    each. Abstract classes are registered without properties, and schemas
+    with no artifact record (legacy templates no longer in the model) are
+    counted from the JSON file.
+    """
+    schemas = []
+
+    for schema_file in _template_schemas(schemas_dir):
+        template = templates.get(schema_file.stem)
+        if template is None:
+            entry = _schema_row_entry(schema_file)
+            if entry:
+                schemas.append(entry)
+            continue
+        column_types = [] if template['abstract'] else [attribute['columnType'] for attribute in template['attributes']]
+        string_count = column_types.count('STRING')
+        list_count = sum(1 for t in column_types if t.endswith('_LIST'))
+        schemas.append(_row_entry(schema_file.stem, string_count, list_count))
+
+    return _summarize_rows(schemas)
+
+
 def format_markdown(enum_data, string_data, row_data) -> str:
     """Generate markdown report."""
     lines = ["# Schema Limits Report", ""]
@@ -225,16 +279,28 @@ def main():
 
     parser = argparse.ArgumentParser(description='Validate schema against Synapse limits')
     parser.add_argument('--modules-dir', default='modules', help='Modules directory')
-    parser.add_argument('--schemas-dir', default='registered-json-schemas', help='Schemas directory')
+    parser.add_argument('--schemas-dir', default='registered-json-schemas', help='Registered JSON schemas directory')
+    parser.add_argument('--attributes', type=Path, default=ATTRIBUTES_PATH, help='Per-template attribute artifact for row sizes (default: dist/NF.attributes.jsonl)')
     parser.add_argument('--output', help='Output file (default: stdout)')
     parser.add_argument('--format', choices=['markdown', 'json'], default='markdown')
     parser.add_argument('--strict', action='store_true', help='Exit with error if limits exceeded')
+    add_profile_argument(parser)
     args = parser.parse_args()
+    start_profiling("check_schema_limits", args.profile)
 
     # Run checks
-    enum_data = check_enum_sizes(Path(args.modules_dir))
-    string_data = check_string_lengths(Path(args.schemas_dir))
-    row_data = check_row_sizes(Path(args.schemas_dir))
+    with span("enum sizes"):
+        enum_data = check_enum_sizes(Path(args.modules_dir))
+    with span("string lengths"):
+        string_data = check_string_lengths(Path(args.schemas_dir))
+    if args.attributes.exists():
+        with span("jsonl load", "io", path=str(args.attributes)):
+            templates = load_attributes(args.attributes)
+        with span("row sizes"):
+            row_data = check_row_sizes_from_attributes(templates, Path(args.schemas_dir))
+    else:
+        with span("row sizes"):
+            row_data = check_row_sizes(Path(args.schemas_dir))
 
     # Format output
     if args.format == 'json':
@@ -6,6 +6,11 @@ Compare two Turtle RDF files and report the differences in entities.
 from rdflib import Graph, Namespace, RDF, DCTERMS
 import sys
 import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from schema_index import HierarchyIndex
+from stage_profiling import add_profile_argument, span, start_profiling
 
 # Define namespaces
 LINKML = Namespace("https://w3id.org/linkml/")
@@ -16,7 +21,8 @@ NFOSI = Namespace("https://w3id.org/synapse/nfosi/vocab/")
 def load_graph(filepath, format="turtle"):
     """Load an RDF file into a graph."""
     g = Graph()
-    g.parse(filepath, format=format)
+    with span("turtle parse", "io", path=str(filepath)):
+        g.parse(filepath, format=format)
     return g
 
 def get_entities(graph):
@@ -62,21 +68,8 @@ def get_slot_anonymous_expressions(graph, slot):
 
 def get_templates(graph):
     """Get all templates (transitive subclasses of Template using linkml:is_a)."""
-    templates = set()
-    template_class = NFOSI.Template
-
-    # Recursively find all subclasses using is_a (transitive closure)
-    def find_subclasses(parent):
-        for subclass in graph.subjects(LINKML.is_a, parent):
-            if subclass not in templates:
-                templates.add(subclass)
-                # Recursively find subclasses of this subclass
-                find_subclasses(subclass)
-
-    # Start from Template and find all descendants
-    find_subclasses(template_class)
-
-    return templates
+    hierarchy = HierarchyIndex(dict(graph.subject_objects(LINKML.is_a)))
+    return set(hierarchy.descendants(NFOSI.Template))
 
 def get_template_properties(graph, template):
     """Get all properties (triples) associated with a template."""
@@ -192,7 +185,9 @@ def print_section(title, content, level=3, collapsible=False):
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Compare two Turtle RDF files and report differences')
+    add_profile_argument(parser)
     args = parser.parse_args()
+    start_profiling("compare", args.profile)
 
     # Load both graphs
     g_main = load_graph("dist/NF_main.ttl")
@@ -61,6 +61,25 @@ def load_schema_uri(template_name_or_uri: str, schema_dir: str = "registered-jso
     return schema["$id"], schema
 
 
+def fetch_schema(schema_uri: str) -> dict:
+    """
+    Fetch schema content for an external schema URI.
+
+    Args:
+        schema_uri: Full schema URI
+
+    Returns:
+        Schema dict, or an empty dict if the schema could not be fetched
+    """
+    print("  Fetching schema from URI...")
+    import requests
+    response = requests.get(schema_uri)
+    if response.status_code == 200:
+        return response.json()
+    print(f"  ⚠ Could not fetch schema from URI (status {response.status_code})")
+    return {}
+
+
 def generate_datatype(template_name: str, folder_id: str) -> str:
     """
     Generate a unique dataType identifier.
@@ -77,6 +96,85 @@ def generate_datatype(template_name: str, folder_id: str) -> str:
     return f"{base_name}-{folder_id}"
 
 
+def login(auth_token: str = None):
+    """
+    Create an authenticated Synapse client.
+
+    Args:
+        auth_token: Synapse authentication token (if None, reads SYNAPSE_AUTH_TOKEN)
+
+    Returns:
+        Logged-in Synapse client
+    """
+    from synapseclient import Synapse
+
+    if auth_token is None:
+        auth_token = os.environ.get('SYNAPSE_AUTH_TOKEN')
+        if not auth_token:
+            raise ValueError(
+                "No authentication token provided. "
+                "Set SYNAPSE_AUTH_TOKEN environment variable or pass auth_token parameter"
+            )
+
+    syn = Synapse()
+    syn.login(authToken=auth_token)
+    return syn
+
+
+def resolve_project_id(folder_id: str, syn, cache: dict = None) -> str:
+    """
+    Derive the project ID that contains a folder.
+
+    Uses the folder's projectId property when present, otherwise walks up the
+    parent hierarchy until a Project is reached.
+
+    Args:
+        folder_id: Synapse folder ID
+        syn: Authenticated Synapse client
+        cache: Optional dict of entity ID -> project ID. Every entity visited
+               during the traversal is recorded, so sibling folders resolve
+               without further requests.
+
+    Returns:
+        Synapse project ID
+
+    Raises:
+        ValueError: If no project is found above the folder
+    """
+    if cache is not None and folder_id in cache:
+        return cache[folder_id]
+
+    print(f"Getting folder information: {folder_id}")
+    folder = syn.get(folder_id, downloadFile=False)
+
+    # Try to get project ID - may need to traverse hierarchy
+    project_id = None
+    if hasattr(folder, 'properties') and folder.properties:
+        project_id = folder.properties.get('projectId')
+
+    # If not in properties, traverse parent hierarchy to find project
+    visited = [folder_id]
+    if not project_id:
+        print("  Project ID not in folder properties, traversing hierarchy...")
+        current = folder
+        while current.get('concreteType') != 'org.sagebionetworks.repo.model.Project':
+            parent_id = current.get('parentId')
+            if not parent_id:
+                raise ValueError(f"Could not find project for folder {folder_id}")
+            if cache is not None and parent_id in cache:
+                project_id = cache[parent_id]
+                break
+            visited.append(parent_id)
+            current = syn.get(parent_id, downloadFile=False)
+        else:
+            project_id = current.id
+
+    if cache is not None:
+        for entity_id in visited:
+            cache[entity_id] = project_id
+    return project_id
+
+
 def unbind_schema_from_folder(folder_id: str, syn) -> bool:
     """
     Unbind any existing JSON schema from a Synapse folder.
@@ -149,7 +247,29 @@ def check_existing_annotations(folder_id: str, schema_fields: set, syn) -> bool:
     return False
 
 
-def delete_existing_curation_task(folder_id: str, project_id: str, syn) -> bool:
+def index_curation_tasks(project_id: str) -> dict:
+    """
+    List the curation tasks of a project once and key them by upload folder.
+
+    Args:
+        project_id: Synapse project ID to list tasks for
+
+    Returns:
+        Dictionary mapping upload_folder_id to the list of CurationTask objects
+        targeting that folder (tasks without an upload folder are skipped)
+    """
+    from synapseclient.models.curation import CurationTask
+
+    index = {}
+    for task in CurationTask.list(project_id=project_id):
+        props = task.task_properties
+        folder_id = getattr(props, "upload_folder_id", None) if props else None
+        if folder_id:
+            index.setdefault(folder_id, []).append(task)
+    return index
+
+
+def delete_existing_curation_task(folder_id: str, project_id: str, syn, task_index: dict = None) -> bool:
     """
     Find and delete any existing curation task whose upload folder matches folder_id.
 
@@ -157,21 +277,23 @@ def delete_existing_curation_task(folder_id: str, project_id: str, syn) -> bool:
         folder_id: Synapse folder ID to match against task_properties.upload_folder_id
         project_id: Synapse project ID to search within
         syn: Authenticated Synapse client (used for context; list() uses cached client)
+        task_index: Optional folder-keyed index from index_curation_tasks. When given,
+                    the project is not listed again and deleted tasks are removed
+                    from the index.
 
     Returns:
         True if a task was deleted, False if none was found
     """
-    from synapseclient.models.curation import CurationTask
-
     print(f"\nSearching for existing curation tasks for folder {folder_id}...")
+    if task_index is None:
+        task_index = index_curation_tasks(project_id)
+
     deleted = False
-    for task in CurationTask.list(project_id=project_id):
-        props = task.task_properties
-        if props and getattr(props, "upload_folder_id", None) == folder_id:
-            print(f"  Found task {task.task_id} (dataType: {task.data_type}) — deleting...")
-            task.delete()
-            print(f"  ✓ Deleted task {task.task_id}")
-            deleted = True
+    for task in task_index.pop(folder_id, []):
+        print(f"  Found task {task.task_id} (dataType: {task.data_type}) — deleting...")
+        task.delete()
+        print(f"  ✓ Deleted task {task.task_id}")
+        deleted = True
     if not deleted:
         print("  No existing curation task found for this folder")
     return deleted
@@ -225,7 +347,11 @@ def create_curation_task(
     instructions: str = "Please add metadata for your files",
     bind_schema: bool = True,
     replace: bool = False,
-    auth_token: str = None
+    auth_token: str = None,
+    syn=None,
+    project_id: str = None,
+    schema: tuple = None,
+    task_index: dict = None
 ) -> dict:
     """
     Create a file-based metadata curation task.
@@ -242,67 +368,40 @@ def create_curation_task(
         replace: If True, delete any existing curation task for this folder and
                  rebind the schema before creating a new task (default: False)
         auth_token: Synapse authentication token (if None, reads from env)
+        syn: Already authenticated Synapse client (skips login when provided)
+        project_id: Pre-resolved project ID (skips hierarchy traversal when provided)
+        schema: Pre-loaded (schema_uri, schema_dict) tuple from load_schema_uri
+        task_index: Folder-keyed index from index_curation_tasks, used by replace
+                    mode instead of listing every task in the project
 
     Returns:
         Dictionary with task_id, fileview_id, data_type, schema_uri, and project_id
     """
-    from synapseclient import Synapse
     from synapseclient.models.curation import (
         CurationTask,
         FileBasedMetadataTaskProperties
     )
 
-    # Get auth token
-    if auth_token is None:
-        auth_token = os.environ.get('SYNAPSE_AUTH_TOKEN')
-        if not auth_token:
-            raise ValueError(
-                "No authentication token provided. "
-                "Set SYNAPSE_AUTH_TOKEN environment variable or pass auth_token parameter"
-            )
-
-    # Initialize Synapse client
-    syn = Synapse()
-    syn.login(authToken=auth_token)
-
-    # Get folder to derive project ID
-    print(f"Getting folder information: {upload_folder_id}")
-    folder = syn.get(upload_folder_id, downloadFile=False)
-
-    # Try to get project ID - may need to traverse hierarchy
-    project_id = None
-    if hasattr(folder, 'properties') and folder.properties:
-        project_id = folder.properties.get('projectId')
-
-    # If not in properties, traverse parent hierarchy to find project
-    if not project_id:
-        print("  Project ID not in folder properties, traversing hierarchy...")
-        current = folder
-        while current.get('concreteType') != 'org.sagebionetworks.repo.model.Project':
-            parent_id = current.get('parentId')
-            if not parent_id:
-                raise ValueError(f"Could not find project for folder {upload_folder_id}")
-            current = syn.get(parent_id, downloadFile=False)
-        project_id = current.id
+    # Reuse the caller's session when provisioning several tasks in one run
+    if syn is None:
+        syn = login(auth_token)
 
+    # Derive project ID from the folder unless the caller already resolved it
+    if project_id is None:
+        project_id = resolve_project_id(upload_folder_id, syn)
     print(f"  Project: {project_id}")
 
     # Load schema URI and content
     print(f"\nLoading schema: {template}")
-    schema_uri, json_schema = load_schema_uri(template)
+    if schema is None:
+        schema = load_schema_uri(template)
+    schema_uri, json_schema = schema
     print(f"  Schema URI: {schema_uri}")
 
     # Fetch schema content now if not already loaded (external URI case),
     # so schema fields are available for the annotation check below.
     if json_schema is None:
-        print("  Fetching schema from URI...")
-        import requests
-        response = requests.get(schema_uri)
-        if response.status_code == 200:
-            json_schema = response.json()
-        else:
-            print(f"  ⚠ Could not fetch schema from URI (status {response.status_code})")
-            json_schema = {}
+        json_schema = fetch_schema(schema_uri)
 
     # Determine template name for dataType generation
     # If full URI provided, extract template name or use a default
@@ -326,7 +425,7 @@ def create_curation_task(
 
     # If replacing, delete existing curation task first
     if replace:
-        delete_existing_curation_task(upload_folder_id, project_id, syn)
+        delete_existing_curation_task(upload_folder_id, project_id, syn, task_index=task_index)
 
     # Optionally bind schema to folder
     if bind_schema:
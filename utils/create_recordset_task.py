@@ -17,6 +17,21 @@ import os
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from create_curation_task import login, resolve_project_id
+
+
+def short_schema_id(schema_id: str) -> str:
+    """
+    Short-form schema ID of a full schema URL (other IDs are returned unchanged).
+
+    Example: https://repo-prod.prod.sagebase.org/repo/v1/schema/type/registered/org.synapse.nf-datalandscape-0.2.0
+    -> org.synapse.nf-datalandscape-0.2.0
+    """
+    if schema_id.startswith('http://') or schema_id.startswith('https://'):
+        return schema_id.split('/')[-1]
+    return schema_id
+
 
 def load_schema_uri(template_name_or_uri: str, schema_dir: str = "registered-json-schemas") -> str:
     """
@@ -35,10 +50,7 @@ def load_schema_uri(template_name_or_uri: str, schema_dir: str = "registered-jso
     """
     # Check if it's a full URI
     if template_name_or_uri.startswith('http://') or template_name_or_uri.startswith('https://'):
-        # Extract short-form ID from full URL
-        # Example: https://repo-prod.prod.sagebase.org/repo/v1/schema/type/registered/org.synapse.nf-datalandscape-0.2.0
-        # -> org.synapse.nf-datalandscape-0.2.0
-        return template_name_or_uri.split('/')[-1]
+        return short_schema_id(template_name_or_uri)
 
     # Local template name - load from file
     repo_root = Path(__file__).parent.parent
@@ -58,11 +70,7 @@ def load_schema_uri(template_name_or_uri: str, schema_dir: str = "registered-jso
         raise KeyError(f"Schema file {schema_file} is missing required '$id' field")
 
     # Extract short-form ID from $id field (which may be a full URL)
-    schema_id = schema["$id"]
-    if schema_id.startswith('http://') or schema_id.startswith('https://'):
-        return schema_id.split('/')[-1]
-
-    return schema_id
+    return short_schema_id(schema["$id"])
 
 
 def create_recordset_task(
@@ -74,7 +82,10 @@ def create_recordset_task(
     upsert_keys: list = None,
     instructions: str = "Please add metadata records",
     bind_schema: bool = True,
-    auth_token: str = None
+    auth_token: str = None,
+    syn=None,
+    project_id: str = None,
+    schema: tuple = None
 ) -> dict:
     """
     Create a record-based metadata curation task.
@@ -92,50 +103,26 @@ def create_recordset_task(
         instructions: Instructions for data contributors
         bind_schema: Whether to bind JSON schema to RecordSet (default: True)
         auth_token: Synapse authentication token (if None, reads from env)
+        syn: Already authenticated Synapse client (skips login when provided)
+        project_id: Pre-resolved project ID (skips hierarchy traversal when provided)
+        schema: Pre-loaded (schema_uri, schema_dict) tuple from
+                create_curation_task.load_schema_uri (skips reading the schema file)
 
     Returns:
         Dictionary with recordset_id, task_id, data_grid_id, schema_uri, and project_id
     """
-    from synapseclient import Synapse
-
-    # Get auth token
-    if auth_token is None:
-        auth_token = os.environ.get('SYNAPSE_AUTH_TOKEN')
-        if not auth_token:
-            raise ValueError(
-                "No authentication token provided. "
-                "Set SYNAPSE_AUTH_TOKEN environment variable or pass auth_token parameter"
-            )
-
-    # Initialize Synapse client
-    syn = Synapse()
-    syn.login(authToken=auth_token)
-
-    # Get folder to derive project ID
-    print(f"Getting folder information: {folder_id}")
-    folder = syn.get(folder_id, downloadFile=False)
-
-    # Try to get project ID - may need to traverse hierarchy
-    project_id = None
-    if hasattr(folder, 'properties') and folder.properties:
-        project_id = folder.properties.get('projectId')
-
-    # If not in properties, traverse parent hierarchy to find project
-    if not project_id:
-        print("  Project ID not in folder properties, traversing hierarchy...")
-        current = folder
-        while current.get('concreteType') != 'org.sagebionetworks.repo.model.Project':
-            parent_id = current.get('parentId')
-            if not parent_id:
-                raise ValueError(f"Could not find project for folder {folder_id}")
-            current = syn.get(parent_id, downloadFile=False)
-        project_id = current.id
+    # Reuse the caller's session when provisioning several tasks in one run
+    if syn is None:
+        syn = login(auth_token)
 
+    # Derive project ID from the folder unless the caller already resolved it
+    if project_id is None:
+        project_id = resolve_project_id(folder_id, syn)
     print(f"  Project: {project_id}")
 
     # Load schema URI
     print(f"\nLoading schema: {template}")
-    schema_uri = load_schema_uri(template)
+    schema_uri = load_schema_uri(template) if schema is None else short_schema_id(schema[0])
     print(f"  Schema URI: {schema_uri}")
 
     # Set defaults
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Binary, memory-mappable enum lookup file (dist/NF.lookup).
+
+Tools that check values against the dictionary parse YAML and build sets
+at startup, in every worker. build.py's "lookup" stage instead writes the
+enums once into a flat file that readers mmap: opening it only reads the
+header, the pages are shared between processes, and nothing is copied
+into Python objects until a lookup touches it.
+
+Layout (all integers little-endian uint32, sections 4-byte aligned):
+
+    header     magic "NFLOOKUP", version, n_strings, n_enums, n_entries, bitmap_bytes
+    offsets    n_strings + 1 offsets into the string blob
+    enums      n_enums string IDs of the enum names, ascending
+    entries    n_entries (key ID, enum index, canonical ID) triples, sorted;
+               key is normalize_key() of a value or alias
+    bitmaps    per enum, a values bitmap then an aliases bitmap over string IDs
+    blob       the UTF-8 strings, sorted bytewise (string ID = position)
+
+The string table holds every value, alias, enum name and normalized key
+once. Lookups bisect the string table to get an ID, then test a bitmap bit
+(membership) or bisect the entries (normalized resolution).
+
+Usage:
+    python utils/build.py --only lookup
+    python utils/enum_lookup.py resolve "rna seq" "Whole genome sequencing"
+
+    from enum_lookup import LookupFile
+    lookup = LookupFile("dist/NF.lookup")
+    lookup.contains("SequencingAssayEnum", "RNA-seq")
+    lookup.resolve("rna seq")  # [("SequencingAssayEnum", "RNA-seq")]
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from alias_resolver import iter_terms, normalize_key
+
+DEFAULT_LOOKUP = Path(__file__).parent.parent / "dist" / "NF.lookup"
+
+MAGIC = b"NFLOOKUP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8s5I")
+KINDS = ("values", "aliases", "all")
+
+
+def _sections(n_strings: int, n_enums: int, n_entries: int, bitmap_bytes: int) -> dict:
+    """Byte offset of each section, from the header counts."""
+    offsets = {}
+    position = HEADER.size
+    for name, size in (
+        ("offsets", 4 * (n_strings + 1)),
+        ("enums", 4 * n_enums),
+        ("entries", 12 * n_entries),
+        ("bitmaps", 2 * n_enums * bitmap_bytes),
+        ("blob", 0),
+    ):
+        position += -position % 4
+        offsets[name] = position
+        position += size
+    return offsets
+
+
+def write_lookup(enums: dict, output: Path) -> Path:
+    """Write the lookup file for a model's enums.
+
+    Args:
+        enums: The `enums` section of a merged LinkML model
+        output: Destination file
+
+    Returns:
+        output
+    """
+    members = {}  # enum -> ({values}, {aliases})
+    keys = set()
+    for enum_name, canonical, text in iter_terms(enums):
+        values, aliases = members.setdefault(enum_name, (set(), set()))
+        (values if text == canonical else aliases).add(text)
+        key = normalize_key(text)
+        if key:
+            keys.add((key, enum_name, canonical))
+
+    table = set(members) | {key for key, _, _ in keys}
+    for values, aliases in members.values():
+        table |= values | aliases
+    encoded = sorted(s.encode() for s in table)
+    ids = {s.decode(): i for i, s in enumerate(encoded)}
+    enum_names = sorted(members, key=str.encode)
+    enum_index = {name: i for i, name in enumerate(enum_names)}
+    entries = sorted((ids[key], enum_index[enum], ids[canonical]) for key, enum, canonical in keys)
+    bitmap_bytes = (len(encoded) + 7) // 8
+
+    sections = _sections(len(encoded), len(enum_names), len(entries), bitmap_bytes)
+    data = bytearray(sections["blob"])
+    HEADER.pack_into(data, 0, MAGIC, FORMAT_VERSION, len(encoded), len(enum_names), len(entries), bitmap_bytes)
+    position = 0
+    string_offsets = [0]
+    for s in encoded:
+        position += len(s)
+        string_offsets.append(position)
+    struct.pack_into(f"<{len(string_offsets)}I", data, sections["offsets"], *string_offsets)
+    struct.pack_into(f"<{len(enum_names)}I", data, sections["enums"], *(ids[name] for name in enum_names))
+    struct.pack_into(f"<{3 * len(entries)}I", data, sections["entries"], *(n for entry in entries for n in entry))
+    for i, name in enumerate(enum_names):
+        for j, strings in enumerate(members[name]):
+            start = sections["bitmaps"] + (2 * i + j) * bitmap_bytes
+            for s in strings:
+                data[start + (ids[s] >> 3)] |= 1 << (ids[s] & 7)
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "wb") as f:
+        f.write(data)
+        for s in encoded:
+            f.write(s)
+    return output
+
+
+class LookupFile:
+    """Read-only view of a lookup file through mmap.
+
+    Exposes contains() and `enum_name in lookup` like enum_store.EnumStore,
+    so it can stand in for it in review_annotations.analyze_annotations.
+    """
+
+    def __init__(self, path: Path = DEFAULT_LOOKUP):
+        """
+        Raises:
+            ValueError: If path is not a lookup file of a supported version
+        """
+        if sys.byteorder != "little":
+            raise ValueError("lookup files can only be mapped on little-endian hosts")
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if len(view) < HEADER.size:
+            raise ValueError(f"{path} is not a lookup file")
+        magic, version, n_strings, n_enums, n_entries, bitmap_bytes = HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} lookup file")
+        sections = _sections(n_strings, n_enums, n_entries, bitmap_bytes)
+        self._n_strings = n_strings
+        self._offsets = view[sections["offsets"]:sections["offsets"] + 4 * (n_strings + 1)].cast("I")
+        self._enums = view[sections["enums"]:sections["enums"] + 4 * n_enums].cast("I")
+        self._entries = view[sections["entries"]:sections["entries"] + 12 * n_entries].cast("I")
+        self._bitmaps = view[sections["bitmaps"]:sections["bitmaps"] + 2 * n_enums * bitmap_bytes]
+        self._bitmap_bytes = bitmap_bytes
+        self._blob = view[sections["blob"]:]
+        self._enum_indexes = {}
+
+    def _bytes(self, i: int) -> bytes:
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+    def string(self, i: int) -> str:
+        return self._bytes(i).decode()
+
+    def id(self, value: str) -> int | None:
+        """String ID of value, or None if it isn't in the table."""
+        target = value.encode()
+        lo, hi = 0, self._n_strings
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self._n_strings and self._bytes(lo) == target else None
+
+    def _enum_index(self, enum_name: str) -> int | None:
+        if enum_name in self._enum_indexes:
+            return self._enum_indexes[enum_name]
+        i = self.id(enum_name)
+        self._enum_indexes[enum_name] = index = None if i is None else self._find_enum(i)
+        return index
+
+    def _find_enum(self, i: int) -> int | None:
+        lo, hi = 0, len(self._enums)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._enums[mid] < i:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self._enums) and self._enums[lo] == i else None
+
+    def _bit(self, enum_index: int, part: int, i: int) -> bool:
+        start = (2 * enum_index + part) * self._bitmap_bytes
+        return bool(self._bitmaps[start + (i >> 3)] >> (i & 7) & 1)
+
+    def contains(self, enum_name: str, value: str, kind: str = "all") -> bool:
+        """Whether value is a permissible value ("values"), alias ("aliases") or either ("all") of enum_name.
+
+        Raises:
+            KeyError: If there is no enum called enum_name, or kind is unknown
+        """
+        if kind not in KINDS:
+            raise KeyError(kind)
+        index = self._enum_index(enum_name)
+        if index is None:
+            raise KeyError(enum_name)
+        i = self.id(value)
+        if i is None:
+            return False
+        return (kind != "aliases" and self._bit(index, 0, i)) or (kind != "values" and self._bit(index, 1, i))
+
+    def resolve(self, value: str, enums=None) -> list[tuple[str, str]]:
+        """(enum, canonical value) pairs whose value or alias normalizes like value.
+
+        Args:
+            value: Free text
+            enums: Only return these enums (default: all)
+        """
+        i = self.id(normalize_key(value))
+        if i is None:
+            return []
+        entries = self._entries
+        lo, hi = 0, len(entries) // 3
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if entries[3 * mid] < i:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        while 3 * lo < len(entries) and entries[3 * lo] == i:
+            enum_name = self.string(self._enums[entries[3 * lo + 1]])
+            if enums is None or enum_name in enums:
+                found.append((enum_name, self.string(entries[3 * lo + 2])))
+            lo += 1
+        return found
+
+    def enum_names(self) -> list[str]:
+        return [self.string(i) for i in self._enums]
+
+    def __contains__(self, enum_name) -> bool:
+        return isinstance(enum_name, str) and self._enum_index(enum_name) is not None
+
+    def __len__(self) -> int:
+        return len(self._enums)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Query a memory-mapped enum lookup file (build.py --only lookup)")
+    parser.add_argument("--lookup", type=Path, default=DEFAULT_LOOKUP, help="Lookup file (default: dist/NF.lookup)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    resolve_parser = subparsers.add_parser("resolve", help="Enums and canonical values a value normalizes to")
+    resolve_parser.add_argument("values", nargs="+")
+    resolve_parser.add_argument("--enum", action="append", help="Restrict to this enum (repeatable)")
+    check_parser = subparsers.add_parser("check", help="Whether values are exact members of an enum")
+    check_parser.add_argument("enum")
+    check_parser.add_argument("values", nargs="+")
+    args = parser.parse_args()
+
+    try:
+        lookup = LookupFile(args.lookup)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    if args.command == "resolve":
+        for value in args.values:
+            found = lookup.resolve(value, args.enum)
+            print(f"{'✅' if found else '❌'} {value}: {', '.join(f'{enum}:{canonical}' for enum, canonical in found) or 'no match'}")
+        return 0
+
+    if args.enum not in lookup:
+        print(f"❌ No enum called {args.enum}", file=sys.stderr)
+        return 1
+    missing = 0
+    for value in args.values:
+        present = lookup.contains(args.enum, value)
+        missing += not present
+        print(f"{'✅' if present else '❌'} {value}")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Compact, read-only store of enum permissible values and aliases.
+
+review_annotations.py used to keep three Python sets per enum (values,
+aliases and their union), so every string was referenced from up to three
+hash tables, plus the enum-name lists of the slot map. EnumStore keeps:
+
+- one sorted tuple of every distinct value, alias and enum name, each
+  interned once (the shared string table)
+- per enum, two sorted array('I') of string IDs: values and aliases
+
+A membership test is a bisect into the string table and one into the
+enum's array, with no per-enum hash tables. The lookups are those of the
+old nested dicts: store[enum]["values" | "aliases" | "all"] is a read-only
+set view supporting `in`, iteration (sorted) and len().
+
+Usage:
+    from enum_store import EnumStore
+
+    store = EnumStore.from_modules()
+    "RNA-seq" in store["AssayEnum"]["all"]
+    store.contains("AssayEnum", "rnaseq", "aliases")
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Set
+from heapq import merge
+from pathlib import Path
+
+import yaml
+
+MODULES_DIR = Path(__file__).parent.parent / "modules"
+
+KINDS = ("values", "aliases", "all")
+
+
+def _aliases(value_data) -> list:
+    if not isinstance(value_data, dict):
+        return []
+    aliases = value_data.get("aliases")
+    if isinstance(aliases, list):
+        return aliases
+    if isinstance(aliases, str):
+        return [aliases]
+    return []
+
+
+def _has(ids: array, i: int) -> bool:
+    k = bisect_left(ids, i)
+    return k < len(ids) and ids[k] == i
+
+
+def _distinct(ids):
+    """Sorted IDs with repeats dropped."""
+    last = None
+    for i in ids:
+        if i != last:
+            yield i
+            last = i
+
+
+class IdSet(Set):
+    """Read-only set of strings backed by sorted string-table IDs."""
+
+    __slots__ = ("_strings", "_parts", "_len")
+
+    def __init__(self, strings: tuple, *parts: array):
+        self._strings = strings
+        self._parts = parts
+        self._len = None
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        # Results of |, &, - are ordinary sets
+        return frozenset(iterable)
+
+    def _ids(self):
+        if len(self._parts) == 1:
+            return iter(self._parts[0])
+        return _distinct(merge(*self._parts))
+
+    def __contains__(self, value) -> bool:
+        if not isinstance(value, str):
+            return False
+        k = bisect_left(self._strings, value)
+        if k == len(self._strings) or self._strings[k] != value:
+            return False
+        return any(_has(ids, k) for ids in self._parts)
+
+    def __iter__(self):
+        strings = self._strings
+        return (strings[i] for i in self._ids())
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = len(self._parts[0]) if len(self._parts) == 1 else sum(1 for _ in self._ids())
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"IdSet({sorted(self)!r})"
+
+
+class EnumEntry(Mapping):
+    """One enum's {"values", "aliases", "all"} views."""
+
+    __slots__ = ("_strings", "_values", "_aliases")
+
+    def __init__(self, strings: tuple, values: array, aliases: array):
+        self._strings = strings
+        self._values = values
+        self._aliases = aliases
+
+    def __getitem__(self, kind: str) -> IdSet:
+        if kind == "values":
+            return IdSet(self._strings, self._values)
+        if kind == "aliases":
+            return IdSet(self._strings, self._aliases)
+        if kind == "all":
+            return IdSet(self._strings, self._values, self._aliases)
+        raise KeyError(kind)
+
+    def __iter__(self):
+        return iter(KINDS)
+
+    def __len__(self) -> int:
+        return len(KINDS)
+
+
+class EnumStore(Mapping):
+    """enum name -> EnumEntry over one shared, sorted string table."""
+
+    def __init__(self, strings: tuple, enums: dict):
+        """
+        Args:
+            strings: Sorted, distinct strings; IDs are positions in this tuple
+            enums: {enum name: (values IDs, aliases IDs)}, each a sorted array('I')
+        """
+        self.strings = strings
+        self._enums = enums
+
+    @classmethod
+    def from_values(cls, enums: dict) -> "EnumStore":
+        """Build from {enum name: (iterable of values, iterable of aliases)}.
+
+        Values and aliases are stored as strings: YAML keys such as `1:` or
+        `yes:` load as int/bool, but annotations compare as text.
+        """
+        enums = {name: (list(map(str, values)), list(map(str, aliases))) for name, (values, aliases) in enums.items()}
+        table = set(enums)
+        for values, aliases in enums.values():
+            table.update(values)
+            table.update(aliases)
+        strings = tuple(sorted(sys.intern(s) for s in table))
+        ids = {s: i for i, s in enumerate(strings)}  # only while building
+        return cls(strings, {
+            strings[ids[name]]: (array("I", sorted({ids[v] for v in values})), array("I", sorted({ids[a] for a in aliases})))
+            for name, (values, aliases) in enums.items()
+        })
+
+    @classmethod
+    def from_modules(cls, modules_dir: Path = MODULES_DIR, on_error=None) -> "EnumStore":
+        """Every enum with permissible values in modules_dir/**/*.yaml.
+
+        Args:
+            modules_dir: Module tree to read
+            on_error: Called with (path, exception) for a file that can't be read;
+                by default the exception propagates
+        """
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        enums = {}
+        for yaml_file in sorted(Path(modules_dir).rglob("*.yaml")):
+            try:
+                with open(yaml_file) as f:
+                    data = yaml.load(f, Loader=loader)
+                for enum_name, enum_data in ((data or {}).get("enums") or {}).items():
+                    values = (enum_data or {}).get("permissible_values")
+                    if values is None:
+                        continue
+                    enums[enum_name] = (values, [a for value_data in values.values() for a in _aliases(value_data)])
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(yaml_file, e)
+        return cls.from_values(enums)
+
+    def id(self, value: str) -> int | None:
+        """Position of value in the string table, or None."""
+        k = bisect_left(self.strings, value)
+        return k if k < len(self.strings) and self.strings[k] == value else None
+
+    def intern(self, value: str) -> str:
+        """The table's copy of value (value itself when it isn't in the table)."""
+        k = self.id(value)
+        return self.strings[k] if k is not None else value
+
+    def contains(self, enum_name: str, value: str, kind: str = "all") -> bool:
+        """Whether value is a permissible value ("values"), alias ("aliases") or either ("all") of enum_name."""
+        values, aliases = self._enums[enum_name]
+        k = self.id(value)
+        if k is None:
+            return False
+        if kind == "values":
+            return _has(values, k)
+        if kind == "aliases":
+            return _has(aliases, k)
+        if kind == "all":
+            return _has(values, k) or _has(aliases, k)
+        raise KeyError(kind)
+
+    def __getitem__(self, enum_name: str) -> EnumEntry:
+        values, aliases = self._enums[enum_name]
+        return EnumEntry(self.strings, values, aliases)
+
+    def __contains__(self, enum_name) -> bool:
+        return enum_name in self._enums
+
+    def __iter__(self):
+        return iter(self._enums)
+
+    def __len__(self) -> int:
+        return len(self._enums)
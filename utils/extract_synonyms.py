@@ -4,34 +4,42 @@ Extract synonyms for ontology-mapped terms in the NF metadata dictionary.
 
 Primary method: OLS4 REST API (fast, reliable JSON responses).
 Fallback: RDF content negotiation against the term URI.
+Offline: a local store of ingested ontology dumps (see ontology_store.py)
+can serve lookups without any HTTP calls.
 """
 import os
 import sys
 import yaml
 import csv
-import requests
+import time
+import asyncio
+import argparse
 import concurrent.futures
+import importlib.util
 import urllib.parse
 import signal
 import re
 from functools import lru_cache
-from tqdm import tqdm
+from pathlib import Path
 
-# Optional: RDF fallback (only used when OLS4 doesn't cover the ontology)
-try:
-    from rdflib import Graph, Namespace, URIRef
-    HAS_RDFLIB = True
-except ImportError:
-    HAS_RDFLIB = False
+sys.path.insert(0, str(Path(__file__).parent))
+from ontology_store import OntologyStore
+from stage_profiling import add_profile_argument, span, start_profiling
+from term_cache import DEFAULT_TTL_DAYS, TermCache
+
+# Optional: RDF fallback (only used when OLS4 doesn't cover the ontology);
+# rdflib is imported on first use
+HAS_RDFLIB = importlib.util.find_spec("rdflib") is not None
 
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 OLS4_BASE = "https://www.ebi.ac.uk/ols4/api/ontologies"
 REQUEST_TIMEOUT = 15  # seconds per HTTP request
-FUTURE_TIMEOUT = 30   # seconds per term in thread pool
-BATCH_SIZE = 50
-MAX_WORKERS = 5
+FUTURE_TIMEOUT = 30   # seconds per term (OLS4 + RDF fallback)
+MAX_CONCURRENCY = 10  # terms in flight at once, across all hosts
+RATE_LIMIT = 8.0      # max requests per second to any single host
+FLUSH_EVERY = 25      # flush the CSV after this many written rows
 SCRIPT_TIMEOUT = 600  # 10 minutes -- OLS4 is fast enough
 
 # Map URL patterns to OLS4 ontology identifiers
@@ -66,9 +74,32 @@ OLS4_ONTOLOGY_MAP: dict[str, str] = {
     "www.bioassayontology.org/bao#BAO_": "bao",
 }
 
-# Create a session for connection pooling
-session = requests.Session()
-session.headers.update({"Accept": "application/json"})
+_SESSION = None  # (pool size, requests.Session)
+
+
+def _session(pool_size: int | None = None):
+    """Session for connection pooling, with one pooled connection per concurrent fetch.
+
+    run_pipeline calls it with its concurrency before any fetch starts, so
+    `--concurrency` above MAX_CONCURRENCY doesn't overflow the pool (urllib3
+    would discard and reopen the extra connections). Without pool_size the
+    current session is returned, or one sized for MAX_CONCURRENCY.
+
+    requests is imported here, on the first HTTP call, so offline runs and
+    `--help` don't load it.
+    """
+    global _SESSION
+    if _SESSION is None or (pool_size is not None and pool_size != _SESSION[0]):
+        import requests
+
+        size = pool_size or MAX_CONCURRENCY
+        session = requests.Session()
+        session.headers.update({"Accept": "application/json"})
+        adapter = requests.adapters.HTTPAdapter(pool_connections=size, pool_maxsize=size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSION = (size, session)
+    return _SESSION[1]
 
 # ---------------------------------------------------------------------------
 # Timeout handler
@@ -79,9 +110,6 @@ class ScriptTimeout(Exception):
 def _timeout_handler(signum, frame):
     raise ScriptTimeout("Script timeout reached")
 
-signal.signal(signal.SIGALRM, _timeout_handler)
-signal.alarm(SCRIPT_TIMEOUT)
-
 # ---------------------------------------------------------------------------
 # CURIE / URI helpers
 # ---------------------------------------------------------------------------
@@ -135,22 +163,49 @@ def _extract_ontology_id(term_url: str) -> str | None:
     return None
 
 
-@lru_cache(maxsize=2000)
-def fetch_synonyms_ols4(term_url: str) -> list[str]:
-    """Fetch synonyms via the OLS4 REST API (primary method)."""
+def fetch_term_ols4(term_url: str, raise_errors: bool = False) -> dict | None:
+    """Fetch a term record (synonyms, label, obsolete flag) from OLS4.
+
+    Returns None when the ontology or term is not covered by OLS4. Other
+    lookup failures also return None unless raise_errors is set, in which
+    case they propagate so callers can avoid caching a transient failure.
+    """
     ontology_id = _extract_ontology_id(term_url)
     if not ontology_id:
-        return []
+        return None
+    from requests import HTTPError
+
     try:
         encoded_iri = urllib.parse.quote(urllib.parse.quote(term_url, safe=""))
         url = f"{OLS4_BASE}/{ontology_id}/terms/{encoded_iri}"
-        resp = session.get(url, timeout=REQUEST_TIMEOUT)
+        with span("GET OLS4 term", "http", ontology=ontology_id):
+            resp = _session().get(url, timeout=REQUEST_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
-        return data.get("synonyms", [])
+        return {
+            "synonyms": data.get("synonyms") or [],
+            "label": data.get("label"),
+            "obsolete": bool(data.get("is_obsolete", False)),
+        }
+    except HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        if raise_errors:
+            raise
+        print(f"  OLS4 lookup failed for {term_url}: {e}")
+        return None
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"  OLS4 lookup failed for {term_url}: {e}")
-        return []
+        return None
+
+
+@lru_cache(maxsize=2000)
+def fetch_synonyms_ols4(term_url: str) -> list[str]:
+    """Fetch synonyms via the OLS4 REST API (primary method)."""
+    record = fetch_term_ols4(term_url)
+    return record["synonyms"] if record else []
 
 
 # ---------------------------------------------------------------------------
@@ -163,7 +218,8 @@ def _fetch_rdf(term_url: str) -> str | None:
         return None
     try:
         headers = {"Accept": "application/rdf+xml"}
-        resp = session.get(term_url, headers=headers, timeout=REQUEST_TIMEOUT)
+        with span("GET RDF term", "http", url=term_url):
+            resp = _session().get(term_url, headers=headers, timeout=REQUEST_TIMEOUT)
         resp.raise_for_status()
         ct = resp.headers.get("Content-Type", "")
         if "xml" not in ct and "rdf" not in ct:
@@ -177,6 +233,8 @@ def _extract_synonyms_rdf(rdf_data: str, term_iri: str) -> list[str]:
     """Parse RDF/XML and extract hasExactSynonym values."""
     if not rdf_data or not HAS_RDFLIB:
         return []
+    from rdflib import Graph, Namespace, URIRef
+
     try:
         g = Graph()
         g.parse(data=rdf_data, format="xml")
@@ -210,17 +268,24 @@ def get_synonyms_for_term(term_url: str) -> list[str]:
 # ---------------------------------------------------------------------------
 # Term processing
 # ---------------------------------------------------------------------------
-def process_term(
-    term: str, term_data: dict, prefixes: dict[str, str]
-) -> list[str] | None:
-    """Process a single term and return a CSV row [term, url, synonyms] or None."""
+def resolve_term_iri(term_data: dict, prefixes: dict[str, str]) -> str | None:
+    """Return the expanded `meaning` IRI of a permissible value, or None."""
     if term_data is None or not isinstance(term_data, dict):
         return None
-
     meaning = term_data.get("meaning")
     full_url = expand_curie(meaning, prefixes) if meaning else None
     if not full_url or not is_valid_ontology_url(full_url):
         return None
+    return full_url
+
+
+def process_term(
+    term: str, term_data: dict, prefixes: dict[str, str]
+) -> list[str] | None:
+    """Process a single term and return a CSV row [term, url, synonyms] or None."""
+    full_url = resolve_term_iri(term_data, prefixes)
+    if not full_url:
+        return None
 
     synonyms = get_synonyms_for_term(full_url)
     if synonyms:
@@ -228,13 +293,208 @@ def process_term(
     return None
 
 
+# ---------------------------------------------------------------------------
+# Async pipeline
+# ---------------------------------------------------------------------------
+class HostRateLimiter:
+    """Space out requests so no single host sees more than `rate` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url: str) -> None:
+        if not self.interval:
+            return
+        host = urllib.parse.urlsplit(url).netloc
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def fetch_term_async(term_url: str, limiter: HostRateLimiter) -> dict:
+    """Look up one IRI via OLS4, falling back to RDF content negotiation.
+
+    The blocking requests calls run in the default executor; the limiter is
+    consulted before each call that will actually hit the network.
+
+    Returns:
+        Dict with source ('ols4', 'rdf' or 'none'), synonyms, label, obsolete
+
+    Raises:
+        Exception: If OLS4 failed and the RDF fallback found nothing
+    """
+    record = None
+    ols4_error = None
+    if _extract_ontology_id(term_url):
+        await limiter.wait(OLS4_BASE)
+        try:
+            record = await asyncio.to_thread(fetch_term_ols4, term_url, True)
+        except Exception as e:
+            ols4_error = e
+        if record and record["synonyms"]:
+            return {"source": "ols4", **record}
+
+    if HAS_RDFLIB:
+        await limiter.wait(term_url)
+        rdf = await asyncio.to_thread(_fetch_rdf, term_url)
+        syns = _extract_synonyms_rdf(rdf, term_url) if rdf else []
+        if syns:
+            return {
+                "source": "rdf",
+                "synonyms": syns,
+                "label": record["label"] if record else None,
+                "obsolete": record["obsolete"] if record else False,
+            }
+
+    if ols4_error is not None:
+        # Don't let a transient OLS4 failure be recorded as "no synonyms"
+        raise ols4_error
+    if record:
+        return {"source": "ols4", **record}
+    return {"source": "none", "synonyms": [], "label": None, "obsolete": False}
+
+
+def write_rows(writer, iri: str, terms: list[str], synonyms) -> int:
+    """Write one CSV row per term sharing iri; returns number of rows written."""
+    if not synonyms:
+        return 0
+    joined = "; ".join(synonyms)
+    for term in terms:
+        writer.writerow([term, iri, joined])
+    return len(terms)
+
+
+async def run_pipeline(
+    iri_terms: dict[str, list[str]],
+    csvfile,
+    concurrency: int = MAX_CONCURRENCY,
+    rate: float = RATE_LIMIT,
+    cache=None,
+    stale=None,
+) -> int:
+    """Fetch IRIs with a global concurrency limit, streaming rows to the CSV.
+
+    Unlike fixed-size batches, a slow IRI only occupies one of the
+    `concurrency` slots; the other slots keep pulling new work. Each IRI is
+    fetched once and written for every term that shares it. Rows are written
+    as soon as their IRI completes, so an interrupted run keeps everything
+    finished so far.
+
+    Args:
+        iri_terms: Mapping of IRI -> term labels using it as `meaning`
+        csvfile: Open CSV file to append rows to
+        concurrency: Maximum IRIs in flight
+        rate: Maximum requests per second per host (0 disables)
+        cache: Optional TermCache to record every lookup in
+        stale: Optional {IRI: CachedTerm} of expired cache entries; when an
+            IRI's refetch fails or times out, its stale synonyms are written
+            instead, so the row isn't lost
+
+    Returns:
+        Number of rows written
+    """
+    writer = csv.writer(csvfile)
+    limiter = HostRateLimiter(rate)
+    stale = stale or {}
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in iri_terms.items():
+        queue.put_nowait(item)
+
+    written = 0
+    from tqdm import tqdm
+
+    progress = tqdm(total=len(iri_terms), desc="Terms")
+
+    async def worker() -> None:
+        nonlocal written
+        while True:
+            try:
+                iri, terms = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            synonyms = None
+            try:
+                result = await asyncio.wait_for(
+                    fetch_term_async(iri, limiter), timeout=FUTURE_TIMEOUT
+                )
+                if cache is not None:
+                    cache.put(iri, **result, commit=False)
+                synonyms = result["synonyms"]
+            except asyncio.TimeoutError:
+                print(f"\nTimeout processing term: {terms[0]} ({iri})")
+            except Exception as e:
+                print(f"\nError processing term {terms[0]} ({iri}): {e}")
+            finally:
+                progress.update(1)
+            if synonyms is None and iri in stale:
+                print(f"Keeping stale cached synonyms for {terms[0]} ({iri})")
+                synonyms = stale[iri].synonyms
+            before = written
+            written += write_rows(writer, iri, terms, synonyms)
+            if written // FLUSH_EVERY != before // FLUSH_EVERY:
+                csvfile.flush()
+                if cache is not None:
+                    cache.commit()
+
+    _session(concurrency)
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(max_workers=concurrency))
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        progress.close()
+        csvfile.flush()
+        if cache is not None:
+            cache.commit()
+    return written
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract synonyms for ontology-mapped terms")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY,
+                        help=f"IRIs fetched concurrently (default: {MAX_CONCURRENCY})")
+    parser.add_argument("--rate-limit", type=float, default=RATE_LIMIT,
+                        help=f"Max requests per second per host, 0 to disable (default: {RATE_LIMIT})")
+    parser.add_argument("--cache", default=None, metavar="PATH",
+                        help="SQLite term cache keyed by IRI (e.g. term_cache.sqlite). "
+                             "Cached IRIs are not refetched and term_synonyms.csv is rebuilt "
+                             "from the cache instead of resumed by term label.")
+    parser.add_argument("--refresh-stale", action="store_true",
+                        help="With --cache, refetch entries older than --ttl-days, keeping the "
+                             "old entry if the refetch fails (default: reuse every cached entry)")
+    parser.add_argument("--ttl-days", type=float, default=DEFAULT_TTL_DAYS,
+                        help=f"Age after which cache entries count as stale (default: {DEFAULT_TTL_DAYS})")
+    parser.add_argument("--ontology-store", default=None, metavar="PATH",
+                        help="Local store of ingested OBO/OWL dumps (see ontology_store.py). "
+                             "IRIs found there are served locally; the rest go to OLS4/RDF.")
+    parser.add_argument("--offline", action="store_true",
+                        help="Never make HTTP requests; IRIs missing from the ontology store "
+                             "and term cache are skipped, stale cache entries are used as they are")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profiling("extract_synonyms", args.profile)
+
+    if args.offline and not (args.ontology_store or args.cache):
+        parser.error("--offline needs --ontology-store and/or --cache to look terms up in")
+
+    cache = TermCache(args.cache, ttl_days=args.ttl_days) if args.cache else None
+    store = OntologyStore(args.ontology_store) if args.ontology_store else None
+
+    # Installed here rather than at import, so importing this module as a
+    # library (or from nfdict) doesn't arm a process-wide alarm
+    signal.signal(signal.SIGALRM, _timeout_handler)
+    signal.alarm(SCRIPT_TIMEOUT)
     try:
         print("Reading YAML file...")
-        with open("dist/NF.yaml", "r") as f:
+        with span("yaml load", "io", path="dist/NF.yaml"), open("dist/NF.yaml", "r") as f:
             data = yaml.safe_load(f)
 
         prefixes = load_prefixes_from_yaml("dist/NF.yaml")
@@ -249,9 +509,9 @@ def main() -> None:
         total_terms = len(terms_to_process)
         print(f"Found {total_terms} terms to process")
 
-        # Resume from existing CSV if present
+        # Resume from existing CSV if present (the cache supersedes this)
         processed_terms: set[str] = set()
-        csv_exists = os.path.exists("term_synonyms.csv")
+        csv_exists = os.path.exists("term_synonyms.csv") and cache is None
 
         if csv_exists:
             print("Found existing CSV, checking for already processed terms...")
@@ -267,54 +527,72 @@ def main() -> None:
                 print(f"Error reading existing CSV: {e}")
                 processed_terms = set()
 
-        terms_to_process = [
-            (t, td) for t, td in terms_to_process if t not in processed_terms
-        ]
-        remaining = len(terms_to_process)
-        print(f"Processing {remaining} remaining terms...")
+        # Group remaining terms by IRI so shared meanings are fetched once
+        iri_terms: dict[str, list[str]] = {}
+        for term, term_data in terms_to_process:
+            if term in processed_terms:
+                continue
+            iri = resolve_term_iri(term_data, prefixes)
+            if iri:
+                iri_terms.setdefault(iri, []).append(term)
+
+        remaining = sum(len(t) for t in iri_terms.values())
+        print(f"Processing {remaining} remaining terms ({len(iri_terms)} unique IRIs)...")
 
         if remaining == 0:
             print("All terms already processed!")
             return
 
+        hits, stale = {}, {}
+        if cache is not None:
+            hits, to_fetch = cache.partition(iri_terms, refresh_stale=args.refresh_stale)
+            # Expired entries are refetched, but kept as the fallback if that fails
+            stale = cache.get_many(to_fetch)
+            print(f"Term cache {args.cache}: {len(hits)} hits, {len(to_fetch)} IRIs to fetch ({len(stale)} stale)")
+            iri_terms_to_fetch = {iri: iri_terms[iri] for iri in to_fetch}
+        else:
+            iri_terms_to_fetch = dict(iri_terms)
+
         mode = "a" if csv_exists else "w"
         with open("term_synonyms.csv", mode, newline="") as csvfile:
             writer = csv.writer(csvfile)
             if not csv_exists:
                 writer.writerow(["Term", "URLs", "Synonyms"])
 
-            total_batches = (remaining + BATCH_SIZE - 1) // BATCH_SIZE
-
-            for i in range(0, remaining, BATCH_SIZE):
-                batch = terms_to_process[i : i + BATCH_SIZE]
-                batch_num = (i // BATCH_SIZE) + 1
-                print(f"\nProcessing batch {batch_num}/{total_batches} ({len(batch)} terms)")
-
-                with concurrent.futures.ThreadPoolExecutor(
-                    max_workers=MAX_WORKERS
-                ) as executor:
-                    future_to_term = {
-                        executor.submit(process_term, term, term_data, prefixes): term
-                        for term, term_data in batch
-                    }
-
-                    for future in tqdm(
-                        concurrent.futures.as_completed(future_to_term),
-                        total=len(batch),
-                        desc=f"Batch {batch_num}",
-                    ):
-                        try:
-                            result = future.result(timeout=FUTURE_TIMEOUT)
-                            if result:
-                                writer.writerow(result)
-                        except concurrent.futures.TimeoutError:
-                            term_name = future_to_term[future]
-                            print(f"\nTimeout processing term: {term_name}")
-                        except Exception as e:
-                            term_name = future_to_term[future]
-                            print(f"\nError processing term {term_name}: {e}")
-
-                csvfile.flush()
+            written = 0
+            for iri, entry in hits.items():
+                written += write_rows(writer, iri, iri_terms[iri], entry.synonyms)
+
+            if store is not None:
+                local = 0
+                for iri in list(iri_terms_to_fetch):
+                    with span("ontology store lookup", "io"):
+                        term = store.lookup(iri)
+                    if term is None:
+                        continue
+                    written += write_rows(writer, iri, iri_terms_to_fetch.pop(iri), term["synonyms"])
+                    if cache is not None:
+                        cache.put(iri, "dump", term["synonyms"], term["label"], term["obsolete"], commit=False)
+                    local += 1
+                print(f"Ontology store {args.ontology_store}: {local} IRIs served locally, "
+                      f"{len(iri_terms_to_fetch)} not covered")
+
+            if args.offline:
+                kept = [iri for iri in iri_terms_to_fetch if iri in stale]
+                for iri in kept:
+                    written += write_rows(writer, iri, iri_terms_to_fetch[iri], stale[iri].synonyms)
+                if kept:
+                    print(f"Offline: keeping stale cached synonyms for {len(kept)} IRIs")
+                if len(iri_terms_to_fetch) > len(kept):
+                    print(f"Offline: skipping {len(iri_terms_to_fetch) - len(kept)} IRIs not in the local store/cache")
+                iri_terms_to_fetch = {}
+
+            print(f"Concurrency: {args.concurrency}, rate limit: {args.rate_limit or 'off'} req/s per host")
+            with span("fetch pipeline", iris=len(iri_terms_to_fetch)):
+                written += asyncio.run(
+                    run_pipeline(iri_terms_to_fetch, csvfile, args.concurrency, args.rate_limit, cache, stale)
+                )
+            print(f"\nWrote {written} rows with synonyms")
 
         print("\nProcessing complete! Results saved to term_synonyms.csv")
 
@@ -329,6 +607,10 @@ def main() -> None:
         sys.exit(1)
     finally:
         signal.alarm(0)
+        if cache is not None:
+            cache.close()
+        if store is not None:
+            store.close()
 
 
 if __name__ == "__main__":
@@ -8,45 +8,40 @@ import os
 import argparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import jsonref
-import synapseclient
 from collections import OrderedDict
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from schema_index import SchemaIndex
+from schema_passes import DEFAULT_PASSES, DERIVED_SCHEMAS, SCHEMA_PASSES, run_pipeline, schema_json
+from stage_profiling import add_profile_argument, span, start_profiling
 
 def run_cmd(cmd):
     """Run command and return output."""
     try:
-        result = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True)
+        with span(cmd[0], "subprocess", args=" ".join(cmd[1:])):
+            result = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True)
         return result.stdout
     except subprocess.CalledProcessError:
         return None
 
-def get_class_property_order(schema_yaml_path, cls_name):
-    """Get the property order from the original YAML schema."""
-    try:
-        # Use a custom YAML loader that preserves order
-        from yaml import load
-        try:
-            from yaml import CLoader as Loader
-        except ImportError:
-            from yaml import Loader
+def property_orders(model):
+    """Property order for every class in the model, computed once per run.
 
-        with open(schema_yaml_path, 'r') as f:
-            # Load YAML while preserving key order
-            schema_data = load(f, Loader=Loader)
+    The order of SchemaIndex.induced_slots, which NF.attributes.jsonl and
+    entity views use too: a class's own `slots` (or `attributes`,
+    PortalDataset style) come first, then those it inherits, nearest `is_a`
+    parent first, so inherited fields keep the order their parent declares
+    instead of falling back to alphabetical.
 
-        cls_def = schema_data.get('classes', {}).get(cls_name, {})
+    Args:
+        model: Loaded LinkML model dict (e.g. dist/NF.yaml)
 
-        # Check if properties are defined in 'attributes' (PortalDataset style)
-        if 'attributes' in cls_def:
-            return list(cls_def['attributes'].keys())
-        # Otherwise check for 'slots' (Template style)
-        elif 'slots' in cls_def:
-            return cls_def['slots']
-
-        return []
-    except Exception as e:
-        print(f"Warning: Could not determine property order for {cls_name}: {e}")
-        return []
+    Returns:
+        {class name: [property names in order]}
+    """
+    index = SchemaIndex(model)
+    return {cls_name: list(index.induced_slots(cls_name)) for cls_name in index.classes}
 
 def reorder_properties(properties, property_order):
     """Reorder properties dict based on specified order."""
@@ -67,8 +62,142 @@ def reorder_properties(properties, property_order):
 
     return dict(ordered)
 
-def process_schema(raw_schema, cls_name, version=None, schema_yaml_path=None):
-    """Process and clean the JSON schema."""
+# Enum value lists and anyOf combinations, shared by every schema processed in
+# this process: the ~70 classes reference the same few hundred enums, so each
+# distinct list is stored once and each combination is built once. Treat the
+# lists in processed schemas as read-only.
+_ENUM_VALUES = {}
+_COMBINED_ENUMS = {}
+
+
+def _shared_enum(values):
+    """The interned list equal to values."""
+    key = tuple(values)
+    shared = _ENUM_VALUES.get(key)
+    if shared is None:
+        shared = _ENUM_VALUES[key] = list(key)
+    return shared
+
+
+def _combined_enum(enums):
+    """Concatenation of interned enum lists, built once per combination."""
+    # The lists are kept alive by _ENUM_VALUES, so their ids are stable keys
+    key = tuple(map(id, enums))
+    combined = _COMBINED_ENUMS.get(key)
+    if combined is None:
+        combined = _COMBINED_ENUMS[key] = _shared_enum([value for values in enums for value in values])
+    return combined
+
+
+def _combine_anyof_enums(obj):
+    """Replace an anyOf whose options are all enums with a single enum, in place."""
+    options = obj.get("anyOf")
+    if not isinstance(options, list) or not all(isinstance(item, dict) and "enum" in item for item in options):
+        return
+    if all(isinstance(item["enum"], list) for item in options):
+        obj["enum"] = _combined_enum([item["enum"] for item in options])
+    else:
+        obj["enum"] = [value for item in options for value in item["enum"]]
+    del obj["anyOf"]
+    # Keep the first non-empty description if the property has none
+    if "description" not in obj:
+        for item in options:
+            if item.get("description"):
+                obj["description"] = item["description"]
+                break
+
+
+def _resolve(node, defs, resolved, combine):
+    """Copy of node with local $refs replaced by their (processed) $defs entry.
+
+    A $ref object is replaced by a fresh dict of the referenced definition,
+    and any other keys next to the $ref are dropped (as jsonref does without
+    merge_props). Enum lists are interned; with combine, all-enum anyOfs are
+    merged as the tree is copied, so everything happens in one walk.
+
+    Args:
+        node: JSON value to copy
+        defs: The raw schema's $defs
+        resolved: Per-schema memo of processed definitions, by (name, combine)
+        combine: Whether to merge all-enum anyOfs (done under properties only)
+    """
+    if isinstance(node, list):
+        return [_resolve(item, defs, resolved, combine) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    ref = node.get("$ref")
+    if isinstance(ref, str) and ref.startswith("#/$defs/") and ref[8:] in defs:
+        key = (ref[8:], combine)
+        if key not in resolved:
+            resolved[key] = None  # in progress: a recursive reference stays a $ref
+            resolved[key] = _resolve(defs[ref[8:]], defs, resolved, combine)
+        target = resolved[key]
+        if target is not None:
+            return dict(target) if isinstance(target, dict) else target
+
+    obj = {}
+    for key, value in node.items():
+        if key == "enum" and isinstance(value, list):
+            obj[key] = _shared_enum(value)
+        else:
+            obj[key] = _resolve(value, defs, resolved, combine)
+    if combine:
+        _combine_anyof_enums(obj)
+    return obj
+
+
+def _drop_spurious_then_required(block):
+    """Remove spurious `required` entries from an if-then block, in place.
+
+    LinkML adds a field to then.required whenever a postcondition constrains it,
+    even when the intent is only to add maximum/minimum — not to make it required.
+    Heuristic: if then.properties[field] is non-empty (has a real constraint like
+    maximum), the required entry is spurious and should be removed. If it is empty
+    ({}), the required IS the constraint (e.g. ageUnit required when age present)
+    and must be kept.
+    """
+    then = block.get("then", {})
+    if "required" not in then:
+        return
+    then_props = then.get("properties", {})
+    then["required"] = [
+        f for f in then["required"]
+        if not then_props.get(f)  # keep if property constraint is absent or empty
+    ]
+    if not then["required"]:
+        del then["required"]
+
+
+def _process_property(prop_name, prop_schema):
+    """Finish one top-level property: drop a spurious `type` and set its title."""
+    if not isinstance(prop_schema, dict):
+        return prop_schema
+    # Remove spurious top-level `type` on properties with heterogeneous anyOf.
+    # LinkML emits `type: string` alongside `anyOf` even when anyOf includes
+    # numeric branches, making numbers fail validation. Strip it when anyOf
+    # already covers the type constraints.
+    if "anyOf" in prop_schema and "type" in prop_schema:
+        anyof_types = {item.get("type") for item in prop_schema["anyOf"] if isinstance(item, dict)}
+        if len(anyof_types) > 1 or anyof_types - {prop_schema["type"]}:
+            del prop_schema["type"]
+    # Set title to match property key name
+    prop_schema["title"] = prop_name
+    return prop_schema
+
+
+def process_schema(raw_schema, cls_name, version=None, property_order=None):
+    """Process and clean the JSON schema.
+
+    One walk over the raw LinkML output: $refs are inlined from $defs (only
+    the definitions the class actually reaches), all-enum anyOfs under
+    properties are combined, if-then blocks, property types and titles are
+    fixed up, and generator metadata is dropped. Further rewrites are passes
+    in schema_passes.py, run on the result before it is written.
+    Enum lists are shared with other schemas processed in this process.
+    Properties are sorted by property_order (see property_orders), with any
+    others after them alphabetically.
+    """
     # Set metadata with optional version
     if version:
         raw_schema["$id"] = f"https://repo-prod.prod.sagebase.org/repo/v1/schema/type/registered/org.synapse.nf-{cls_name.lower()}-{version}"
@@ -79,127 +208,30 @@ def process_schema(raw_schema, cls_name, version=None, schema_yaml_path=None):
     # Force JSON Schema Draft 7
     raw_schema["$schema"] = "http://json-schema.org/draft-07/schema#"
 
-    # Dereference and inline enums
-    deref = jsonref.replace_refs(raw_schema, merge_props=False, proxies=False)
-    defs = deref.pop("$defs", {})
-
-    def inline_enums(obj):
-        if isinstance(obj, dict):
-            if "$ref" in obj:
-                ref = obj.pop("$ref")
-                enum_name = ref.rsplit("/", 1)[-1]
-                enum_def = defs.get(enum_name, {})
-                if "enum" in enum_def:
-                    obj["enum"] = enum_def["enum"]
-                    if "title" in enum_def:
-                        obj["title"] = enum_def["title"]
-                return
-            for value in obj.values():
-                inline_enums(value)
-        elif isinstance(obj, list):
-            for item in obj:
-                inline_enums(item)
-
-    inline_enums(deref.get("properties", {}))
-
-    # Combine anyOf enums into single enum for efficiency
-    def combine_anyof_enums(obj):
-        if isinstance(obj, dict):
-            # Check if this is an anyOf with multiple enum options
-            if "anyOf" in obj and isinstance(obj["anyOf"], list):
-                # Check if all items in anyOf are enums
-                all_enums = all(
-                    isinstance(item, dict) and "enum" in item
-                    for item in obj["anyOf"]
-                )
-
-                if all_enums:
-                    # Save anyOf items before deleting
-                    anyof_items = obj["anyOf"]
-
-                    # Combine all enum values into a single list
-                    combined_enums = []
-                    for item in anyof_items:
-                        combined_enums.extend(item["enum"])
-
-                    # Replace anyOf with single enum
-                    obj["enum"] = combined_enums
-                    del obj["anyOf"]
-
-                    # Keep the description if not already present
-                    if "description" not in obj and any("description" in item for item in anyof_items):
-                        # Use first non-empty description
-                        for item in anyof_items:
-                            if "description" in item and item["description"]:
-                                obj["description"] = item["description"]
-                                break
-
-            # Recurse into nested objects
-            for value in obj.values():
-                combine_anyof_enums(value)
-        elif isinstance(obj, list):
-            for item in obj:
-                combine_anyof_enums(item)
-
-    combine_anyof_enums(deref.get("properties", {}))
-
-    # Remove spurious `required` entries from if-then blocks.
-    # LinkML adds a field to then.required whenever a postcondition constrains it,
-    # even when the intent is only to add maximum/minimum — not to make it required.
-    # Heuristic: if then.properties[field] is non-empty (has a real constraint like
-    # maximum), the required entry is spurious and should be removed. If it is empty
-    # ({}), the required IS the constraint (e.g. ageUnit required when age present)
-    # and must be kept.
-    for block in [deref] + deref.get("allOf", []):
-        then = block.get("then", {})
-        if "required" not in then:
+    defs = raw_schema.get("$defs", {})
+    resolved = {}
+    schema = {}
+    for key, value in raw_schema.items():
+        if key in ("$defs", "additionalProperties", "metamodel_version", "version"):
             continue
-        then_props = then.get("properties", {})
-        then["required"] = [
-            f for f in then["required"]
-            if not then_props.get(f)  # keep if property constraint is absent or empty
-        ]
-        if not then["required"]:
-            del then["required"]
-
-    # Remove spurious top-level `type` on properties with heterogeneous anyOf.
-    # LinkML emits `type: string` alongside `anyOf` even when anyOf includes
-    # numeric branches, making numbers fail validation. Strip it when anyOf
-    # already covers the type constraints.
-    if "properties" in deref:
-        for prop_schema in deref["properties"].values():
-            if isinstance(prop_schema, dict) and "anyOf" in prop_schema and "type" in prop_schema:
-                anyof_types = {item.get("type") for item in prop_schema["anyOf"] if isinstance(item, dict)}
-                if len(anyof_types) > 1 or anyof_types - {prop_schema["type"]}:
-                    del prop_schema["type"]
-
-    # Set title to match property key name
-    if "properties" in deref:
-        for prop_name, prop_schema in deref["properties"].items():
-            if isinstance(prop_schema, dict):
-                prop_schema["title"] = prop_name
-
-    # Remove unwanted metadata
-    for key in ["additionalProperties", "metamodel_version", "version"]:
-        deref.pop(key, None)
+        if key == "properties" and isinstance(value, dict):
+            schema[key] = {
+                prop_name: _process_property(prop_name, _resolve(prop_schema, defs, resolved, combine=True))
+                for prop_name, prop_schema in value.items()
+            }
+        else:
+            schema[key] = _resolve(value, defs, resolved, combine=False)
 
-    # Remove Filename and Component properties (issue #708)
-    if "properties" in deref:
-        for field in ["Filename", "Component"]:
-            deref["properties"].pop(field, None)
-
-    # Also remove from required array if present
-    if "required" in deref:
-        deref["required"] = [r for r in deref["required"] if r not in ["Filename", "Component"]]
+    for block in [schema] + schema.get("allOf", []):
+        _drop_spurious_then_required(block)
 
     # Reorder properties to match YAML order
-    if schema_yaml_path and "properties" in deref:
-        property_order = get_class_property_order(schema_yaml_path, cls_name)
-        deref["properties"] = reorder_properties(deref["properties"], property_order)
+    if property_order and "properties" in schema:
+        schema["properties"] = reorder_properties(schema["properties"], property_order)
 
-    return deref
+    return schema
 
-def validate_schemas(paths: list[Path], syn: synapseclient.Synapse) -> dict[Path, bool]:
+def validate_schemas(paths: list[Path], syn: "synapseclient.Synapse") -> dict[Path, bool]:
     """Validate schemas against Synapse API (dry run) in parallel.
 
     Starts all async jobs concurrently, then polls until every job settles.
@@ -212,7 +244,8 @@ def validate_schemas(paths: list[Path], syn: synapseclient.Synapse) -> dict[Path
     def _start(path: Path):
         data = json.loads(path.read_text())
         body = json.dumps({"schema": data, "dryRun": True})
-        resp = syn.restPOST("/schema/type/create/async/start", body)
+        with span("POST /schema/type/create/async/start", "http", schema=path.name):
+            resp = syn.restPOST("/schema/type/create/async/start", body)
         return resp["token"], path
 
     print(f"\n🚀 Starting {len(paths)} Synapse validation jobs...")
@@ -233,7 +266,8 @@ def validate_schemas(paths: list[Path], syn: synapseclient.Synapse) -> dict[Path
         settled_tokens = []
         for token, path in list(pending.items()):
             try:
-                status = syn.restGET(f"/asynchronous/job/{token}")
+                with span("GET /asynchronous/job", "http", schema=path.name):
+                    status = syn.restGET(f"/asynchronous/job/{token}")
                 if status["jobState"] == "PROCESSING":
                     continue
                 settled_tokens.append(token)
@@ -250,7 +284,8 @@ def validate_schemas(paths: list[Path], syn: synapseclient.Synapse) -> dict[Path
         for t in settled_tokens:
             del pending[t]
         if pending:
-            time.sleep(2)
+            with span("poll wait", "wait", pending=len(pending)):
+                time.sleep(2)
 
     return results
 
@@ -271,12 +306,24 @@ def main():
     parser.add_argument("--skip-validation",
                        action="store_true",
                        help="Skip validation step and only generate JSON schemas")
+    parser.add_argument("--validate-only",
+                       action="store_true",
+                       help="Validate the JSON schemas already in --output-dir (e.g. from build.py) without regenerating them")
     parser.add_argument("--class",
                        dest="class_name",
                        default=None,
                        help="Generate schema for a specific class only (e.g., DataLandscape)")
+    parser.add_argument("--schema-pass",
+                       dest="schema_passes",
+                       action="append",
+                       default=[],
+                       choices=[name for name in SCHEMA_PASSES if name not in DEFAULT_PASSES],
+                       help="Extra in-memory pass to apply before writing (see schema_passes.py); repeatable")
+    add_profile_argument(parser)
 
     args = parser.parse_args()
+    start_profiling("gen-json-schema-class", args.profile)
+    passes = (*DEFAULT_PASSES, *args.schema_passes)
     
     # Set up paths
     SCHEMA_YAML = Path(args.schema_yaml)
@@ -288,8 +335,10 @@ def main():
         exit(1)
     
     # Get class names
-    master = yaml.safe_load(SCHEMA_YAML.read_text())
+    with span("yaml load", "io", path=str(SCHEMA_YAML)):
+        master = yaml.safe_load(SCHEMA_YAML.read_text())
     classes = master.get("classes", {})
+    orders = property_orders(master)
 
     # Filter to specific class if requested
     if args.class_name:
@@ -299,7 +348,7 @@ def main():
             exit(1)
         classes = {args.class_name: classes[args.class_name]}
         print(f"🔨 Generating JSON schema for class: {args.class_name}")
-    else:
+    elif not args.validate_only:
         print(f"🔨 Generating JSON schemas for {len(classes)} classes...")
 
     def _generate_one(cls_name):
@@ -313,28 +362,36 @@ def main():
             return cls_name, False
         try:
             raw_schema = json.loads(schema_str)
-            final_schema = process_schema(raw_schema, cls_name, args.version, SCHEMA_YAML)
-            output_file = OUT_DIR / f"{cls_name}.json"
-            output_file.write_text(json.dumps(final_schema, indent=2))
+            with span("process_schema", cls=cls_name):
+                final_schema = process_schema(raw_schema, cls_name, args.version, orders.get(cls_name))
+                outputs = run_pipeline(final_schema, cls_name, passes, derived=DERIVED_SCHEMAS)
+            for name, schema in outputs.items():
+                output_file = OUT_DIR / f"{name}.json"
+                with span("json dump", "io", path=output_file.name):
+                    output_file.write_text(schema_json(name, schema))
             return cls_name, True
         except json.JSONDecodeError:
             return cls_name, False
 
-    print(f"🔨 Generating {len(classes)} schemas in parallel...")
-    with ThreadPoolExecutor(max_workers=8) as pool:
-        futures = {pool.submit(_generate_one, name): name for name in classes}
-        for future in as_completed(futures):
-            cls_name, ok = future.result()
-            status = "✅" if ok else "❌"
-            print(f"  {status} {cls_name}")
-    
+    if args.validate_only:
+        print(f"⏭️  Validating the existing schemas in {OUT_DIR} (--validate-only flag set)")
+    else:
+        print(f"🔨 Generating {len(classes)} schemas in parallel...")
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = {pool.submit(_generate_one, name): name for name in classes}
+            for future in as_completed(futures):
+                cls_name, ok = future.result()
+                status = "✅" if ok else "❌"
+                print(f"  {status} {cls_name}")
+
     # Count only the schemas we generated in this run
     if args.class_name:
         generated_count = 1 if (OUT_DIR / f"{args.class_name}.json").exists() else 0
     else:
         generated_count = len(list(OUT_DIR.glob('*.json')))
 
-    print(f"✅ Generated {generated_count} JSON schema{'s' if generated_count != 1 else ''}")
+    if not args.validate_only:
+        print(f"✅ Generated {generated_count} JSON schema{'s' if generated_count != 1 else ''}")
 
     if args.skip_validation:
         print("\n⏭️  Skipping validation (--skip-validation flag set)")
@@ -346,15 +403,20 @@ def main():
     else:
         schemas_to_validate = sorted(OUT_DIR.glob('*.json'))
 
-    # Initialize Synapse client once for all validations
+    # Initialize Synapse client once for all validations (imported here so
+    # --skip-validation runs never load it)
+    import synapseclient
+
     syn = synapseclient.Synapse()
     auth_token = os.environ.get('SYNAPSE_AUTH_TOKEN')
     if not auth_token:
         print("❌ SYNAPSE_AUTH_TOKEN environment variable is required for validation")
         exit(1)
-    syn.login(authToken=auth_token)
+    with span("synapse login", "http"):
+        syn.login(authToken=auth_token)
 
-    results_map = validate_schemas(schemas_to_validate, syn)
+    with span("validate schemas"):
+        results_map = validate_schemas(schemas_to_validate, syn)
 
     # Summary
     passed = sum(results_map.values())
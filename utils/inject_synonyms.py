@@ -6,15 +6,23 @@ Supports both full URIs and CURIEs in the meaning field.
 """
 import os
 import sys
+import io
 import yaml
 import csv
+import contextlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from difflib import SequenceMatcher
+from functools import lru_cache
 
 # Global flag for dry-run mode
 DRY_RUN_MODE = False
 
 import re
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stage_profiling import add_profile_argument, span, start_profiling
+
 # Configure YAML to represent None as empty string instead of 'null'
 def represent_none(self, data):
     return self.represent_scalar('tag:yaml.org,2002:null', '')
@@ -38,9 +46,12 @@ def expand_curie(curie, prefixes):
     
     return curie
 
+_NON_ALNUM = re.compile(r'[^a-zA-Z0-9]')
+
+@lru_cache(maxsize=65536)
 def normalize_for_comparison(text):
     """Normalize text for fuzzy comparison (remove spaces, punctuation, lowercase)"""
-    return re.sub(r'[^a-zA-Z0-9]', '', text.lower())
+    return _NON_ALNUM.sub('', text.lower())
 
 def is_case_only_difference(term, synonym):
     """Check if two strings differ only by case and punctuation"""
@@ -77,96 +88,290 @@ def load_synonyms_from_csv(csv_file):
         print(f"Error reading CSV file {csv_file}: {str(e)}")
         return synonyms_dict
 
+def load_synonyms_from_cache(cache_path, modules_dir, prefixes_file='header.yaml'):
+    """Build a term -> synonyms dictionary from the IRI-keyed term cache.
+
+    Each permissible value's `meaning` is expanded to a full IRI and looked up
+    in the cache filled by extract_synonyms.py --cache, so terms are matched by
+    ontology IRI rather than by label. Obsolete terms are skipped.
+    """
+    import glob
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from term_cache import TermCache
+
+    synonyms_dict = {}
+    if not os.path.exists(cache_path):
+        print(f"Warning: term cache {cache_path} not found")
+        return synonyms_dict
+
+    with open(prefixes_file, 'r', encoding='utf-8') as f:
+        prefixes = (yaml.safe_load(f) or {}).get('prefixes', {})
+
+    term_iris = {}
+    for yaml_file in glob.glob(os.path.join(modules_dir, "**/*.yaml"), recursive=True):
+        with open(yaml_file, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or {}
+        for enum_data in (data.get('enums') or {}).values():
+            for term, term_data in (enum_data.get('permissible_values') or {}).items():
+                if isinstance(term_data, dict) and term_data.get('meaning'):
+                    term_iris[term] = expand_curie(term_data['meaning'], prefixes)
+
+    with TermCache(cache_path) as cache:
+        cached = cache.get_many(set(term_iris.values()))
+
+    for term, iri in term_iris.items():
+        entry = cached.get(iri)
+        if entry and entry.synonyms and not entry.obsolete:
+            synonyms_dict[term] = list(entry.synonyms)
+
+    print(f"Loaded synonyms for {len(synonyms_dict)} terms from term cache {cache_path}")
+    return synonyms_dict
+
+class _ComparisonKey:
+    """A string normalized once, with the character counts used for ratio bounds."""
+    __slots__ = ('text', 'key', 'counts', '_matcher')
+
+    def __init__(self, text):
+        self.text = text
+        self.key = normalize_for_comparison(text)
+        self.counts = Counter(self.key)
+        self._matcher = None
+
+    def ratio_against(self, other):
+        """SequenceMatcher(None, other.key, self.key).ratio(), reusing this key's index."""
+        if self._matcher is None:
+            self._matcher = SequenceMatcher(None, '', self.key)
+        self._matcher.set_seq1(other.key)
+        return self._matcher.ratio()
+
+def _is_near_duplicate(a, b, fuzzy_threshold):
+    """
+    Same answer as similarity_ratio(a.text, b.text) >= fuzzy_threshold.
+
+    Identical normalized keys match outright. Otherwise the length bound and
+    the character-multiset bound (the ratio can never exceed either) reject
+    most pairs before SequenceMatcher runs.
+    """
+    if a.key == b.key:
+        return True
+    total = len(a.key) + len(b.key)
+    if 2.0 * min(len(a.key), len(b.key)) / total < fuzzy_threshold:
+        return False
+    if 2.0 * sum((a.counts & b.counts).values()) / total < fuzzy_threshold:
+        return False
+    return b.ratio_against(a) >= fuzzy_threshold
+
 def filter_synonyms(term, synonyms, fuzzy_threshold=0.9):
     """
     Filter synonyms to:
     1. Skip case-only differences
     2. Use fuzzy matching for near-duplicates
+
+    Each string is normalized once; accepted synonyms are bucketed by
+    normalized key so exact collapses are a set lookup, and fuzzy checks are
+    pruned with cheap upper bounds on the SequenceMatcher ratio.
     """
     filtered = []
-    
+    accepted = []
+    accepted_keys = {}
+    term_key = _ComparisonKey(term)
+
     for synonym in synonyms:
         # Skip exact matches (case sensitive)
         if synonym == term:
             continue
-            
+
+        candidate = _ComparisonKey(synonym)
+
         # Skip case-only differences
-        if is_case_only_difference(term, synonym):
+        if candidate.key == term_key.key:
             print(f"  Skipping case-only difference: '{term}' vs '{synonym}'")
             continue
-            
+
         # Check for fuzzy matches with existing filtered synonyms
-        is_fuzzy_duplicate = False
-        for existing in filtered:
-            if similarity_ratio(synonym, existing) >= fuzzy_threshold:
-                print(f"  Skipping fuzzy duplicate: '{synonym}' (similar to '{existing}')")
-                is_fuzzy_duplicate = True
-                break
-                
-        if not is_fuzzy_duplicate:
-            # Also check against the original term
-            if similarity_ratio(synonym, term) < fuzzy_threshold:
-                filtered.append(synonym)
-            else:
-                print(f"  Skipping fuzzy match with term: '{synonym}' vs '{term}'")
-    
+        existing = accepted_keys.get(candidate.key)
+        if existing is None:
+            existing = next(
+                (other.text for other in accepted if _is_near_duplicate(candidate, other, fuzzy_threshold)),
+                None,
+            )
+        if existing is not None:
+            print(f"  Skipping fuzzy duplicate: '{synonym}' (similar to '{existing}')")
+            continue
+
+        # Also check against the original term
+        if _is_near_duplicate(candidate, term_key, fuzzy_threshold):
+            print(f"  Skipping fuzzy match with term: '{synonym}' vs '{term}'")
+            continue
+
+        filtered.append(synonym)
+        accepted.append(candidate)
+        accepted_keys.setdefault(candidate.key, synonym)
+
     return filtered
 
-def inject_synonyms_into_yaml(yaml_file, synonyms_dict, output_file=None):
-    """Inject synonyms as aliases into the YAML file"""
-    
+_NULL_TAG = 'tag:yaml.org,2002:null'
+_STR_TAG = 'tag:yaml.org,2002:str'
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+def plan_alias_additions(data, synonyms_dict, fuzzy_threshold=0.9):
+    """
+    Merge filtered synonyms into the aliases of matching permissible values.
+
+    Mutates data in place (existing aliases are kept first) and returns
+    {(enum_name, term): [aliases appended]} for every term that changed.
+    """
+    additions = {}
+    for enum_name, enum_data in ((data or {}).get('enums') or {}).items():
+        if not isinstance(enum_data, dict) or not enum_data.get('permissible_values'):
+            continue
+        for term, term_data in enum_data['permissible_values'].items():
+            if term not in synonyms_dict or not (term_data is None or isinstance(term_data, dict)):
+                continue
+            # Filter new synonyms from CSV
+            filtered_new = filter_synonyms(term, synonyms_dict[term], fuzzy_threshold)
+            if not filtered_new:
+                continue
+
+            # Merge with existing aliases (preserve manually-added ones)
+            existing = (term_data or {}).get('aliases', []) or []
+            merged = list(existing)
+            added = []
+            for syn in filtered_new:
+                if syn not in merged:
+                    merged.append(syn)
+                    added.append(syn)
+
+            if added:
+                if term_data is None:
+                    term_data = {}
+                    enum_data['permissible_values'][term] = term_data
+                term_data['aliases'] = merged
+                additions[(enum_name, term)] = added
+                print(f"Added {len(added)} new aliases to '{term}' (total: {len(merged)})")
+    return additions
+
+def _mapping_items(node):
+    """Map string keys of a block mapping node to (key_node, value_node)."""
+    if not isinstance(node, yaml.MappingNode):
+        return {}
+    return {k.value: (k, v) for k, v in node.value if isinstance(k, yaml.ScalarNode) and k.tag == _STR_TAG}
+
+def _is_empty(node):
+    return isinstance(node, yaml.ScalarNode) and node.tag == _NULL_TAG and node.value == ''
+
+def _last_line(node):
+    """0-based index of the last source line belonging to a node."""
+    if isinstance(node, yaml.MappingNode) and node.value and not node.flow_style:
+        key, value = node.value[-1]
+        return _last_line(key if _is_empty(value) else value)
+    if isinstance(node, yaml.SequenceNode) and node.value and not node.flow_style:
+        return _last_line(node.value[-1])
+    end = node.end_mark
+    return end.line - 1 if end.column == 0 and end.line > node.start_mark.line else end.line
+
+def _yaml_item(text):
+    """Render one alias as a single-line YAML scalar, or None if it needs more."""
+    dumped = yaml.safe_dump([text], allow_unicode=True, width=float('inf'), default_flow_style=False)
+    item = dumped[2:].rstrip('\n')
+    return None if '\n' in item else item
+
+def patch_aliases_text(text, additions):
+    """
+    Append aliases to permissible values by editing only the affected lines.
+
+    Args:
+        text: Original YAML source
+        additions: {(enum_name, term): [aliases to append]}
+
+    Returns:
+        Patched source, or None if some target is not in plain block style
+        (flow collections, explicit nulls, multi-line values...)
+    """
+    root = yaml.compose(text, Loader=_SafeLoader)
+    enums = _mapping_items(root).get('enums', (None, None))[1]
+    enum_items = _mapping_items(enums)
+
+    inserts = []  # (line index to insert after, [lines])
+    for (enum_name, term), added in additions.items():
+        items = [_yaml_item(a) for a in added]
+        if None in items:
+            return None
+        enum_node = enum_items.get(enum_name, (None, None))[1]
+        pvs = _mapping_items(enum_node).get('permissible_values', (None, None))[1]
+        if not isinstance(pvs, yaml.MappingNode) or pvs.flow_style:
+            return None
+        key_node, value_node = _mapping_items(pvs).get(term, (None, None))
+        if key_node is None or key_node.start_mark.line != key_node.end_mark.line:
+            return None
+
+        if _is_empty(value_node):
+            pad = ' ' * (key_node.start_mark.column + 2)
+            inserts.append((key_node.start_mark.line, [f"{pad}aliases:"] + [f"{pad}- {i}" for i in items]))
+            continue
+        if not isinstance(value_node, yaml.MappingNode) or value_node.flow_style or not value_node.value:
+            return None
+
+        alias_key, alias_node = _mapping_items(value_node).get('aliases', (None, None))
+        if alias_key is None:
+            pad = ' ' * value_node.value[0][0].start_mark.column
+            inserts.append((_last_line(value_node), [f"{pad}aliases:"] + [f"{pad}- {i}" for i in items]))
+        elif _is_empty(alias_node):
+            pad = ' ' * alias_key.start_mark.column
+            inserts.append((alias_key.start_mark.line, [f"{pad}- {i}" for i in items]))
+        elif isinstance(alias_node, yaml.SequenceNode) and not alias_node.flow_style and alias_node.value:
+            last = alias_node.value[-1]
+            pad = ' ' * (last.start_mark.column - 2)
+            inserts.append((_last_line(last), [f"{pad}- {i}" for i in items]))
+        else:
+            return None
+
+    lines = text.splitlines(keepends=True)
+    if lines and not lines[-1].endswith('\n'):
+        lines[-1] += '\n'
+    for after, new_lines in sorted(inserts, key=lambda x: x[0], reverse=True):
+        lines[after + 1:after + 1] = [line + '\n' for line in new_lines]
+    return ''.join(lines)
+
+def inject_synonyms_into_yaml(yaml_file, synonyms_dict, output_file=None, fuzzy_threshold=0.9, dry_run=None):
+    """
+    Inject synonyms as aliases into the YAML file.
+
+    Only the alias lists of changed permissible values are edited in the
+    source text; the rest of the file keeps its formatting. If a target
+    cannot be patched textually the whole document is re-serialized as before.
+    The file is written only when something changed.
+    """
+    dry_run = DRY_RUN_MODE if dry_run is None else dry_run
+
     if not os.path.exists(yaml_file):
         print(f"Error: YAML file {yaml_file} not found")
         return False
-        
+
     try:
-        # Load YAML file
         with open(yaml_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            
-        modifications_made = 0
-        
-        # Process enums
-        if 'enums' in data:
-            for enum_name, enum_data in data['enums'].items():
-                if 'permissible_values' in enum_data:
-                    for term, term_data in enum_data['permissible_values'].items():
-                        if term in synonyms_dict:
-                            # Filter new synonyms from CSV
-                            filtered_new = filter_synonyms(term, synonyms_dict[term])
-
-                            if filtered_new:
-                                if term_data is None:
-                                    term_data = {}
-                                    enum_data['permissible_values'][term] = term_data
-
-                                # Merge with existing aliases (preserve manually-added ones)
-                                existing = term_data.get('aliases', []) or []
-                                merged = list(existing)
-                                added = 0
-                                for syn in filtered_new:
-                                    if syn not in merged:
-                                        merged.append(syn)
-                                        added += 1
-
-                                if added > 0:
-                                    term_data['aliases'] = merged
-                                    modifications_made += 1
-                                    print(f"Added {added} new aliases to '{term}' (total: {len(merged)})")
-        
-        # Write output only if changes were made
-        if modifications_made > 0:
-            output_path = output_file or yaml_file
-            if DRY_RUN_MODE:
-                print(f"\n[DRY-RUN] Would write changes to: {output_path}")
-                print(f"[DRY-RUN] Would modify {modifications_made} terms")
-            else:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    yaml.dump(data, f, default_flow_style=False, allow_unicode=True, width=1000)
-                print(f"Modified {modifications_made} terms in {output_path}")
-            
-        return modifications_made > 0
-        
+            text = f.read()
+        data = yaml.load(text, Loader=_SafeLoader)
+
+        additions = plan_alias_additions(data, synonyms_dict, fuzzy_threshold)
+        if not additions:
+            return False
+
+        patched = patch_aliases_text(text, additions)
+        if patched is None or yaml.load(patched, Loader=_SafeLoader) != data:
+            print(f"  Could not patch {yaml_file} in place, rewriting the whole document")
+            patched = yaml.dump(data, default_flow_style=False, allow_unicode=True, width=1000)
+
+        output_path = output_file or yaml_file
+        if dry_run:
+            print(f"\n[DRY-RUN] Would write changes to: {output_path}")
+            print(f"[DRY-RUN] Would modify {len(additions)} terms")
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(patched)
+            print(f"Modified {len(additions)} terms in {output_path}")
+        return True
+
     except Exception as e:
         print(f"Error processing YAML file: {str(e)}")
         return False
@@ -249,46 +454,84 @@ def cleanup_aliases_in_modules(modules_dir):
     return len(modified) > 0
 
 
-def inject_synonyms_into_modules(modules_dir, synonyms_dict):
-    """Inject synonyms as aliases into all module YAML files"""
+def _permissible_value_names(yaml_file):
+    """Return the set of permissible value names defined in a module file."""
+    with open(yaml_file, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_SafeLoader) or {}
+    names = set()
+    for enum_data in (data.get('enums') or {}).values():
+        if isinstance(enum_data, dict):
+            names.update(enum_data.get('permissible_values') or {})
+    return names
+
+def _inject_file_worker(yaml_file, synonyms_subset, fuzzy_threshold, dry_run):
+    """Process-pool entry point: inject into one file and return (modified, log)."""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        modified = inject_synonyms_into_yaml(yaml_file, synonyms_subset, fuzzy_threshold=fuzzy_threshold, dry_run=dry_run)
+    return modified, log.getvalue()
+
+def inject_synonyms_into_modules(modules_dir, synonyms_dict, fuzzy_threshold=0.9, max_workers=None):
+    """
+    Inject synonyms as aliases into all module YAML files.
+
+    A term -> file index is built once, then only files defining a term with
+    synonyms are patched, in a process pool.
+    """
     import glob
-    
+
     if not os.path.exists(modules_dir):
         print(f"Error: Modules directory {modules_dir} not found")
         return False
-        
+
     # Find all YAML files in modules directory (recursively)
     yaml_pattern = os.path.join(modules_dir, "**/*.yaml")
-    yaml_files = glob.glob(yaml_pattern, recursive=True)
-    
+    yaml_files = sorted(glob.glob(yaml_pattern, recursive=True))
+
     if not yaml_files:
         print(f"No YAML files found in {modules_dir}")
         return False
-        
+
     print(f"Found {len(yaml_files)} YAML files in modules directory")
-    
-    total_modifications = 0
-    modified_files = []
-    
-    for yaml_file in yaml_files:
-        print(f"\nProcessing: {yaml_file}")
-        
-        # Process this file
-        file_modified = inject_synonyms_into_yaml(yaml_file, synonyms_dict)
-        
-        if file_modified:
-            modified_files.append(yaml_file)
-            total_modifications += 1
-    
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        # Term -> file index, restricted to terms we have synonyms for
+        file_terms = {}
+        for yaml_file, names in zip(yaml_files, pool.map(_permissible_value_names, yaml_files)):
+            matched = names.intersection(synonyms_dict)
+            if matched:
+                file_terms[yaml_file] = matched
+        print(f"{len(file_terms)} files define terms with synonyms")
+
+        futures = {
+            yaml_file: pool.submit(
+                _inject_file_worker,
+                yaml_file,
+                {term: synonyms_dict[term] for term in terms},
+                fuzzy_threshold,
+                DRY_RUN_MODE,
+            )
+            for yaml_file, terms in file_terms.items()
+        }
+
+        modified_files = []
+        for yaml_file, future in futures.items():
+            modified, log = future.result()
+            print(f"\nProcessing: {yaml_file}")
+            if log:
+                print(log, end='')
+            if modified:
+                modified_files.append(yaml_file)
+
     print(f"\n=== Summary ===")
-    print(f"Processed {len(yaml_files)} files")
+    print(f"Processed {len(file_terms)} of {len(yaml_files)} files")
     print(f"Modified {len(modified_files)} files")
-    
+
     if modified_files:
         print("\nModified files:")
         for file_path in modified_files:
             print(f"  {file_path}")
-    
+
     return len(modified_files) > 0
 
 def main():
@@ -299,6 +542,8 @@ def main():
     parser = argparse.ArgumentParser(description='Inject synonyms from CSV into YAML as aliases')
     parser.add_argument('--csv', default='term_synonyms.csv', 
                        help='Path to CSV file with synonyms (default: term_synonyms.csv)')
+    parser.add_argument('--cache',
+                       help='Read synonyms from this IRI-keyed term cache (see extract_synonyms.py --cache) instead of the CSV')
     parser.add_argument('--yaml', 
                        help='Path to single YAML file to modify (use either --yaml or --modules-dir)')
     parser.add_argument('--modules-dir', default='modules',
@@ -307,12 +552,16 @@ def main():
                        help='Output file path (only works with --yaml option)')
     parser.add_argument('--fuzzy-threshold', type=float, default=0.9,
                        help='Fuzzy matching threshold (0.0-1.0, default: 0.9)')
+    parser.add_argument('--jobs', type=int, default=None,
+                       help='Worker processes for --modules-dir (default: CPU count)')
     parser.add_argument('--cleanup', action='store_true',
                        help='Remove low-quality aliases (case/spacing-only diffs) from existing YAML files')
     parser.add_argument('--dry-run', action='store_true',
                        help='Show what would be changed without making actual modifications')
+    add_profile_argument(parser)
 
     args = parser.parse_args()
+    start_profiling("inject_synonyms", args.profile)
 
     # Set global dry-run mode
     DRY_RUN_MODE = args.dry_run
@@ -327,7 +576,7 @@ def main():
         return 0
 
     print("=== Synonym Injection Tool ===")
-    print(f"CSV file: {args.csv}")
+    print(f"Term cache: {args.cache}" if args.cache else f"CSV file: {args.csv}")
     print(f"Fuzzy threshold: {args.fuzzy_threshold}")
     if DRY_RUN_MODE:
         print("Mode: DRY-RUN (no files will be modified)")
@@ -341,8 +590,12 @@ def main():
         print("Error: --output can only be used with --yaml")
         return 1
     
-    # Load synonyms from CSV
-    synonyms_dict = load_synonyms_from_csv(args.csv)
+    # Load synonyms from the term cache (by meaning IRI) or the CSV (by term label)
+    with span("load synonyms", "io"):
+        if args.cache:
+            synonyms_dict = load_synonyms_from_cache(args.cache, args.modules_dir)
+        else:
+            synonyms_dict = load_synonyms_from_csv(args.csv)
     
     if not synonyms_dict:
         print("No synonyms loaded. Exiting.")
@@ -351,10 +604,12 @@ def main():
     # Determine operation mode
     if args.yaml:
         print(f"Mode: Single file - {args.yaml}")
-        success = inject_synonyms_into_yaml(args.yaml, synonyms_dict, args.output)
+        with span("inject", path=args.yaml):
+            success = inject_synonyms_into_yaml(args.yaml, synonyms_dict, args.output, args.fuzzy_threshold)
     else:
         print(f"Mode: Modules directory - {args.modules_dir}")
-        success = inject_synonyms_into_modules(args.modules_dir, synonyms_dict)
+        with span("inject", path=args.modules_dir):
+            success = inject_synonyms_into_modules(args.modules_dir, synonyms_dict, args.fuzzy_threshold, args.jobs)
         
     return 0 if success else 1
 
@@ -2,10 +2,16 @@
 
 This module creates Synapse entity views based on JSON Schema URIs.
 Unlike the schematic version, this allows schema URIs without semantic versions.
+
+When the per-template attribute artifact (dist/NF.attributes.jsonl) is given,
+column types come from its precomputed `columnType` instead of being
+re-derived from the fetched JSON Schema.
 """
 
+from pathlib import Path
 from typing import Any, Optional
 import os
+import sys
 import requests
 from synapseclient import Synapse
 from synapseclient.models import Column, ColumnType, ViewTypeMask, EntityView
@@ -31,6 +37,7 @@ def create_entity_view_from_schema_uri(
     scope_ids: list[str],
     entity_view_name: str = "JSON Schema view",
     bind_schema: bool = True,
+    attributes_path: Optional[Path] = None,
 ) -> str:
     """
     Creates a Synapse entity view based on a JSON Schema URI.
@@ -46,6 +53,8 @@ def create_entity_view_from_schema_uri(
         scope_ids: List of entity IDs to include in the view scope
         entity_view_name: The name the created entity view will have
         bind_schema: Whether to bind the schema to entities in scope_ids (default: True)
+        attributes_path: Optional per-template attribute artifact to take column
+            types from (falls back to the JSON Schema if the template is not in it)
 
     Returns:
         The Synapse id of the created entity view
@@ -93,7 +102,11 @@ def create_entity_view_from_schema_uri(
             js_service.bind_json_schema(full_schema_uri, entity_id)
 
     # Get the schema body and create columns
-    columns = _create_columns_from_json_schema(json_schema)
+    template = _find_template(attributes_path, schema_name) if attributes_path else None
+    if template is not None:
+        columns = _create_columns_from_attributes(template)
+    else:
+        columns = _create_columns_from_json_schema(json_schema)
 
     # Add only essential columns: id and name
     # Note: EntityView automatically adds these, but we specify them explicitly
@@ -174,6 +187,58 @@ def _create_columns_from_json_schema(json_schema: dict[str, Any]) -> list[Column
     return columns
 
 
+def _find_template(attributes_path: Path, schema_name: str) -> Optional[dict[str, Any]]:
+    """Looks up a template in the attribute artifact by (case-insensitive) schema name
+
+    Arguments:
+        attributes_path: Path to the per-template attribute artifact
+        schema_name: The schema name part of the URI (e.g. "BehavioralAssay")
+
+    Returns:
+        The template record, or None if the artifact does not contain it
+    """
+    sys.path.insert(0, str(Path(__file__).parent))
+    from template_attributes import load_attributes
+
+    templates = {name.lower(): record for name, record in load_attributes(attributes_path).items()}
+    key = schema_name.lower()
+    return templates.get(key) or templates.get(f"{key}template")
+
+
+def _create_columns_from_attributes(template: dict[str, Any]) -> list[Column]:
+    """Creates a list of Synapse Columns from a template record of the attribute artifact
+
+    Uses the same file view limits as _create_columns_from_json_schema.
+
+    Arguments:
+        template: A template record from dist/NF.attributes.jsonl
+
+    Returns:
+        A list of Synapse columns, one per template attribute
+    """
+    columns = []
+    for attribute in template["attributes"]:
+        column_type = ColumnType[attribute["columnType"]]
+        maximum_size = None
+        maximum_list_length = None
+        if column_type == ColumnType.STRING:
+            maximum_size = 80
+        if column_type in LIST_TYPE_DICT.values():
+            maximum_size = 80
+            maximum_list_length = 20
+        columns.append(
+            Column(
+                name=attribute["name"],
+                column_type=column_type,
+                maximum_size=maximum_size,
+                maximum_list_length=maximum_list_length,
+                enum_values=None,
+                default_value=None,
+            )
+        )
+    return columns
+
+
 def _get_column_type_from_js_property(js_property: dict[str, Any]) -> ColumnType:
     """
     Gets the Synapse column type from a JSON Schema property.
@@ -268,10 +333,9 @@ def _get_list_column_type_from_js_property(js_property: dict[str, Any]) -> Colum
 
 if __name__ == "__main__":
     # Example usage
-    import sys
-
     if len(sys.argv) < 4:
         print("Usage: python json_schema_entity_view.py <schema_uri> <parent_id> <scope_id> [view_name]")
+        print("Set NF_ATTRIBUTES to dist/NF.attributes.jsonl to take column types from the attribute artifact.")
         print("Example: python json_schema_entity_view.py nf.nfosi-BehavioralAssay syn28499308 syn28499308 'Behavioral Assay View'")
         sys.exit(1)
 
@@ -294,6 +358,7 @@ if __name__ == "__main__":
         parent_id=parent_id,
         scope_ids=[scope_id],
         entity_view_name=view_name,
+        attributes_path=Path(os.environ["NF_ATTRIBUTES"]) if os.environ.get("NF_ATTRIBUTES") else None,
     )
 
     print(f"✅ Created entity view: {view_id}")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+One entry point for the dictionary tooling: nfdict <command> [args].
+
+Each command runs an existing script's main() with the remaining arguments,
+so `nfdict build --only yaml` is `python utils/build.py --only yaml`. The
+script is imported only when its command runs, so synapseclient, rdflib,
+requests and tqdm are loaded only by the commands that use them, and
+`nfdict --help` and the local commands (build, validate, limits) start
+without them.
+
+Usage:
+    python utils/nfdict.py --help
+    python utils/nfdict.py validate RNASeqTemplate manifest.json
+    python utils/nfdict.py build --only json-schemas validators
+    python utils/nfdict.py register --skip-unchanged --include RNASeqTemplate.json
+"""
+
+import argparse
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+UTILS_DIR = Path(__file__).parent
+
+# command -> (script in utils/, leading arguments, help)
+COMMANDS = {
+    "build": ("build.py", (), "Build dist artifacts, JSON Schemas and validators from one loaded model"),
+    "gen-schema": ("gen-json-schema-class.py", (), "Generate JSON Schemas per class and validate them with Synapse"),
+    "validate": ("schema_validators.py", ("validate",), "Validate JSON instances with the generated validators"),
+    "diff": ("compare.py", (), "Compare two Turtle RDF files"),
+    "limits": ("check_schema_limits.py", (), "Check templates against Synapse schema size limits"),
+    "review": ("review_annotations.py", (), "Review Synapse annotations and suggest enum additions"),
+    "sync": ("sync_model_systems.py", (), "Sync model systems from the NF Research Tools database"),
+    "synonyms": ("extract_synonyms.py", (), "Extract synonyms for ontology-mapped terms"),
+    "register": ("register-schemas.py", (), "Register JSON Schemas with Synapse"),
+}
+
+
+def load_command(name: str):
+    """Import the script behind a command (under its own module name, so workers can unpickle from it)."""
+    script = COMMANDS[name][0]
+    module_name = Path(script).stem.replace("-", "_")
+    if str(UTILS_DIR) not in sys.path:
+        sys.path.insert(0, str(UTILS_DIR))
+    if module_name in sys.modules or "-" not in script:
+        return importlib.import_module(module_name)
+    spec = importlib.util.spec_from_file_location(module_name, UTILS_DIR / script)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def main(argv: list[str] | None = None) -> int:
+    commands = "\n".join(f"  {name:<12} {help_text}" for name, (_, _, help_text) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog="nfdict",
+        description="NF metadata dictionary tooling",
+        epilog=f"commands:\n{commands}\n\nRun `nfdict <command> --help` for a command's options.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("command", choices=COMMANDS, metavar="command", help="One of the commands below")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed on to the command")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    module = load_command(args.command)
+    leading = COMMANDS[args.command][1]
+    saved_argv = sys.argv
+    # A script whose own subcommand is the leading argument names itself after it
+    sys.argv = ["nfdict" if leading else f"nfdict {args.command}", *leading, *args.args]
+    try:
+        return module.main() or 0
+    finally:
+        sys.argv = saved_argv
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Local, indexed store of ontology terms ingested from OBO or OWL dumps.
+
+Most `meaning` IRIs in the dictionary come from a handful of ontologies
+(NCIT, OBI, EFO, UBERON, EDAM, ...). Ingesting their dumps once lets
+extract_synonyms.py serve every lookup locally, without per-term HTTP calls,
+which also makes synonym extraction possible on air-gapped runners.
+
+The store is a SQLite file mapping term IRI -> label, obsolete flag,
+synonyms (with their OBO scope) and parent IRIs.
+
+Usage:
+    # Ingest dumps (OBO is parsed natively; OWL/RDF needs rdflib)
+    python utils/ontology_store.py ingest --store ontologies.sqlite ncit.obo uberon.obo edam.owl
+
+    # Look up a term
+    python utils/ontology_store.py lookup --store ontologies.sqlite NCIT:C16553
+
+    # Use it for synonym extraction
+    python utils/extract_synonyms.py --ontology-store ontologies.sqlite --offline
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+DEFAULT_STORE_PATH = "ontologies.sqlite"
+DEFAULT_SCOPES = ("EXACT",)
+OBO_PURL = "http://purl.obolibrary.org/obo/"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    iri      TEXT PRIMARY KEY,
+    ontology TEXT,
+    label    TEXT,
+    obsolete INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS synonyms (
+    iri     TEXT NOT NULL,
+    synonym TEXT NOT NULL,
+    scope   TEXT NOT NULL,
+    UNIQUE (iri, synonym, scope)
+);
+CREATE INDEX IF NOT EXISTS synonyms_iri ON synonyms (iri);
+CREATE TABLE IF NOT EXISTS parents (
+    iri    TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    UNIQUE (iri, parent)
+);
+CREATE INDEX IF NOT EXISTS parents_iri ON parents (iri);
+CREATE TABLE IF NOT EXISTS sources (
+    path        TEXT PRIMARY KEY,
+    ontology    TEXT,
+    n_terms     INTEGER NOT NULL,
+    ingested_at REAL NOT NULL
+);
+"""
+
+# OBO synonym line: synonym: "text" SCOPE [optional TYPE] [xrefs]
+_OBO_SYNONYM = re.compile(r'^"((?:[^"\\]|\\.)*)"\s+(EXACT|RELATED|BROAD|NARROW)\b')
+
+# oboInOwl synonym predicates and their OBO scope
+_OWL_SYNONYM_SCOPES = {
+    "hasExactSynonym": "EXACT",
+    "hasRelatedSynonym": "RELATED",
+    "hasBroadSynonym": "BROAD",
+    "hasNarrowSynonym": "NARROW",
+}
+
+
+def load_prefixes(header_file: str = "header.yaml") -> dict[str, str]:
+    """Load CURIE prefixes from the schema header (used to expand OBO ids)."""
+    try:
+        with open(header_file, "r") as f:
+            return (yaml.safe_load(f) or {}).get("prefixes", {})
+    except FileNotFoundError:
+        return {}
+
+
+def curie_to_iri(curie: str, prefixes: dict[str, str]) -> str:
+    """Expand an OBO-style id (e.g. NCIT:C16553) to a full IRI."""
+    if curie.startswith("http://") or curie.startswith("https://"):
+        return curie
+    prefix, sep, local = curie.partition(":")
+    if not sep:
+        return curie
+    if prefix in prefixes:
+        return prefixes[prefix] + local
+    return f"{OBO_PURL}{prefix}_{local}"
+
+
+def iter_obo_terms(path: Path, prefixes: dict[str, str]):
+    """Stream [Term] stanzas from an OBO file.
+
+    Yields:
+        Dicts with iri, label, obsolete, synonyms [(text, scope)], parents [iri]
+    """
+    term = None
+    in_term = False
+
+    def finish(t):
+        return t if t and t.get("iri") else None
+
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.rstrip("\n")
+            if line.startswith("["):
+                done = finish(term) if in_term else None
+                if done:
+                    yield done
+                in_term = line.strip() == "[Term]"
+                term = {"iri": None, "label": None, "obsolete": False, "synonyms": [], "parents": []} if in_term else None
+                continue
+            if not in_term or not line or line.startswith("!"):
+                continue
+
+            tag, _, value = line.partition(": ")
+            value = value.strip()
+            if tag == "id":
+                term["iri"] = curie_to_iri(value, prefixes)
+            elif tag == "name":
+                term["label"] = value
+            elif tag == "is_obsolete":
+                term["obsolete"] = value == "true"
+            elif tag == "synonym":
+                match = _OBO_SYNONYM.match(value)
+                if match:
+                    text = match.group(1).replace('\\"', '"').replace("\\\\", "\\")
+                    term["synonyms"].append((text, match.group(2)))
+            elif tag == "is_a":
+                parent = value.split("!", 1)[0].strip().split()[0]
+                term["parents"].append(curie_to_iri(parent, prefixes))
+
+    done = finish(term) if in_term else None
+    if done:
+        yield done
+
+
+def iter_owl_terms(path: Path, rdf_format: str | None = None):
+    """Extract terms from an OWL/RDF dump with rdflib.
+
+    Yields:
+        Dicts with iri, label, obsolete, synonyms [(text, scope)], parents [iri]
+    """
+    try:
+        from rdflib import Graph, Literal, Namespace, URIRef
+        from rdflib.namespace import OWL, RDF, RDFS
+    except ImportError:
+        raise ImportError("rdflib is required to ingest OWL/RDF dumps: pip install rdflib")
+
+    OIO = Namespace("http://www.geneontology.org/formats/oboInOwl#")
+    g = Graph()
+    g.parse(str(path), format=rdf_format)
+
+    for subject in set(g.subjects(RDF.type, OWL.Class)):
+        if not isinstance(subject, URIRef):
+            continue
+        synonyms = []
+        for name, scope in _OWL_SYNONYM_SCOPES.items():
+            synonyms.extend((str(o), scope) for o in g.objects(subject, OIO[name]) if isinstance(o, Literal))
+        label = g.value(subject, RDFS.label)
+        deprecated = g.value(subject, OWL.deprecated)
+        yield {
+            "iri": str(subject),
+            "label": str(label) if label is not None else None,
+            "obsolete": deprecated is not None and str(deprecated).lower() == "true",
+            "synonyms": synonyms,
+            "parents": [str(o) for o in g.objects(subject, RDFS.subClassOf) if isinstance(o, URIRef)],
+        }
+
+
+class OntologyStore:
+    """SQLite-backed IRI -> (label, synonyms, parents) index built from dumps."""
+
+    def __init__(self, path: str | Path = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+
+    def ingest(self, path: str | Path, ontology: str | None = None, prefixes: dict[str, str] | None = None) -> int:
+        """Ingest an .obo or OWL/RDF dump, replacing terms it redefines.
+
+        Args:
+            path: Dump file (.obo, .owl, .rdf, .xml, .ttl, .nt)
+            ontology: Ontology id recorded with each term (default: file stem)
+            prefixes: CURIE prefixes used to expand OBO ids
+
+        Returns:
+            Number of terms ingested
+        """
+        path = Path(path)
+        ontology = ontology or path.stem.lower()
+        if path.suffix == ".obo":
+            terms = iter_obo_terms(path, prefixes if prefixes is not None else load_prefixes())
+        else:
+            rdf_format = {".ttl": "turtle", ".nt": "nt"}.get(path.suffix, "xml")
+            terms = iter_owl_terms(path, rdf_format)
+
+        count = 0
+        cur = self._conn.cursor()
+        for term in terms:
+            iri = term["iri"]
+            cur.execute(
+                "INSERT OR REPLACE INTO terms (iri, ontology, label, obsolete) VALUES (?, ?, ?, ?)",
+                (iri, ontology, term["label"], int(term["obsolete"])),
+            )
+            cur.execute("DELETE FROM synonyms WHERE iri = ?", (iri,))
+            cur.execute("DELETE FROM parents WHERE iri = ?", (iri,))
+            cur.executemany(
+                "INSERT OR IGNORE INTO synonyms (iri, synonym, scope) VALUES (?, ?, ?)",
+                [(iri, text, scope) for text, scope in term["synonyms"]],
+            )
+            cur.executemany(
+                "INSERT OR IGNORE INTO parents (iri, parent) VALUES (?, ?)",
+                [(iri, parent) for parent in term["parents"]],
+            )
+            count += 1
+        cur.execute(
+            "INSERT OR REPLACE INTO sources (path, ontology, n_terms, ingested_at) VALUES (?, ?, ?, ?)",
+            (str(path), ontology, count, time.time()),
+        )
+        self._conn.commit()
+        return count
+
+    def lookup(self, iri: str, scopes=DEFAULT_SCOPES) -> dict | None:
+        """Return {label, synonyms, parents, obsolete, ontology} for iri, or None."""
+        row = self._conn.execute(
+            "SELECT ontology, label, obsolete FROM terms WHERE iri = ?", (iri,)
+        ).fetchone()
+        if row is None:
+            return None
+        ontology, label, obsolete = row
+        placeholders = ",".join("?" * len(scopes))
+        synonyms = [
+            r[0] for r in self._conn.execute(
+                f"SELECT synonym FROM synonyms WHERE iri = ? AND scope IN ({placeholders}) ORDER BY rowid",
+                (iri, *scopes),
+            )
+        ]
+        parents = [r[0] for r in self._conn.execute("SELECT parent FROM parents WHERE iri = ?", (iri,))]
+        return {
+            "ontology": ontology,
+            "label": label,
+            "synonyms": synonyms,
+            "parents": parents,
+            "obsolete": bool(obsolete),
+        }
+
+    def sources(self) -> list[tuple[str, str, int, float]]:
+        """List ingested dumps as (path, ontology, n_terms, ingested_at)."""
+        return list(self._conn.execute("SELECT path, ontology, n_terms, ingested_at FROM sources ORDER BY path"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build and query a local ontology term store from OBO/OWL dumps")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="Ingest one or more OBO/OWL dumps")
+    ingest.add_argument("dumps", nargs="+", help="Dump files (.obo, .owl, .rdf, .ttl)")
+    ingest.add_argument("--store", default=DEFAULT_STORE_PATH, help=f"Store path (default: {DEFAULT_STORE_PATH})")
+    ingest.add_argument("--header", default="header.yaml", help="Schema header with CURIE prefixes (default: header.yaml)")
+
+    lookup = sub.add_parser("lookup", help="Look up terms by IRI or CURIE")
+    lookup.add_argument("iris", nargs="+", help="Term IRIs or CURIEs")
+    lookup.add_argument("--store", default=DEFAULT_STORE_PATH, help=f"Store path (default: {DEFAULT_STORE_PATH})")
+    lookup.add_argument("--header", default="header.yaml", help="Schema header with CURIE prefixes (default: header.yaml)")
+    lookup.add_argument("--all-scopes", action="store_true", help="Include RELATED/BROAD/NARROW synonyms")
+
+    args = parser.parse_args()
+    prefixes = load_prefixes(args.header)
+
+    with OntologyStore(args.store) as store:
+        if args.command == "ingest":
+            for dump in args.dumps:
+                start = time.perf_counter()
+                count = store.ingest(dump, prefixes=prefixes)
+                print(f"✅ {dump}: {count} terms ({time.perf_counter() - start:.1f}s)")
+            print(f"Store {args.store} now holds {len(store)} terms")
+        else:
+            scopes = tuple(_OWL_SYNONYM_SCOPES.values()) if args.all_scopes else DEFAULT_SCOPES
+            for iri in args.iris:
+                term = store.lookup(curie_to_iri(iri, prefixes), scopes=scopes)
+                if term is None:
+                    print(f"{iri}: not found")
+                else:
+                    print(f"{iri}: {term['label']} [{term['ontology']}]{' (obsolete)' if term['obsolete'] else ''}")
+                    for synonym in term["synonyms"]:
+                        print(f"  - {synonym}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
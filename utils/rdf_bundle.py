@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Canonical, sorted and gzip-compressed N-Triples bundle of the model for the
+in-browser SPARQL explorer.
+
+Parsing Turtle in the browser is the slowest part of opening the SPARQL tab.
+N-Triples needs no prefix or abbreviation handling, so Oxigraph ingests it
+faster, and a sorted file with deterministic blank node labels is byte-stable
+between builds and compresses well.
+
+With --split, permissible values go to their own file, loaded into the named
+graph ENUMS_GRAPH only when a query asks for vocabulary values. The default
+graph (classes, slots, enums without their values) is what the explorer loads
+first.
+
+Outputs (in --output-dir):
+    NF.nt.gz                          everything (default)
+    NF.model.nt.gz, NF.enums.nt.gz    with --split
+    NF.rdf.json                       manifest: files, target graph, triple counts
+
+Usage:
+    python utils/rdf_bundle.py --output-dir dist
+    python utils/rdf_bundle.py --split --output-dir dist
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from stage_profiling import add_profile_argument, span, start_profiling
+
+DIST_TTL = Path(__file__).parent.parent / "dist" / "NF.ttl"
+LINKML = "https://w3id.org/linkml/"
+ENUMS_GRAPH = "https://w3id.org/synapse/nfosi/graph/enums"
+MANIFEST_NAME = "NF.rdf.json"
+
+
+def _load_graph(ttl_path: Path):
+    try:
+        from rdflib import Graph
+    except ImportError:
+        raise ImportError("rdflib is required to build the RDF bundle: pip install rdflib")
+    graph = Graph()
+    graph.parse(str(ttl_path), format="turtle")
+    return graph
+
+
+def label_blank_nodes(graph) -> dict:
+    """Deterministic labels for every blank node in graph.
+
+    A blank node is labeled by a hash of how it is reached (the IRIs or
+    already-assigned labels of the nodes pointing at it, and their
+    predicates) and of its own triples, working down from the nodes that
+    only IRIs point at. Nodes that agree on both are interchangeable, so
+    numbering them in sorted order is still canonical.
+
+    Returns:
+        {BNode: label}
+    """
+    from rdflib import BNode
+
+    referrers = defaultdict(list)
+    outgoing = defaultdict(list)
+    for s, p, o in graph:
+        if isinstance(s, BNode):
+            outgoing[s].append((p, o))
+        if isinstance(o, BNode):
+            referrers[o].append((s, p))
+
+    contents = {}
+
+    def content(node, trail=()):
+        if node not in contents:
+            parts = []
+            for p, o in outgoing[node]:
+                if isinstance(o, BNode):
+                    value = "[]" if o in trail else f"[{content(o, trail + (node,))}]"
+                else:
+                    value = o.n3()
+                parts.append(f"{p.n3()} {value}")
+            contents[node] = ";".join(sorted(parts))
+        return contents[node]
+
+    labels = {}
+    seen = defaultdict(int)
+    pending = set(outgoing) | set(referrers)
+    while pending:
+        ready = [
+            node for node in pending
+            if all(not isinstance(s, BNode) or s in labels for s, _ in referrers[node])
+        ] or list(pending)  # only reachable through a cycle of blank nodes
+        keys = {}
+        for node in ready:
+            context = sorted(
+                f"{labels.get(s, '_') if isinstance(s, BNode) else s.n3()} {p.n3()}" for s, p in referrers[node]
+            )
+            keys[node] = hashlib.sha1(f"{';'.join(context)}|{content(node)}".encode()).hexdigest()[:16]
+        for node in sorted(ready, key=keys.get):
+            key = keys[node]
+            labels[node] = f"b{key}" if seen[key] == 0 else f"b{key}x{seen[key]}"
+            seen[key] += 1
+        pending.difference_update(ready)
+    return labels
+
+
+def split_enum_values(graph) -> tuple[set, set]:
+    """Partition triples into (model, enum values).
+
+    Enum values are the linkml:permissible_values links, the triples of each
+    permissible value, and any blank nodes only reachable from them.
+    """
+    from rdflib import BNode, URIRef
+
+    permissible_values = URIRef(LINKML + "permissible_values")
+    values = set(graph.objects(None, permissible_values))
+    frontier = list(values)
+    while frontier:
+        node = frontier.pop()
+        for o in graph.objects(node, None):
+            if isinstance(o, BNode) and o not in values:
+                values.add(o)
+                frontier.append(o)
+
+    model, enums = set(), set()
+    for triple in graph:
+        s, p, _ = triple
+        (enums if p == permissible_values or s in values else model).add(triple)
+    return model, enums
+
+
+def ntriples_lines(triples, labels: dict) -> list[str]:
+    """Sorted N-Triples lines with blank nodes relabeled."""
+    from rdflib import BNode, Graph
+
+    relabeled = Graph()
+    for s, p, o in triples:
+        relabeled.add((
+            BNode(labels[s]) if isinstance(s, BNode) else s,
+            p,
+            BNode(labels[o]) if isinstance(o, BNode) else o,
+        ))
+    text = relabeled.serialize(format="nt", encoding="utf-8").decode("utf-8")
+    return sorted(line for line in text.splitlines() if line.strip())
+
+
+def write_gzip(path: Path, lines: list[str]) -> str:
+    """Write lines gzip-compressed with a fixed mtime (byte-stable); returns sha256."""
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    with open(path, "wb") as raw, gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0, compresslevel=9) as f:
+        f.write(data)
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def build_bundle(ttl_path: Path = DIST_TTL, output_dir: Path = DIST_TTL.parent, split: bool = False) -> dict:
+    """Write the bundle and its manifest.
+
+    Returns:
+        The manifest dict (also written to output_dir/NF.rdf.json)
+    """
+    with span("turtle parse", "io", path=Path(ttl_path).name):
+        graph = _load_graph(ttl_path)
+    with span("label blank nodes"):
+        labels = label_blank_nodes(graph)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if split:
+        model, enums = split_enum_values(graph)
+        parts = [("NF.model.nt.gz", None, model), ("NF.enums.nt.gz", ENUMS_GRAPH, enums)]
+    else:
+        parts = [("NF.nt.gz", None, set(graph))]
+
+    files = []
+    for name, graph_name, triples in parts:
+        with span("serialize n-triples", file=name):
+            lines = ntriples_lines(triples, labels)
+        with span("gzip dump", "io", file=name):
+            digest = write_gzip(output_dir / name, lines)
+        files.append({"file": name, "graph": graph_name, "triples": len(lines), "sha256": digest})
+
+    manifest = {"format": "application/n-triples", "compression": "gzip", "source": Path(ttl_path).name, "files": files}
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build a sorted, gzip-compressed N-Triples bundle of the model")
+    parser.add_argument("--input", type=Path, default=DIST_TTL, help="Turtle model (default: dist/NF.ttl)")
+    parser.add_argument("--output-dir", type=Path, default=DIST_TTL.parent, help="Output directory (default: dist)")
+    parser.add_argument("--split", action="store_true", help="Put permissible values in a separate named-graph file")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profiling("rdf_bundle", args.profile)
+
+    if not args.input.exists():
+        print(f"❌ {args.input} not found. Run `make NF.ttl` first.", file=sys.stderr)
+        return 1
+
+    manifest = build_bundle(args.input, args.output_dir, split=args.split)
+    for entry in manifest["files"]:
+        size = (args.output_dir / entry["file"]).stat().st_size
+        graph = entry["graph"] or "default graph"
+        print(f"✅ {entry['file']}: {entry['triples']:,} triples -> {graph} ({size / 1024:.0f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,35 +1,146 @@
 #!/usr/bin/env python3
 
+import hashlib
 import json
 import time
 import os
 import argparse
+import sys
 from pathlib import Path
-import synapseclient
 
-def register_schema(path: Path):
+sys.path.insert(0, str(Path(__file__).parent))
+from stage_profiling import add_profile_argument, span, start_profiling
+
+DEFAULT_HASH_CACHE = Path(__file__).parent.parent / ".cache" / "nf-registration.json"
+
+
+def _canonical(value, ordered=False):
+    """value with object keys sorted (except property maps) and integral floats as ints."""
+    if isinstance(value, dict):
+        keys = value if ordered else sorted(value)
+        # Property order is what Synapse shows, so it counts as a change
+        return {key: _canonical(value[key], ordered=(key == "properties" and not ordered)) for key in keys}
+    if isinstance(value, list):
+        return [_canonical(item) for item in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def canonical_json(schema: dict) -> str:
+    """Serialization of schema that only changes when its meaning does.
+
+    Keys are sorted wherever order doesn't matter (everywhere except the
+    property maps), numbers are written the same way whether they were
+    parsed as 2 or 2.0, and `$id` is left out because it carries the
+    release version.
+    """
+    schema = {key: value for key, value in schema.items() if key != "$id"}
+    return json.dumps(_canonical(schema), separators=(",", ":"), ensure_ascii=False)
+
+
+def content_hash(schema: dict) -> str:
+    return hashlib.sha256(canonical_json(schema).encode()).hexdigest()
+
+
+def schema_name(schema: dict):
+    """(organization, schema name) from $id, without any version suffix; None if it can't be parsed."""
+    base_id = schema.get("$id", "").rsplit("/", 1)[-1]
+    parts = base_id.rsplit("-", 1)
+    if len(parts) == 2 and parts[1].replace(".", "").isdigit():
+        base_id = parts[0]
+    if "-" not in base_id:
+        return None
+    org, name = base_id.split("-", 1)
+    return org, name
+
+
+def _version_key(info: dict) -> tuple:
+    try:
+        semantic = tuple(int(x) for x in info.get("semanticVersion", "").split("."))
+    except ValueError:
+        semantic = ()
+    return semantic, info.get("createdOn", "")
+
+
+def latest_registered_hash(syn, org: str, name: str, cache: dict):
+    """Content hash and version of the latest registered version of a schema.
+
+    Lists versions with /schema/version/list; the registered body is only
+    fetched (and hashed) when the latest versionId isn't in cache yet.
+
+    Returns:
+        (content hash, semantic version), or None if nothing is registered
+    """
+    from synapseclient.core.exceptions import SynapseHTTPError
+
+    versions, next_page = [], None
+    while True:
+        request = {"organizationName": org, "schemaName": name}
+        if next_page:
+            request["nextPageToken"] = next_page
+        try:
+            with span("POST /schema/version/list", "http", schema=name):
+                response = syn.restPOST("/schema/version/list", json.dumps(request))
+        except SynapseHTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None  # Schema not registered yet
+            raise
+        versions.extend(response.get("page", []))
+        next_page = response.get("nextPageToken")
+        if not next_page:
+            break
+    if not versions:
+        return None
+
+    latest = max(versions, key=_version_key)
+    full_name = f"{org}-{name}"
+    cached = cache.get(full_name)
+    if not cached or cached.get("versionId") != latest.get("versionId"):
+        schema_id = latest.get("$id") or "-".join(filter(None, [full_name, latest.get("semanticVersion")]))
+        with span("GET /schema/type/registered", "http", schema=name):
+            body = syn.restGET(f"/schema/type/registered/{schema_id}")
+        cached = cache[full_name] = {
+            "versionId": latest.get("versionId"),
+            "semanticVersion": latest.get("semanticVersion"),
+            "contentHash": content_hash(body),
+        }
+    return cached["contentHash"], cached.get("semanticVersion")
+
+
+def load_hash_cache(path: Path) -> dict:
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_hash_cache(cache: dict, path: Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n")
+
+
+def register_schema(path: Path, syn: "synapseclient.Synapse"):
     """Register schema with Synapse API (actual registration)."""
     print(f"\n🚀 Registering: {path.name}")
     try:
         data = json.loads(path.read_text())
         body = json.dumps({"schema": data, "dryRun": False})  # Changed to False for actual registration
         
-        # Initialize Synapse client with auth token
-        syn = synapseclient.Synapse()
-        auth_token = os.environ.get('SYNAPSE_AUTH_TOKEN')
-        if not auth_token:
-            raise ValueError("SYNAPSE_AUTH_TOKEN environment variable is required for registration. Set it with: export SYNAPSE_AUTH_TOKEN=<your_token>")
-        syn.login(authToken=auth_token)
-        
         # Start registration job
-        resp = syn.restPOST("/schema/type/create/async/start", body)
+        with span("POST /schema/type/create/async/start", "http", schema=path.name):
+            resp = syn.restPOST("/schema/type/create/async/start", body)
         token = resp["token"]
         
         # Poll for completion
-        status = syn.restGET(f"/asynchronous/job/{token}")
-        while status["jobState"] == "PROCESSING":
-            time.sleep(1)
+        with span("GET /asynchronous/job", "http", schema=path.name):
             status = syn.restGET(f"/asynchronous/job/{token}")
+        while status["jobState"] == "PROCESSING":
+            with span("poll wait", "wait", schema=path.name):
+                time.sleep(1)
+            with span("GET /asynchronous/job", "http", schema=path.name):
+                status = syn.restGET(f"/asynchronous/job/{token}")
         
         # Check result
         if status["jobState"] == "FAILED":
@@ -59,8 +170,17 @@ def main():
                        nargs="*",
                        default=[],
                        help="Only register specific schema files (e.g., --include DataLandscape.json). Overrides --exclude.")
+    parser.add_argument("--skip-unchanged",
+                       action="store_true",
+                       help="Skip schemas whose content (ignoring the version in $id) matches their latest registered version")
+    parser.add_argument("--hash-cache",
+                       type=Path,
+                       default=DEFAULT_HASH_CACHE,
+                       help="Cache of registered-version content hashes for --skip-unchanged (default: .cache/nf-registration.json)")
+    add_profile_argument(parser)
 
     args = parser.parse_args()
+    start_profiling("register-schemas", args.profile)
 
     # Set up paths
     SCHEMA_DIR = Path(args.schema_dir)
@@ -92,20 +212,47 @@ def main():
     else:
         filter_info = ""
     print(f"🚀 Registering {schema_count} schema(s) with Synapse{filter_info}...")
-    
-    registration_results = []
-    detailed_results = []
-    
+
+    # Initialize Synapse client once for all registrations
+    import synapseclient
+
+    syn = synapseclient.Synapse()
+    auth_token = os.environ.get('SYNAPSE_AUTH_TOKEN')
+    if not auth_token:
+        print("❌ SYNAPSE_AUTH_TOKEN environment variable is required for registration. Set it with: export SYNAPSE_AUTH_TOKEN=<your_token>")
+        exit(1)
+    with span("synapse login", "http"):
+        syn.login(authToken=auth_token)
+
+    hash_cache = load_hash_cache(args.hash_cache) if args.skip_unchanged else {}
+    detailed_results = []  # (file name, "registered" | "failed" | "skipped", detail)
+
     for json_file in json_files:
-        result = register_schema(json_file)
-        registration_results.append(result)
-        detailed_results.append((json_file.name, result))
-    
+        if args.skip_unchanged:
+            schema = json.loads(json_file.read_text())
+            parsed = schema_name(schema)
+            try:
+                latest = latest_registered_hash(syn, *parsed, hash_cache) if parsed else None
+            except Exception as e:
+                print(f"⚠️  Could not check the registered version of {json_file.name}, registering it: {e}")
+                latest = None
+            if latest and latest[0] == content_hash(schema):
+                print(f"⏭️  {json_file.name} unchanged since {latest[1]}, skipping")
+                detailed_results.append((json_file.name, "skipped", latest[1]))
+                continue
+        with span("register schema", schema=json_file.name):
+            result = register_schema(json_file, syn)
+        detailed_results.append((json_file.name, "registered" if result else "failed", None))
+
+    if args.skip_unchanged:
+        save_hash_cache(hash_cache, args.hash_cache)
+
     # Summary
-    passed = sum(registration_results)
-    failed = len(registration_results) - passed
+    passed = sum(status == "registered" for _, status, _ in detailed_results)
+    failed = sum(status == "failed" for _, status, _ in detailed_results)
+    skipped = sum(status == "skipped" for _, status, _ in detailed_results)
     
-    print(f"\n🎉 Registration complete: {passed} registered successfully, {failed} failed")
+    print(f"\n🎉 Registration complete: {passed} registered successfully, {failed} failed, {skipped} skipped (unchanged)")
     
     # Log registration results to markdown file
     filter_lines = []
@@ -123,15 +270,19 @@ Generated: {time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())}
 - **Schemas processed:** {schema_count}
 - **Registration successful:** {passed}
 - **Registration failed:** {failed}
+- **Skipped (unchanged):** {skipped}
 {filter_text}
 
 ## Details
 """
     
     # Add details for each schema
-    for schema_name, success in detailed_results:
-        status = "✅ REGISTERED" if success else "❌ FAILED"
-        log_content += f"- `{schema_name}`: {status}\n"
+    for file_name, status, detail in detailed_results:
+        if status == "skipped":
+            label = f"⏭️ SKIPPED (unchanged since {detail})"
+        else:
+            label = "✅ REGISTERED" if status == "registered" else "❌ FAILED"
+        log_content += f"- `{file_name}`: {label}\n"
     
     # Write log file
     log_file = Path(args.log_file)
@@ -6,9 +6,11 @@ This script:
 1. Queries Synapse materialized view syn52702673 for file annotations
 2. Loads the current schema enum values
 3. Identifies free-text values that don't match existing enum permissible values
-4. Generates suggestions for new enum values
-5. Suggests portal search filters based on annotation patterns
-6. Outputs suggestions in a format suitable for PR creation
+4. Proposes mappings for values that are only variants (case, spacing,
+   punctuation, one typo) of an existing value or alias
+5. Generates suggestions for new enum values for the rest
+6. Suggests portal search filters based on annotation patterns
+7. Outputs suggestions in a format suitable for PR creation
 
 Usage:
     python review_annotations.py [--output OUTPUT_FILE] [--dry-run] [--limit LIMIT]
@@ -21,16 +23,14 @@ import os
 import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Sequence, Set, Tuple
 
 import yaml
 
-try:
-    import synapseclient
-    from synapseclient import Synapse
-except ImportError:
-    print("Error: synapseclient not installed. Install with: pip install synapseclient")
-    sys.exit(1)
+sys.path.insert(0, str(Path(__file__).parent))
+from alias_resolver import AliasResolver, CandidateIndex
+from enum_lookup import LookupFile
+from enum_store import EnumStore
 
 # Configure logging
 logging.basicConfig(
@@ -65,61 +65,34 @@ MIN_FREQUENCY = 2
 # Minimum frequency for suggesting search filters
 MIN_FILTER_FREQUENCY = 5
 
+# Closest existing values attached to each suggestion
+TOP_K_CANDIDATES = 3
 
-def load_schema_enums() -> Dict[str, Dict[str, Set[str]]]:
+
+def load_schema_enums() -> EnumStore:
     """
     Load all enum permissible values from the schema.
 
+    Values, aliases and enum names are interned once in a shared string
+    table (see enum_store.py), which keeps the footprint small when many
+    workers hold the enums.
+
     Returns:
-        Dictionary mapping enum names to their permissible values and aliases
+        EnumStore mapping enum names to their 'values', 'aliases' and 'all' sets
     """
-    enums = {}
-
-    # Load from all module YAML files
-    for yaml_file in SCHEMA_DIR.rglob("*.yaml"):
-        try:
-            with open(yaml_file, 'r') as f:
-                data = yaml.safe_load(f)
-
-            if not data or 'enums' not in data:
-                continue
-
-            for enum_name, enum_data in data['enums'].items():
-                if 'permissible_values' not in enum_data:
-                    continue
-
-                values = set()
-                aliases = set()
-
-                for value, value_data in enum_data['permissible_values'].items():
-                    values.add(value)
-
-                    # Also collect aliases
-                    if value_data and isinstance(value_data, dict) and 'aliases' in value_data:
-                        if isinstance(value_data['aliases'], list):
-                            aliases.update(value_data['aliases'])
-                        elif isinstance(value_data['aliases'], str):
-                            aliases.add(value_data['aliases'])
-
-                enums[enum_name] = {
-                    'values': values,
-                    'aliases': aliases,
-                    'all': values | aliases
-                }
-
-        except Exception as e:
-            logger.warning(f"Error loading {yaml_file}: {e}")
-
+    enums = EnumStore.from_modules(
+        SCHEMA_DIR, on_error=lambda yaml_file, e: logger.warning(f"Error loading {yaml_file}: {e}")
+    )
     logger.info(f"Loaded {len(enums)} enums from schema")
     return enums
 
 
-def load_slot_to_enum_mapping() -> Dict[str, List[str]]:
+def load_slot_to_enum_mapping() -> Dict[str, Tuple[str, ...]]:
     """
     Load mapping of slot names to their enum types.
 
     Returns:
-        Dictionary mapping slot names to list of enum names
+        Dictionary mapping slot names to a tuple of (interned) enum names
     """
     slot_enum_map = defaultdict(list)
 
@@ -136,16 +109,16 @@ def load_slot_to_enum_mapping() -> Dict[str, List[str]]:
 
                 # Check for direct range
                 if 'range' in slot_data and slot_data['range'].endswith('Enum'):
-                    slot_enum_map[slot_name].append(slot_data['range'])
+                    slot_enum_map[slot_name].append(sys.intern(slot_data['range']))
 
                 # Check for any_of ranges
                 if 'any_of' in slot_data and isinstance(slot_data['any_of'], list):
                     for constraint in slot_data['any_of']:
                         if 'range' in constraint and constraint['range'].endswith('Enum'):
-                            slot_enum_map[slot_name].append(constraint['range'])
+                            slot_enum_map[slot_name].append(sys.intern(constraint['range']))
 
     logger.info(f"Mapped {len(slot_enum_map)} slots to enum types")
-    return dict(slot_enum_map)
+    return {slot_name: tuple(enum_names) for slot_name, enum_names in slot_enum_map.items()}
 
 
 def detect_custom_value_fields() -> Set[str]:
@@ -210,7 +183,7 @@ def detect_custom_value_fields() -> Set[str]:
     return custom_value_fields
 
 
-def query_synapse_annotations(syn: Synapse, limit: int = None) -> List[Dict]:
+def query_synapse_annotations(syn: "synapseclient.Synapse", limit: int = None) -> List[Dict]:
     """
     Query Synapse materialized view for file annotations.
 
@@ -245,36 +218,43 @@ def query_synapse_annotations(syn: Synapse, limit: int = None) -> List[Dict]:
 
 def analyze_annotations(
     records: List[Dict],
-    enums: Dict[str, Dict[str, Set[str]]],
-    slot_enum_map: Dict[str, List[str]],
-    custom_value_fields: Set[str] = None
-) -> Tuple[Dict[str, Dict[str, int]], Dict[str, int]]:
+    enums: EnumStore | LookupFile,
+    slot_enum_map: Dict[str, Sequence[str]],
+    custom_value_fields: Set[str] = None,
+    resolver: AliasResolver = None
+) -> Tuple[Dict[str, Dict[str, int]], Dict[str, int], Dict[str, Dict[str, Dict]]]:
     """
     Analyze annotations to find free-text values not in schema enums.
 
     For any field that has enums defined, we suggest adding values that appear
     in the data but aren't in the enum - these become candidates for curation.
+    With a resolver, values that are only variants of an existing value or
+    alias are proposed as mappings instead of additions.
 
     Args:
         records: List of annotation records from Synapse
-        enums: Schema enum definitions
+        enums: Schema enums (EnumStore, or a LookupFile with --lookup)
         slot_enum_map: Mapping of slots to enum types
         custom_value_fields: Fields that allow both enum and custom string values (for logging)
+        resolver: Optional AliasResolver built from the merged model
 
     Returns:
-        Tuple of (suggestions_by_field, filter_suggestions)
+        Tuple of (suggestions_by_field, filter_suggestions, mappings_by_field)
         - suggestions_by_field: {field_name: {value: count}}
         - filter_suggestions: {field_name: count of unique values}
+        - mappings_by_field: {field_name: {value: {canonical, enum, match, count}}}
     """
     if custom_value_fields is None:
         custom_value_fields = set()
 
     suggestions = defaultdict(lambda: defaultdict(int))
+    mappings = defaultdict(dict)
+    resolutions = {}
     filter_candidates = defaultdict(set)
 
     if not records:
         logger.warning("No records to analyze")
-        return {}, {}
+        return {}, {}, {}
 
     # Get all column names from first record
     columns = list(records[0].keys())
@@ -305,13 +285,30 @@ def analyze_annotations(
                 value_in_enum = False
                 for enum_name in enum_names:
                     if enum_name in enums:
-                        if value_str in enums[enum_name]['all']:
+                        if enums.contains(enum_name, value_str):
                             value_in_enum = True
                             break
 
-                # If not in enum, it's a custom string value - suggest for curation
-                if not value_in_enum:
-                    suggestions[field][value_str] += 1
+                if value_in_enum:
+                    continue
+
+                # A variant of an existing value: propose a mapping, not an addition
+                key = (field, value_str)
+                if key not in resolutions:
+                    resolutions[key] = resolver.resolve(value_str, enum_names) if resolver else None
+                resolution = resolutions[key]
+                if resolution:
+                    mapping = mappings[field].setdefault(value_str, {
+                        'canonical': resolution.canonical,
+                        'enum': resolution.enum,
+                        'match': resolution.match,
+                        'count': 0,
+                    })
+                    mapping['count'] += 1
+                    continue
+
+                # Otherwise it's a custom string value - suggest for curation
+                suggestions[field][value_str] += 1
 
     # Filter suggestions by minimum frequency
     filtered_suggestions = {}
@@ -327,10 +324,48 @@ def analyze_annotations(
         if unique_count >= MIN_FILTER_FREQUENCY:
             filter_suggestions[field] = unique_count
 
+    mappings = {field: values for field, values in mappings.items() if values}
+
     logger.info(f"Found {len(filtered_suggestions)} fields with suggested additions")
+    logger.info(f"Found {sum(len(v) for v in mappings.values())} values mappable to existing terms")
     logger.info(f"Found {len(filter_suggestions)} fields as potential filters")
 
-    return filtered_suggestions, filter_suggestions
+    return filtered_suggestions, filter_suggestions, mappings
+
+
+def rank_candidates(
+    suggestions: Dict[str, Dict[str, int]],
+    slot_enum_map: Dict[str, Sequence[str]],
+    index: CandidateIndex,
+    top_k: int = TOP_K_CANDIDATES
+) -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    Find the closest existing permissible values for each suggested value.
+
+    Args:
+        suggestions: Field suggestions with counts
+        slot_enum_map: Mapping of slots to enum types
+        index: CandidateIndex built from the merged model
+        top_k: Number of candidates per value
+
+    Returns:
+        {field_name: {value: [{canonical, enum, matched, score}]}}, values
+        without any candidate omitted
+    """
+    candidates = {}
+    for field, values in suggestions.items():
+        enum_names = slot_enum_map.get(field)
+        field_candidates = {}
+        for value in values:
+            found = index.search(value, enum_names, k=top_k)
+            if found:
+                field_candidates[value] = [
+                    {'canonical': c.canonical, 'enum': c.enum, 'matched': c.matched, 'score': c.score}
+                    for c in found
+                ]
+        if field_candidates:
+            candidates[field] = field_candidates
+    return candidates
 
 
 def find_enum_yaml_file(enum_name: str, schema_dir: Path) -> Path:
@@ -360,7 +395,7 @@ def find_enum_yaml_file(enum_name: str, schema_dir: Path) -> Path:
 
 def add_values_to_yaml(
     suggestions: Dict[str, Dict[str, int]],
-    slot_enum_map: Dict[str, List[str]],
+    slot_enum_map: Dict[str, Sequence[str]],
     schema_dir: Path,
     min_frequency: int = MIN_FREQUENCY
 ) -> Dict[str, int]:
@@ -463,7 +498,9 @@ def add_values_to_yaml(
 def format_suggestions_as_markdown(
     suggestions: Dict[str, Dict[str, int]],
     filters: Dict[str, int],
-    files_modified: Dict[str, int] = None
+    files_modified: Dict[str, int] = None,
+    mappings: Dict[str, Dict[str, Dict]] = None,
+    candidates: Dict[str, Dict[str, List[Dict]]] = None
 ) -> str:
     """
     Format suggestions as markdown for PR description.
@@ -472,6 +509,8 @@ def format_suggestions_as_markdown(
         suggestions: Field suggestions with counts
         filters: Filter candidates with unique value counts
         files_modified: Dictionary of files modified with count of values added
+        mappings: Values resolvable to existing terms, by field
+        candidates: Closest existing values per suggested value, by field
 
     Returns:
         Markdown formatted string
@@ -504,8 +543,15 @@ def format_suggestions_as_markdown(
             # Sort by frequency (descending)
             sorted_values = sorted(values.items(), key=lambda x: x[1], reverse=True)
 
+            field_candidates = (candidates or {}).get(field, {})
             for value, count in sorted_values[:20]:  # Limit to top 20
-                md.append(f"- `{value}` (used {count} times)\n")
+                md.append(f"- `{value}` (used {count} times)")
+                if value in field_candidates:
+                    closest = ", ".join(
+                        f"`{c['canonical']}` ({c['score']:.2f})" for c in field_candidates[value]
+                    )
+                    md.append(f" — closest: {closest}")
+                md.append("\n")
 
             if len(sorted_values) > 20:
                 md.append(f"\n*...and {len(sorted_values) - 20} more*\n")
@@ -513,6 +559,22 @@ def format_suggestions_as_markdown(
         md.append("## No New Enum Values Suggested\n")
         md.append("All annotation values match existing schema definitions.\n")
 
+    if mappings:
+        md.append("\n## Suggested Value Mappings\n")
+        md.append("The following values are variants of existing permissible values or aliases ")
+        md.append("(case, spacing, punctuation or a one-character typo). Consider correcting the ")
+        md.append("annotations, or adding the variant as an alias, instead of adding a new value.\n")
+
+        for field in sorted(mappings.keys()):
+            md.append(f"\n### Field: `{field}`\n\n")
+            md.append("| Annotation value | Canonical value | Enum | Match | Uses |\n")
+            md.append("|---|---|---|---|---|\n")
+            sorted_mappings = sorted(mappings[field].items(), key=lambda x: x[1]['count'], reverse=True)
+            for value, m in sorted_mappings[:20]:
+                md.append(f"| `{value}` | `{m['canonical']}` | {m['enum']} | {m['match']} | {m['count']} |\n")
+            if len(sorted_mappings) > 20:
+                md.append(f"\n*...and {len(sorted_mappings) - 20} more*\n")
+
     if filters:
         md.append("\n## Suggested Portal Search Filters\n")
         md.append("The following fields have diverse values and could be useful as ")
@@ -533,7 +595,9 @@ def format_suggestions_as_markdown(
 def save_suggestions_to_file(
     suggestions: Dict[str, Dict[str, int]],
     filters: Dict[str, int],
-    output_file: Path
+    output_file: Path,
+    mappings: Dict[str, Dict[str, Dict]] = None,
+    candidates: Dict[str, Dict[str, List[Dict]]] = None
 ) -> None:
     """
     Save suggestions to JSON file for potential automated processing.
@@ -542,9 +606,13 @@ def save_suggestions_to_file(
         suggestions: Field suggestions with counts
         filters: Filter candidates
         output_file: Path to output file
+        mappings: Values resolvable to existing terms, by field
+        candidates: Closest existing values per suggested value, by field
     """
     data = {
         'suggestions': suggestions,
+        'candidates': candidates or {},
+        'mappings': mappings or {},
         'filters': filters,
         'materialized_view': MATERIALIZED_VIEW_ID
     }
@@ -581,14 +649,31 @@ def main():
         action='store_true',
         help='Do not edit YAML files, only generate suggestions'
     )
+    parser.add_argument(
+        '--top-k',
+        type=int,
+        default=TOP_K_CANDIDATES,
+        help=f'Closest existing values listed per suggestion, 0 to disable (default: {TOP_K_CANDIDATES})'
+    )
     parser.add_argument(
         '--limit',
         type=int,
         help='Limit number of records to query (for testing)'
     )
+    parser.add_argument(
+        '--lookup',
+        type=Path,
+        help='Check values against this enum lookup file (build.py --only lookup) instead of parsing the modules'
+    )
 
     args = parser.parse_args()
 
+    try:
+        from synapseclient import Synapse
+    except ImportError:
+        print("Error: synapseclient not installed. Install with: pip install synapseclient")
+        sys.exit(1)
+
     # Check for Synapse authentication
     auth_token = os.environ.get('SYNAPSE_AUTH_TOKEN')
     if not auth_token:
@@ -603,9 +688,16 @@ def main():
 
         # Load schema
         logger.info("Loading schema enums...")
-        enums = load_schema_enums()
+        enums = LookupFile(args.lookup) if args.lookup else load_schema_enums()
         slot_enum_map = load_slot_to_enum_mapping()
         custom_value_fields = detect_custom_value_fields()
+        resolver = index = None
+        if DIST_SCHEMA.exists():
+            resolver = AliasResolver.from_model(DIST_SCHEMA)
+            if args.top_k > 0:
+                index = CandidateIndex.from_model(DIST_SCHEMA)
+        else:
+            logger.warning(f"{DIST_SCHEMA} not found, variant values will be suggested as additions")
 
         logger.info(f"Will review {len(custom_value_fields)} fields that allow both enum and custom values")
         logger.info(f"Fields to review: {', '.join(sorted(custom_value_fields))}")
@@ -615,7 +707,11 @@ def main():
 
         # Analyze annotations
         logger.info("Analyzing annotations...")
-        suggestions, filters = analyze_annotations(records, enums, slot_enum_map, custom_value_fields)
+        suggestions, filters, mappings = analyze_annotations(
+            records, enums, slot_enum_map, custom_value_fields, resolver
+        )
+
+        candidates = rank_candidates(suggestions, slot_enum_map, index, args.top_k) if index else {}
 
         # Add values to YAML files (unless --no-edit or --dry-run)
         files_modified = {}
@@ -634,7 +730,7 @@ def main():
             logger.info("Skipping YAML edits (--dry-run mode)")
 
         # Format as markdown
-        markdown = format_suggestions_as_markdown(suggestions, filters, files_modified)
+        markdown = format_suggestions_as_markdown(suggestions, filters, files_modified, mappings, candidates)
 
         if args.dry_run:
             logger.info("Dry run - printing results:")
@@ -643,7 +739,7 @@ def main():
             print("="*80)
         else:
             # Save files
-            save_suggestions_to_file(suggestions, filters, args.output)
+            save_suggestions_to_file(suggestions, filters, args.output, mappings, candidates)
 
             with open(args.markdown, 'w') as f:
                 f.write(markdown)
@@ -655,6 +751,7 @@ def main():
         logger.info(f"\nSummary:")
         logger.info(f"  - {len(suggestions)} fields with suggested additions")
         logger.info(f"  - {total_suggestions} total value suggestions")
+        logger.info(f"  - {sum(len(v) for v in mappings.values())} values mappable to existing terms")
         logger.info(f"  - {total_added} values added to YAML files")
         logger.info(f"  - {len(files_modified)} files modified")
         logger.info(f"  - {len(filters)} potential search filters")
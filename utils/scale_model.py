@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Write a synthetic copy of modules/ that is N times larger.
+
+The weekly syncs keep growing CellLineModel.yaml, AnimalModel.yaml,
+Antibody.yaml and GeneticReagent.yaml, and new Template modules keep being
+added. This makes a stand-in for a future model of N times today's size, so
+merge, generation, diffing and validation can be measured at that size
+(see tests/benchmarks/run_benchmarks.py --scale).
+
+Scaling, for a factor N:
+- every enum gets N times its permissible values ("RNA-seq", "RNA-seq 2", ...)
+  with the same annotations, meanings and aliases
+- every concrete template gets N-1 clones ("RNASeqTemplateScaled2", ...)
+  in the same module file, with the same parent, slots, annotations and
+  conditional rules, and with their own copy of every slot_usage override
+
+The clones only point at slots, enums and parents that already exist, so
+every reference in the scaled model is still valid; check with
+dangling_references(). Comments and formatting of the source YAML are not
+preserved.
+
+Usage:
+    python utils/scale_model.py --factor 5 --output-dir /tmp/nf-x5
+    python utils/build.py --header /tmp/nf-x5/header.yaml --modules-dir /tmp/nf-x5/modules \\
+        --dist-dir /tmp/nf-x5/dist --schemas-dir /tmp/nf-x5/schemas --no-cache
+"""
+
+import argparse
+import copy
+import shutil
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent))
+from schema_index import MODULES_DIR, SchemaIndex
+
+HEADER = MODULES_DIR.parent / "header.yaml"
+
+# Ranges that resolve through the linkml:types import rather than the model
+BUILTIN_TYPES = {
+    "string", "integer", "float", "double", "decimal", "boolean", "date", "datetime", "time",
+    "uri", "uriorcurie", "curie", "ncname", "objectidentifier", "nodeidentifier", "jsonpointer",
+    "jsonpath", "sparqlpath",
+}
+
+
+def scaled_permissible_values(values: dict, factor: int) -> dict:
+    """values followed by factor-1 suffixed copies of each (keys never collide)."""
+    scaled = dict(values)
+    for copy_number in range(2, factor + 1):
+        for term, value in values.items():
+            key = f"{term} {copy_number}"
+            while key in scaled:
+                key += "'"
+            scaled[key] = copy.deepcopy(value)
+    return scaled
+
+
+def clone_templates(classes: dict, template_names: set, factor: int, taken: set) -> dict:
+    """classes with factor-1 clones inserted after each concrete template in template_names."""
+    scaled = {}
+    for name, definition in classes.items():
+        scaled[name] = definition
+        if name not in template_names:
+            continue
+        for copy_number in range(2, factor + 1):
+            clone_name = f"{name}Scaled{copy_number}"
+            while clone_name in taken:
+                clone_name += "X"
+            taken.add(clone_name)
+            clone = copy.deepcopy(definition)
+            if clone.get("title"):
+                clone["title"] = f"{clone['title']} {copy_number}"
+            scaled[clone_name] = clone
+    return scaled
+
+
+def scale_modules(modules_dir: Path, factor: int, output_dir: Path) -> dict:
+    """Write a scaled copy of modules_dir to output_dir.
+
+    Args:
+        modules_dir: Source modules directory
+        factor: Size multiplier (1 writes an unchanged copy)
+        output_dir: Destination; created, and must not exist yet
+
+    Returns:
+        {"permissible_values": ..., "templates": ..., "slot_usage": ..., "rules": ...} counts in the scaled copy
+    """
+    if factor < 1:
+        raise ValueError(f"factor must be at least 1, got {factor}")
+    modules_dir, output_dir = Path(modules_dir), Path(output_dir)
+    index = SchemaIndex.from_modules(modules_dir)
+    templates = set(index.templates())
+    taken = set(index.classes)
+
+    shutil.copytree(modules_dir, output_dir)
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    counts = {"permissible_values": 0, "templates": 0, "slot_usage": 0, "rules": 0}
+
+    for path in sorted(output_dir.rglob("*.yaml")):
+        with open(path) as f:
+            data = yaml.load(f, Loader=loader) or {}
+        changed = False
+
+        for enum in (data.get("enums") or {}).values():
+            values = (enum or {}).get("permissible_values")
+            if values:
+                if factor > 1:
+                    enum["permissible_values"] = scaled_permissible_values(values, factor)
+                    changed = True
+                counts["permissible_values"] += len(enum["permissible_values"])
+
+        classes = data.get("classes") or {}
+        if factor > 1 and templates & set(classes):
+            data["classes"] = classes = clone_templates(classes, templates, factor, taken)
+            changed = True
+        for name, definition in classes.items():
+            if not isinstance(definition, dict):
+                continue
+            if name in templates or name.rsplit("Scaled", 1)[0] in templates:
+                counts["templates"] += 1
+            counts["slot_usage"] += len(definition.get("slot_usage") or {})
+            counts["rules"] += len(definition.get("rules") or [])
+
+        if changed:
+            with open(path, "w") as f:
+                yaml.dump(data, f, Dumper=dumper, sort_keys=False, allow_unicode=True)
+    return counts
+
+
+def _ranges(definition: dict):
+    if not isinstance(definition, dict):
+        return
+    if definition.get("range"):
+        yield definition["range"]
+    for option in definition.get("any_of") or []:
+        yield from _ranges(option)
+
+
+def dangling_references(model: dict) -> set:
+    """(kind, source, target) for every is_a, mixin, slot or range that names nothing in model."""
+    classes = model.get("classes") or {}
+    slots = model.get("slots") or {}
+    enums = model.get("enums") or {}
+    types = set(model.get("types") or {}) | BUILTIN_TYPES
+    dangling = set()
+
+    for name, slot in slots.items():
+        for target in _ranges(slot):
+            if target not in classes and target not in enums and target not in types:
+                dangling.add(("range", name, target))
+
+    for name, definition in classes.items():
+        definition = definition or {}
+        for parent in [definition.get("is_a"), *(definition.get("mixins") or [])]:
+            if parent and parent not in classes:
+                dangling.add(("is_a", name, parent))
+        attributes = definition.get("attributes") or {}
+        for slot_name in definition.get("slots") or []:
+            if slot_name not in slots and slot_name not in attributes:
+                dangling.add(("slot", name, slot_name))
+        for slot_name, usage in (definition.get("slot_usage") or {}).items():
+            for target in _ranges(usage):
+                if target not in classes and target not in enums and target not in types:
+                    dangling.add(("range", f"{name}.{slot_name}", target))
+    return dangling
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Write a synthetic, N times larger copy of the modules")
+    parser.add_argument("--factor", type=int, required=True, help="Size multiplier, e.g. 5 or 10")
+    parser.add_argument("--output-dir", type=Path, required=True, help="Directory for header.yaml and modules/ (must not exist)")
+    parser.add_argument("--modules-dir", type=Path, default=MODULES_DIR, help="Source modules (default: modules)")
+    parser.add_argument("--header", type=Path, default=HEADER, help="Header to copy alongside (default: header.yaml)")
+    args = parser.parse_args()
+
+    if args.output_dir.exists():
+        print(f"❌ {args.output_dir} already exists", file=sys.stderr)
+        return 1
+
+    counts = scale_modules(args.modules_dir, args.factor, args.output_dir / "modules")
+    shutil.copyfile(args.header, args.output_dir / "header.yaml")
+    summary = ", ".join(f"{n:,} {kind.replace('_', ' ')}" for kind, n in counts.items())
+    print(f"✅ Wrote {args.factor}x model to {args.output_dir}: {summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
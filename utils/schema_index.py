@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Precomputed class hierarchy and induced-slot index for the merged model.
+
+Built once from dist/NF.yaml (or the modules directory), it answers the
+questions tools keep recomputing from raw YAML or RDF:
+
+- children / ancestors / descendants of a class (transitive closure)
+- the induced slots of a template: inherited `slots` and `attributes` along
+  the `is_a` chain (the class's own first, then each parent's, nearest
+  first: the JSON Schema property order), with `slot_usage` applied
+  root-first and `range`/`any_of` resolved to the effective ranges
+
+Every answer is a dictionary lookup after construction.
+
+Usage:
+    from schema_index import load_index
+
+    index = load_index()
+    index.descendants("FileBasedTemplate")
+    index.effective_range("RNASeqTemplate", "platform")
+
+    python utils/schema_index.py descendants FileBasedTemplate
+    python utils/schema_index.py slots RNASeqTemplate
+    python utils/schema_index.py range RNASeqTemplate platform
+"""
+
+import argparse
+import copy
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+DIST_SCHEMA = Path(__file__).parent.parent / "dist" / "NF.yaml"
+MODULES_DIR = Path(__file__).parent.parent / "modules"
+
+# Keys that together define a slot's range; a layer setting either replaces both
+_RANGE_KEYS = ("range", "any_of")
+
+
+class HierarchyIndex:
+    """Children, ancestors and descendants of a single-inheritance hierarchy."""
+
+    def __init__(self, parents: dict):
+        """
+        Args:
+            parents: {node: parent node or None}
+        """
+        self._parent = {node: parent for node, parent in parents.items()}
+        children = defaultdict(list)
+        for node, parent in self._parent.items():
+            if parent is not None:
+                children[parent].append(node)
+        self._children = {node: tuple(kids) for node, kids in children.items()}
+
+        nodes = set(self._parent) | set(self._children)
+        self._ancestors = {node: self._walk_up(node) for node in nodes}
+        self._ancestor_sets = {node: frozenset(chain) for node, chain in self._ancestors.items()}
+        descendants = defaultdict(set)
+        for node, chain in self._ancestors.items():
+            for ancestor in chain:
+                descendants[ancestor].add(node)
+        self._descendants = {node: frozenset(descendants.get(node, ())) for node in nodes}
+
+    def _walk_up(self, node) -> tuple:
+        chain = []
+        seen = {node}
+        parent = self._parent.get(node)
+        while parent is not None and parent not in seen:
+            chain.append(parent)
+            seen.add(parent)
+            parent = self._parent.get(parent)
+        return tuple(chain)
+
+    def __contains__(self, node) -> bool:
+        return node in self._ancestors
+
+    def parent(self, node):
+        return self._parent.get(node)
+
+    def children(self, node) -> tuple:
+        """Direct subclasses of node."""
+        return self._children.get(node, ())
+
+    def ancestors(self, node) -> tuple:
+        """Ancestors of node, nearest first."""
+        return self._ancestors.get(node, ())
+
+    def descendants(self, node) -> frozenset:
+        """All transitive subclasses of node (not including node)."""
+        return self._descendants.get(node, frozenset())
+
+    def is_subclass(self, node, ancestor) -> bool:
+        """True if ancestor is node or one of its ancestors."""
+        return node == ancestor or ancestor in self._ancestor_sets.get(node, ())
+
+
+@dataclass(frozen=True)
+class InducedSlot:
+    """A slot as seen from one class, after inheritance and slot_usage."""
+    name: str
+    definition: dict = field(compare=False)
+    default_range: str = "string"
+
+    @property
+    def ranges(self) -> tuple:
+        """Effective range(s): the any_of ranges if present, else the range."""
+        any_of = self.definition.get("any_of")
+        if any_of:
+            return tuple(o["range"] for o in any_of if isinstance(o, dict) and o.get("range"))
+        return (self.definition.get("range") or self.default_range,)
+
+    @property
+    def required(self) -> bool:
+        return bool(self.definition.get("required"))
+
+
+def _apply_layer(definition: dict, layer: dict) -> None:
+    if any(key in layer for key in _RANGE_KEYS):
+        for key in _RANGE_KEYS:
+            definition.pop(key, None)
+    definition.update(copy.deepcopy(layer))
+
+
+class SchemaIndex:
+    """Hierarchy and induced-slot tables for a merged LinkML model."""
+
+    def __init__(self, model: dict):
+        """
+        Args:
+            model: Merged model dict with `classes`, `slots` and `enums`
+        """
+        self.classes = model.get("classes") or {}
+        self.slots = model.get("slots") or {}
+        self.enums = model.get("enums") or {}
+        self.default_range = model.get("default_range") or "string"
+        self.hierarchy = HierarchyIndex(
+            {name: (definition or {}).get("is_a") for name, definition in self.classes.items()}
+        )
+        self._induced = {name: self._induce(name) for name in self.classes}
+
+    @classmethod
+    def from_model(cls, model_path: Path = DIST_SCHEMA) -> "SchemaIndex":
+        """Build from a merged model file such as dist/NF.yaml."""
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(model_path) as f:
+            return cls(yaml.load(f, Loader=loader) or {})
+
+    @classmethod
+    def from_modules(cls, modules_dir: Path = MODULES_DIR) -> "SchemaIndex":
+        """Build from the source modules (before the model is compiled)."""
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        merged = {"classes": {}, "enums": {}, "slots": {}}
+        for yaml_file in sorted(Path(modules_dir).rglob("*.yaml")):
+            with open(yaml_file) as f:
+                data = yaml.load(f, Loader=loader) or {}
+            for key in merged:
+                merged[key].update(data.get(key) or {})
+        return cls(merged)
+
+    def _induce(self, class_name: str) -> dict:
+        lineage = [*reversed(self.ancestors(class_name)), class_name]  # root first
+        definitions = [self.classes.get(name) or {} for name in lineage]
+
+        names = []
+        for definition in reversed(definitions):  # own slots first, then nearest parent's
+            names.extend(definition.get("slots") or [])
+            names.extend(definition.get("attributes") or {})
+
+        induced = {}
+        for slot_name in dict.fromkeys(names):
+            merged = copy.deepcopy(self.slots.get(slot_name) or {})
+            for definition in definitions:
+                attribute = (definition.get("attributes") or {}).get(slot_name)
+                if isinstance(attribute, dict):
+                    _apply_layer(merged, attribute)
+                usage = (definition.get("slot_usage") or {}).get(slot_name)
+                if isinstance(usage, dict):
+                    _apply_layer(merged, usage)
+            induced[slot_name] = InducedSlot(slot_name, merged, self.default_range)
+        return induced
+
+    def children(self, class_name: str) -> tuple:
+        return self.hierarchy.children(class_name)
+
+    def ancestors(self, class_name: str) -> tuple:
+        return self.hierarchy.ancestors(class_name)
+
+    def descendants(self, class_name: str) -> frozenset:
+        return self.hierarchy.descendants(class_name)
+
+    def is_subclass(self, class_name: str, ancestor: str) -> bool:
+        return self.hierarchy.is_subclass(class_name, ancestor)
+
+    def templates(self, base: str = "Template", include_abstract: bool = False) -> list[str]:
+        """Sorted descendants of base, optionally keeping abstract classes."""
+        return sorted(
+            name for name in self.descendants(base)
+            if include_abstract or not (self.classes.get(name) or {}).get("abstract")
+        )
+
+    def induced_slots(self, class_name: str) -> dict:
+        """{slot name: InducedSlot}, the class's own slots first, then each ancestor's (nearest first)."""
+        return self._induced.get(class_name, {})
+
+    def induced_slot(self, class_name: str, slot_name: str) -> InducedSlot | None:
+        return self._induced.get(class_name, {}).get(slot_name)
+
+    def effective_range(self, class_name: str, slot_name: str) -> tuple:
+        """Effective range(s) of a slot in a class, or () if the class lacks it."""
+        slot = self.induced_slot(class_name, slot_name)
+        return slot.ranges if slot else ()
+
+
+@lru_cache(maxsize=None)
+def load_index(model_path: Path = DIST_SCHEMA) -> SchemaIndex:
+    """Shared SchemaIndex for a model file, built once per process."""
+    return SchemaIndex.from_model(model_path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Query the class hierarchy and induced slots of the model")
+    parser.add_argument("--model", type=Path, default=DIST_SCHEMA, help="Merged model (default: dist/NF.yaml)")
+    parser.add_argument("--modules", action="store_true", help="Build from modules/ instead of the merged model")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for command in ("children", "ancestors", "descendants", "slots"):
+        sub.add_parser(command).add_argument("class_name")
+    range_parser = sub.add_parser("range", help="Effective range of a slot in a class")
+    range_parser.add_argument("class_name")
+    range_parser.add_argument("slot_name")
+    args = parser.parse_args()
+
+    index = SchemaIndex.from_modules() if args.modules else SchemaIndex.from_model(args.model)
+    if args.class_name not in index.classes:
+        print(f"Unknown class: {args.class_name}", file=sys.stderr)
+        return 1
+
+    if args.command == "children":
+        print("\n".join(sorted(index.children(args.class_name))))
+    elif args.command == "ancestors":
+        print("\n".join(index.ancestors(args.class_name)))
+    elif args.command == "descendants":
+        print("\n".join(sorted(index.descendants(args.class_name))))
+    elif args.command == "slots":
+        for slot in index.induced_slots(args.class_name).values():
+            print(f"{slot.name}: {' | '.join(slot.ranges)}{' (required)' if slot.required else ''}")
+    else:
+        ranges = index.effective_range(args.class_name, args.slot_name)
+        if not ranges:
+            print(f"{args.class_name} has no slot {args.slot_name}", file=sys.stderr)
+            return 1
+        print(" | ".join(ranges))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+In-memory rewrites applied to each generated JSON Schema before it is written.
+
+The JSON Schema generators (build.py and gen-json-schema-class.py) run
+process_schema on the LinkML output and then this pipeline, and write each
+resulting schema exactly once. Two kinds of plugins are registered here:
+
+- passes (@schema_pass): rewrite a class's schema dict in place
+    strip-manifest-columns  drop Filename/Component (issue #708), default
+    contenttype             contentType='dataset' conditional on templates
+                            (issue #788), opt-in
+- derived schemas (@derived_schema): a further schema built from one class's
+  processed schema
+    Superdataset            PortalDataset plus rules/super_rules.json,
+                            without `required` (was `make Superdataset`)
+
+Usage:
+    from schema_passes import DEFAULT_PASSES, run_pipeline, schema_json
+
+    outputs = run_pipeline(schema, "PortalDataset", DEFAULT_PASSES, derived=["Superdataset"])
+    for name, schema in outputs.items():
+        (schemas_dir / f"{name}.json").write_text(schema_json(name, schema))
+"""
+
+import copy
+import json
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+SUPER_RULES = ROOT / "rules" / "super_rules.json"
+SUPERDATASET_ID = "https://repo-prod.prod.sagebase.org/repo/v1/schema/type/registered/org.synapse.nf-superdataset"
+
+SCHEMA_PASSES = {}
+DERIVED_SCHEMAS = {}
+
+DEFAULT_PASSES = ("strip-manifest-columns",)
+
+# Manifest bookkeeping columns that are not metadata (issue #708)
+MANIFEST_COLUMNS = ("Filename", "Component")
+
+# Keeps folders bound to a template visible in the Data Curator App (issue #788);
+# the same conditional as rules/super_rules.json
+CONTENTTYPE_CONDITIONAL = {
+    "if": {
+        "properties": {
+            "concreteType": {
+                "const": "org.sagebionetworks.repo.model.Folder"
+            }
+        },
+        "not": {
+            "properties": {
+                "name": {
+                    "const": "Raw Data"
+                }
+            }
+        }
+    },
+    "then": {
+        "properties": {
+            "contentType": {
+                "const": "dataset"
+            }
+        }
+    }
+}
+
+
+def schema_pass(name: str):
+    """Register fn(schema, cls_name) as an in-place pass called name."""
+    def register(fn):
+        SCHEMA_PASSES[name] = fn
+        return fn
+    return register
+
+
+def derived_schema(name: str, source: str):
+    """Register fn(schema) -> schema as the schema called name, built from class source."""
+    def register(fn):
+        DERIVED_SCHEMAS[name] = (source, fn)
+        return fn
+    return register
+
+
+@schema_pass("strip-manifest-columns")
+def strip_manifest_columns(schema: dict, cls_name: str) -> None:
+    """Remove Filename and Component from properties and required."""
+    if "properties" in schema:
+        for field in MANIFEST_COLUMNS:
+            schema["properties"].pop(field, None)
+    if "required" in schema:
+        schema["required"] = [r for r in schema["required"] if r not in MANIFEST_COLUMNS]
+
+
+def has_contenttype(schema: dict) -> bool:
+    """Whether an allOf entry or the root if-then already constrains contentType."""
+    for item in schema.get("allOf", []):
+        if "contentType" in item.get("then", {}).get("properties", {}):
+            return True
+    return "if" in schema and "contentType" in schema.get("then", {}).get("properties", {})
+
+
+def add_contenttype_conditional(schema: dict) -> bool:
+    """Append the contentType conditional to allOf unless it's already there.
+
+    Returns:
+        True if the schema was modified
+    """
+    if has_contenttype(schema):
+        return False
+    schema.setdefault("allOf", []).append(copy.deepcopy(CONTENTTYPE_CONDITIONAL))
+    return True
+
+
+@schema_pass("contenttype")
+def contenttype(schema: dict, cls_name: str) -> None:
+    if cls_name.endswith("Template"):
+        add_contenttype_conditional(schema)
+
+
+@lru_cache(maxsize=None)
+def _rules(path: Path) -> str:
+    return Path(path).read_text()
+
+
+@derived_schema("Superdataset", source="PortalDataset")
+def superdataset(schema: dict, rules: Path = SUPER_RULES) -> dict:
+    """PortalDataset with the super rules' if-then at the root, nothing required."""
+    derived = dict(schema)
+    derived.update(json.loads(_rules(rules)))
+    derived.pop("required", None)
+    derived["$id"] = SUPERDATASET_ID
+    return derived
+
+
+def run_pipeline(schema: dict, cls_name: str, passes=DEFAULT_PASSES, derived=()) -> dict:
+    """Apply passes to a processed schema and build the derived schemas it is the source of.
+
+    Args:
+        schema: process_schema output for cls_name; rewritten in place
+        cls_name: Class the schema was generated for
+        passes: Names from SCHEMA_PASSES, applied in this order
+        derived: Names from DERIVED_SCHEMAS to build (only those whose source is cls_name are)
+
+    Returns:
+        {schema name: schema dict} for every file to write, cls_name first
+
+    Raises:
+        KeyError: If a pass or derived schema name isn't registered
+    """
+    for name in passes:
+        SCHEMA_PASSES[name](schema, cls_name)
+    outputs = {cls_name: schema}
+    for name in derived:
+        source, derive = DERIVED_SCHEMAS[name]
+        if source == cls_name:
+            outputs[name] = derive(schema)
+    return outputs
+
+
+def schema_json(name: str, schema: dict) -> str:
+    """File contents for a schema, formatted as that file has always been written."""
+    if name in DERIVED_SCHEMAS:
+        return json.dumps(schema, indent=2, ensure_ascii=False) + "\n"
+    return json.dumps(schema, indent=2)
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Compile the registered JSON Schemas into plain Python validator modules.
+
+jsonschema interprets a schema on every call: for our larger templates that
+is 40+ properties, 1,000+ enum strings and a dozen if/then blocks walked per
+instance. This generates, for each registered-json-schemas/*.json, a module
+with the same Draft 7 semantics written out as straight-line code:
+
+- enums become frozensets (or tuples with JSON equality when not all strings)
+- patterns are compiled once at import
+- if/then/else, allOf, anyOf, oneOf and not are direct function calls
+- identical subschemas (the same enum under several properties, say) share
+  one function
+
+Every module exposes is_valid(instance) and errors(instance), the latter a
+list of (path, keyword, message) like jsonschema's iter_errors with
+error.absolute_path and error.validator. `format` is an annotation, as it is
+for jsonschema without a format checker. A schema using a keyword outside
+the supported set fails to compile with UnsupportedSchema.
+
+Modules are written to dist/validators/ (`build.py --only validators`) and
+loaded lazily by load_validator(), which compiles in memory instead when
+the module is missing or older than its schema.
+
+Usage:
+    python utils/schema_validators.py build
+    python utils/schema_validators.py validate RNASeqTemplate manifest.json [...]
+
+    from schema_validators import load_validator
+    load_validator("RNASeqTemplate").is_valid(instance)
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+SCHEMAS_DIR = ROOT / "registered-json-schemas"
+VALIDATORS_DIR = ROOT / "dist" / "validators"
+
+# Bump when the generated code changes, so older modules are recompiled
+GENERATOR_VERSION = 1
+
+ANNOTATIONS = {
+    "$id", "$schema", "$comment", "title", "description", "default", "examples", "format",
+    "readOnly", "writeOnly", "contentMediaType", "contentEncoding", "definitions",
+}
+APPLICATORS = {"then", "else"}  # only meaningful next to "if"
+
+TYPE_CHECKS = {
+    "string": "isinstance({x}, str)",
+    "integer": "(isinstance({x}, int) and not isinstance({x}, bool) or isinstance({x}, float) and {x}.is_integer())",
+    "number": "(isinstance({x}, (int, float)) and not isinstance({x}, bool))",
+    "boolean": "isinstance({x}, bool)",
+    "null": "{x} is None",
+    "array": "isinstance({x}, list)",
+    "object": "isinstance({x}, dict)",
+}
+
+RUNTIME = '''
+def _equal(a, b):
+    """JSON equality: bools are not numbers, containers compare element-wise."""
+    if a is b:
+        return True
+    if isinstance(a, str) or isinstance(b, str):
+        return a == b
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_equal(i, j) for i, j in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_equal(a[k], b[k]) for k in a)
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    return a == b
+
+
+def _short(x):
+    text = repr(x)
+    return text if len(text) <= 80 else text[:77] + "..."
+'''
+
+
+class UnsupportedSchema(ValueError):
+    """The schema uses a keyword the compiler doesn't implement."""
+
+
+def schema_digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _assertions(schema: dict) -> dict:
+    return {k: v for k, v in schema.items() if k not in ANNOTATIONS}
+
+
+def _report(keyword: str, suffix: str) -> str:
+    """Line of _errors_N recording a failed keyword: repr of the instance, then suffix."""
+    return f"    out.append((path, {keyword!r}, _short(x) + {suffix!r}))"
+
+
+class _Compiler:
+    """Emits one _valid_N/_errors_N function pair per distinct subschema."""
+
+    def __init__(self):
+        self.nodes = {}  # canonical assertions -> N
+        self.functions = []
+        self.constants = []
+        self.tables = []
+        self._constant_ids = {}
+
+    def constant(self, prefix: str, source: str) -> str:
+        key = (prefix, source)
+        if key not in self._constant_ids:
+            name = f"_{prefix}{len(self._constant_ids)}"
+            self._constant_ids[key] = name
+            self.constants.append(f"{name} = {source}")
+        return self._constant_ids[key]
+
+    def node(self, schema):
+        """Function number for schema, or None if every instance is valid against it."""
+        if schema is True:
+            return None
+        if schema is False:
+            schema = {"not": {}}
+        if not isinstance(schema, dict):
+            raise UnsupportedSchema(f"not a schema: {schema!r}")
+        assertions = _assertions(schema)
+        if "if" not in assertions:
+            assertions = {k: v for k, v in assertions.items() if k not in APPLICATORS}
+        if not assertions:
+            return None
+        key = json.dumps(assertions, sort_keys=True)
+        if key not in self.nodes:
+            n = self.nodes[key] = len(self.nodes)
+            self.functions.append(None)  # reserve the slot, children are numbered after
+            self.functions[n] = self._compile(n, assertions)
+        return self.nodes[key]
+
+    def _compile(self, n: int, schema: dict) -> str:
+        valid, errors = [], []
+        for keyword, value in schema.items():
+            handler = getattr(self, "_k_" + keyword.replace("$", "_"), None)
+            if keyword in APPLICATORS:
+                continue
+            if handler is None:
+                raise UnsupportedSchema(f"keyword {keyword!r} is not supported")
+            v, e = handler(value, schema)
+            valid.extend(v)
+            errors.extend(e)
+        lines = [f"def _valid_{n}(x):"]
+        lines += ["    " + line for line in valid] + ["    return True", "", ""]
+        lines += [f"def _errors_{n}(x, path, out):"]
+        lines += ["    " + line for line in errors] or ["    pass"]
+        return "\n".join(lines) + "\n"
+
+    # Each _k_<keyword> returns (lines for _valid_N, lines for _errors_N)
+
+    def _k_type(self, value, schema):
+        names = value if isinstance(value, list) else [value]
+        for name in names:
+            if name not in TYPE_CHECKS:
+                raise UnsupportedSchema(f"type {name!r} is not supported")
+        check = " or ".join(TYPE_CHECKS[name].format(x="x") for name in names)
+        expected = ", ".join(repr(name) for name in names)
+        return (
+            [f"if not ({check}):", "    return False"],
+            [f"if not ({check}):", _report("type", f" is not of type {expected}")],
+        )
+
+    def _k_enum(self, value, schema):
+        if all(isinstance(v, str) for v in value):
+            table = self.constant("ENUM", f"frozenset({sorted(set(value))!r})")
+            check = f"isinstance(x, str) and x in {table}"
+        else:
+            table = self.constant("ENUM", repr(tuple(value)))
+            check = f"any(_equal(x, v) for v in {table})"
+        return (
+            [f"if not ({check}):", "    return False"],
+            [f"if not ({check}):", _report("enum", " is not one of the allowed values")],
+        )
+
+    def _k_const(self, value, schema):
+        if isinstance(value, str):
+            check = f"isinstance(x, str) and x == {value!r}"
+        else:
+            check = f"_equal(x, {self.constant('CONST', repr(value))})"
+        return (
+            [f"if not ({check}):", "    return False"],
+            [f"if not ({check}):", _report("const", f" was expected to be {value!r}")],
+        )
+
+    def _bound(self, keyword, value, op):
+        number = TYPE_CHECKS["number"].format(x="x")
+        return (
+            [f"if {number} and x {op} {value!r}:", "    return False"],
+            [f"if {number} and x {op} {value!r}:", _report(keyword, f" fails {keyword} {value!r}")],
+        )
+
+    def _k_maximum(self, value, schema):
+        return self._bound("maximum", value, ">")
+
+    def _k_minimum(self, value, schema):
+        return self._bound("minimum", value, "<")
+
+    def _k_exclusiveMaximum(self, value, schema):
+        return self._bound("exclusiveMaximum", value, ">=")
+
+    def _k_exclusiveMinimum(self, value, schema):
+        return self._bound("exclusiveMinimum", value, "<=")
+
+    def _length(self, keyword, value, kind, op):
+        return (
+            [f"if isinstance(x, {kind}) and len(x) {op} {value!r}:", "    return False"],
+            [f"if isinstance(x, {kind}) and len(x) {op} {value!r}:", _report(keyword, f" fails {keyword} {value!r}")],
+        )
+
+    def _k_minLength(self, value, schema):
+        return self._length("minLength", value, "str", "<")
+
+    def _k_maxLength(self, value, schema):
+        return self._length("maxLength", value, "str", ">")
+
+    def _k_minItems(self, value, schema):
+        return self._length("minItems", value, "list", "<")
+
+    def _k_maxItems(self, value, schema):
+        return self._length("maxItems", value, "list", ">")
+
+    def _k_pattern(self, value, schema):
+        regex = self.constant("RE", f"re.compile({value!r})")
+        return (
+            [f"if isinstance(x, str) and not {regex}.search(x):", "    return False"],
+            [f"if isinstance(x, str) and not {regex}.search(x):", _report("pattern", f" does not match {value!r}")],
+        )
+
+    def _k_required(self, value, schema):
+        names = self.constant("REQ", repr(tuple(value)))
+        return (
+            [f"if isinstance(x, dict) and not all(k in x for k in {names}):", "    return False"],
+            [
+                "if isinstance(x, dict):",
+                f"    for k in {names}:",
+                "        if k not in x:",
+                "            out.append((path, 'required', repr(k) + ' is a required property'))",
+            ],
+        )
+
+    def _k_properties(self, value, schema):
+        compiled = {name: self.node(subschema) for name, subschema in value.items()}
+        compiled = {name: n for name, n in compiled.items() if n is not None}
+        if not compiled:
+            return [], []
+        table = f"_PROPS{len(self.tables)}"
+        self.tables.append(
+            f"{table} = {{{', '.join(f'{name!r}: (_valid_{n}, _errors_{n})' for name, n in compiled.items())}}}"
+        )
+        return (
+            [
+                "if isinstance(x, dict):",
+                "    for k, v in x.items():",
+                f"        f = {table}.get(k)",
+                "        if f is not None and not f[0](v):",
+                "            return False",
+            ],
+            [
+                "if isinstance(x, dict):",
+                "    for k, v in x.items():",
+                f"        f = {table}.get(k)",
+                "        if f is not None:",
+                "            f[1](v, path + (k,), out)",
+            ],
+        )
+
+    def _k_items(self, value, schema):
+        if isinstance(value, list):
+            nodes = [self.node(subschema) for subschema in value]
+            valid, errors = ["if isinstance(x, list):"], ["if isinstance(x, list):"]
+            for index, n in enumerate(nodes):
+                if n is None:
+                    continue
+                valid += [f"    if len(x) > {index} and not _valid_{n}(x[{index}]):", "        return False"]
+                errors += [f"    if len(x) > {index}:", f"        _errors_{n}(x[{index}], path + ({index},), out)"]
+            return (valid if len(valid) > 1 else []), (errors if len(errors) > 1 else [])
+        n = self.node(value)
+        if n is None:
+            return [], []
+        return (
+            ["if isinstance(x, list):", "    for v in x:", f"        if not _valid_{n}(v):", "            return False"],
+            ["if isinstance(x, list):", "    for i, v in enumerate(x):", f"        _errors_{n}(v, path + (i,), out)"],
+        )
+
+    def _k_allOf(self, value, schema):
+        nodes = [n for n in map(self.node, value) if n is not None]
+        return (
+            [line for n in nodes for line in (f"if not _valid_{n}(x):", "    return False")],
+            [f"_errors_{n}(x, path, out)" for n in nodes],
+        )
+
+    def _calls(self, value):
+        return [f"_valid_{n}(x)" if n is not None else "True" for n in map(self.node, value)]
+
+    def _k_anyOf(self, value, schema):
+        check = " or ".join(self._calls(value)) or "False"
+        return (
+            [f"if not ({check}):", "    return False"],
+            [f"if not ({check}):", _report("anyOf", " is not valid under any of the given schemas")],
+        )
+
+    def _k_oneOf(self, value, schema):
+        check = f"sum(({', '.join(self._calls(value))},)) == 1"
+        return (
+            [f"if not ({check}):", "    return False"],
+            [f"if not ({check}):", _report("oneOf", " is not valid under exactly one of the given schemas")],
+        )
+
+    def _k_not(self, value, schema):
+        n = self.node(value)
+        check = f"_valid_{n}(x)" if n is not None else "True"
+        return (
+            [f"if {check}:", "    return False"],
+            [f"if {check}:", _report("not", " should not be valid under the given schema")],
+        )
+
+    def _k_if(self, value, schema):
+        condition = self.node(value)
+        then, else_ = self.node(schema.get("then", True)), self.node(schema.get("else", True))
+        test = f"_valid_{condition}(x)" if condition is not None else "True"
+        valid, errors = [], []
+        if then is not None:
+            valid += [f"if {test} and not _valid_{then}(x):", "    return False"]
+        if else_ is not None:
+            valid += [f"if not {test} and not _valid_{else_}(x):", "    return False"]
+        if then is not None or else_ is not None:
+            errors += [f"if {test}:", f"    {f'_errors_{then}(x, path, out)' if then is not None else 'pass'}"]
+            if else_ is not None:
+                errors += ["else:", f"    _errors_{else_}(x, path, out)"]
+        return valid, errors
+
+
+def compile_schema(schema: dict, name: str, source_digest: str = "") -> str:
+    """Python source of a validator module for schema.
+
+    Args:
+        schema: Draft 7 JSON Schema
+        name: Schema name, for the module docstring
+        source_digest: sha256 of the schema file, recorded as SCHEMA_SHA256
+
+    Raises:
+        UnsupportedSchema: If the schema uses a keyword the compiler doesn't implement
+    """
+    compiler = _Compiler()
+    root = compiler.node(schema)
+    lines = [
+        f"# Generated by utils/schema_validators.py from {name}.json; do not edit.",
+        f'"""Draft 7 validator for {name}."""',
+        "",
+        "import re",
+        "",
+        f"SCHEMA_ID = {schema.get('$id')!r}",
+        f"SCHEMA_SHA256 = {source_digest!r}",
+        f"GENERATOR_VERSION = {GENERATOR_VERSION}",
+        "",
+        *compiler.constants,
+        "",
+        RUNTIME,
+        "",
+        *compiler.functions,
+        *compiler.tables,
+        "",
+        "",
+        "def is_valid(instance):",
+        f"    return {f'_valid_{root}(instance)' if root is not None else 'True'}",
+        "",
+        "",
+        "def errors(instance):",
+        '    """[(path, keyword, message)] for every failed assertion, like jsonschema\'s iter_errors."""',
+        "    out = []",
+        f"    {f'_errors_{root}(instance, (), out)' if root is not None else 'pass'}",
+        "    return out",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def write_validators(schemas_dir: Path = SCHEMAS_DIR, output_dir: Path = VALIDATORS_DIR) -> list[Path]:
+    """Compile every schema in schemas_dir into output_dir/<name>.py.
+
+    Returns:
+        The module paths written
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for schema_path in sorted(Path(schemas_dir).glob("*.json")):
+        text = schema_path.read_text()
+        source = compile_schema(json.loads(text), schema_path.stem, schema_digest(text))
+        output = output_dir / f"{schema_path.stem}.py"
+        output.write_text(source)
+        written.append(output)
+    return written
+
+
+_LOADED = {}
+
+
+def load_validator(name: str, schemas_dir: Path = SCHEMAS_DIR, validators_dir: Path = VALIDATORS_DIR) -> types.ModuleType:
+    """Validator module for a registered schema, imported on first use.
+
+    Uses validators_dir/<name>.py when it was generated from the current
+    schemas_dir/<name>.json by this generator version; otherwise compiles
+    the schema in memory.
+
+    Raises:
+        FileNotFoundError: If there is no schema called name
+        UnsupportedSchema: If the schema can't be compiled
+    """
+    schema_path = Path(schemas_dir) / f"{name}.json"
+    key = (str(schema_path.resolve()), str(Path(validators_dir).resolve()))
+    if key in _LOADED:
+        return _LOADED[key]
+
+    text = schema_path.read_text()
+    digest = schema_digest(text)
+    module_path = Path(validators_dir) / f"{name}.py"
+    module = None
+    if module_path.exists():
+        spec = importlib.util.spec_from_file_location(f"nf_validators.{name}", module_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if module.SCHEMA_SHA256 != digest or module.GENERATOR_VERSION != GENERATOR_VERSION:
+            module = None
+    if module is None:
+        module = types.ModuleType(f"nf_validators.{name}")
+        exec(compile(compile_schema(json.loads(text), name, digest), f"<validator {name}>", "exec"), module.__dict__)
+    _LOADED[key] = module
+    return module
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compile the registered JSON Schemas into Python validators")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Write one validator module per schema")
+    build_parser.add_argument("--schemas-dir", type=Path, default=SCHEMAS_DIR, help="JSON Schemas (default: registered-json-schemas)")
+    build_parser.add_argument("--output-dir", type=Path, default=VALIDATORS_DIR, help="Output directory (default: dist/validators)")
+    validate_parser = subparsers.add_parser("validate", help="Validate JSON instances against a schema")
+    validate_parser.add_argument("schema", help="Schema name, e.g. RNASeqTemplate")
+    validate_parser.add_argument("instances", nargs="+", type=Path, help="JSON files, each an object or a list of objects")
+    validate_parser.add_argument("--schemas-dir", type=Path, default=SCHEMAS_DIR, help="JSON Schemas (default: registered-json-schemas)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        written = write_validators(args.schemas_dir, args.output_dir)
+        print(f"✅ Wrote {len(written)} validators to {args.output_dir}")
+        return 0
+
+    validator = load_validator(args.schema, args.schemas_dir)
+    failed = 0
+    for path in args.instances:
+        data = json.loads(path.read_text())
+        for index, instance in enumerate(data if isinstance(data, list) else [data]):
+            problems = validator.errors(instance)
+            label = f"{path.name}[{index}]" if isinstance(data, list) else path.name
+            if problems:
+                failed += 1
+                print(f"❌ {label}")
+                for error_path, keyword, message in problems:
+                    print(f"  - {'/'.join(map(str, error_path)) or '(root)'} [{keyword}]: {message}")
+            else:
+                print(f"✅ {label}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Opt-in stage profiling for the utils and scripts entry points.
+
+Scripts wrap their stages in span(): YAML loads, subprocesses, HTTP calls,
+polling waits, dumps. Each span records wall time, CPU time of its thread
+and the process's peak RSS. With profiling off (the default) span() does
+nothing beyond one global lookup.
+
+Turn it on per run with a script's --profile flag, or for every script with
+the NF_PROFILE environment variable ("1" for the default path, or a file
+path). At exit the script writes a trace in Chrome trace-event JSON, which
+opens in https://ui.perfetto.dev and https://www.speedscope.app, and prints
+a per-span summary table to stderr.
+
+Usage (in a script):
+    from stage_profiling import add_profile_argument, span, start_profiling
+
+    parser = argparse.ArgumentParser(...)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profiling("gen-json-schema-class", args.profile)
+
+    with span("yaml load", "io", path=str(path)):
+        data = yaml.safe_load(path.read_text())
+
+Usage (from a shell):
+    python utils/gen-json-schema-class.py --skip-validation --profile
+    NF_PROFILE=trace.json python utils/build.py
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_ENV = "NF_PROFILE"
+
+# Set by start_profiling(); None means profiling is off
+_PROFILER = None
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process so far, in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Profiler:
+    """Collects spans as Chrome trace "complete" events."""
+
+    def __init__(self, name: str, output: Path):
+        self.name = name
+        self.output = Path(output)
+        self.events = []
+        self._lock = threading.Lock()
+
+    def add(self, event: dict) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def trace(self) -> dict:
+        pid = os.getpid()
+        threads = {(e["pid"], e["tid"]) for e in self.events}
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.name}}]
+        metadata += [
+            {"name": "thread_name", "ph": "M", "pid": p, "tid": t, "args": {"name": "main" if t == threading.main_thread().ident else f"worker {t}"}}
+            for p, t in sorted(threads)
+        ]
+        return {"traceEvents": metadata + sorted(self.events, key=lambda e: e["ts"]), "displayTimeUnit": "ms"}
+
+    def summary(self) -> str:
+        """Per span name: calls, total and max wall time, total CPU time, peak RSS."""
+        rows = {}
+        for event in self.events:
+            row = rows.setdefault(event["name"], {"calls": 0, "wall": 0.0, "max": 0.0, "cpu": 0.0, "rss": 0.0})
+            row["calls"] += 1
+            row["wall"] += event["dur"] / 1000
+            row["max"] = max(row["max"], event["dur"] / 1000)
+            row["cpu"] += event["args"].get("cpu_ms", 0.0)
+            row["rss"] = max(row["rss"], event["args"].get("peak_rss_mb") or 0.0)
+
+        width = max([len(name) for name in rows] + [4])
+        lines = [f"{'span':<{width}}  {'calls':>6}  {'wall ms':>10}  {'max ms':>10}  {'cpu ms':>10}  {'peak MB':>8}"]
+        for name, row in sorted(rows.items(), key=lambda item: -item[1]["wall"]):
+            lines.append(
+                f"{name:<{width}}  {row['calls']:>6}  {row['wall']:>10.1f}  {row['max']:>10.1f}  {row['cpu']:>10.1f}  {row['rss']:>8.1f}"
+            )
+        return "\n".join(lines)
+
+    def finish(self) -> None:
+        self.output.write_text(json.dumps(self.trace()))
+        print(f"\n⏱️  Profile of {self.name} ({len(self.events)} spans)", file=sys.stderr)
+        print(self.summary(), file=sys.stderr)
+        print(f"📝 Trace written to {self.output} (open in ui.perfetto.dev or speedscope.app)", file=sys.stderr)
+
+
+def add_profile_argument(parser) -> None:
+    """Add --profile [TRACE.json] to an argparse parser."""
+    parser.add_argument(
+        "--profile", nargs="?", const="", default=None, metavar="TRACE.json",
+        help=f"Record stage timings and write a trace (default path: profile-<script>.json; also enabled by ${PROFILE_ENV})",
+    )
+
+
+def start_profiling(name: str, output: str | None = None) -> Profiler | None:
+    """Start recording spans if --profile was given or NF_PROFILE is set.
+
+    Args:
+        name: Script name, used in the trace and the default file name
+        output: The --profile value: None (flag absent), "" (default path) or a path
+
+    Returns:
+        The active Profiler, or None when profiling stays off
+    """
+    global _PROFILER
+    if output is None:
+        output = os.environ.get(PROFILE_ENV)
+        if output is None or output.lower() in ("", "0", "false", "no"):
+            return None
+        if output.lower() in ("1", "true", "yes"):
+            output = ""
+    if _PROFILER is None:
+        _PROFILER = Profiler(name, output or f"profile-{name}.json")
+        atexit.register(_PROFILER.finish)
+    return _PROFILER
+
+
+def _event(name: str, category: str, start_ns: int, end_ns: int, cpu_s: float, args: dict) -> dict:
+    return {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start_ns / 1000,
+        "dur": (end_ns - start_ns) / 1000,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": {**args, "cpu_ms": round(cpu_s * 1000, 3), "peak_rss_mb": peak_rss_mb()},
+    }
+
+
+@contextmanager
+def span(name: str, category: str = "stage", **args):
+    """Time the enclosed block as one span (no-op unless profiling is on).
+
+    Args:
+        name: Span name; spans with the same name are summed in the summary
+        category: "stage", "io", "subprocess", "http" or "wait"
+        **args: Extra details shown in the trace viewer (paths, URLs, ...)
+    """
+    profiler = _PROFILER
+    if profiler is None:
+        yield
+        return
+    start_ns, start_cpu = time.perf_counter_ns(), time.thread_time()
+    try:
+        yield
+    finally:
+        profiler.add(_event(name, category, start_ns, time.perf_counter_ns(), time.thread_time() - start_cpu, args))
+
+
+def call_in_worker(name: str, fn, *args, category: str = "stage", **kwargs):
+    """Run fn in a worker process as a span and return (result, event).
+
+    Spans recorded inside a ProcessPoolExecutor worker never reach the
+    parent's profiler; submit call_in_worker(name, fn, ...) instead of fn and
+    pass the returned event to record_event() in the parent. event is None
+    when profiling is off.
+    """
+    if _PROFILER is None:
+        return fn(*args, **kwargs), None
+    start_ns, start_cpu = time.perf_counter_ns(), time.process_time()
+    result = fn(*args, **kwargs)
+    event = _event(name, category, start_ns, time.perf_counter_ns(), time.process_time() - start_cpu, {})
+    event["tid"] = event["pid"]
+    return result, event
+
+
+def record_event(event: dict | None) -> None:
+    """Add an event returned by call_in_worker() to this process's trace."""
+    if _PROFILER is not None and event is not None:
+        _PROFILER.add(event)
@@ -13,6 +13,10 @@ import sys
 import yaml
 from typing import Dict, List, Any, Set
 import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from stage_profiling import add_profile_argument, span, start_profiling
 
 
 def fetch_tools_data(synapse_id: str = 'syn51730943', resource_types: List[str] = None) -> Dict[str, List[Dict[str, Any]]]:
@@ -54,7 +58,8 @@ def fetch_tools_data(synapse_id: str = 'syn51730943', resource_types: List[str]
             print(f"Fetching {resource_type} data from {synapse_id}...")
 
             try:
-                results = syn.tableQuery(query)
+                with span("synapse tableQuery", "http", table=synapse_id):
+                    results = syn.tableQuery(query)
                 data = []
 
                 for row in results:
@@ -132,7 +137,8 @@ def fetch_synapse_data(synapse_id: str) -> List[Dict[str, Any]]:
         print(f"Executing query: {query}")
         
         try:
-            results = syn.tableQuery(query)
+            with span("synapse tableQuery", "http", table=synapse_id):
+                results = syn.tableQuery(query)
         except Exception as query_error:
             print(f"Error executing query: {query_error}")
             print("Falling back to mock data for testing.")
@@ -230,7 +236,8 @@ def fetch_tool_links(synapse_id: str = 'syn51730943') -> Dict[str, Dict[str, str
         print(f"Fetching tool links from {synapse_id}...")
 
         try:
-            results = syn.tableQuery(query)
+            with span("synapse tableQuery", "http", table=synapse_id):
+                results = syn.tableQuery(query)
         except Exception as query_error:
             print(f"Warning: Could not fetch tool links: {query_error}")
             return {'Cell Line': {}, 'Animal Model': {}, 'Antibody': {}, 'Genetic Reagent': {}}
@@ -480,8 +487,10 @@ def main():
                        help='Synapse table ID (default: syn26450069)')
     parser.add_argument('--dry-run', action='store_true',
                        help='Print what would be done without making changes')
+    add_profile_argument(parser)
     
     args = parser.parse_args()
+    start_profiling("sync_model_systems", args.profile)
     
     # Get the repository root directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Materialize every template's effective attributes as one versioned artifact.
+
+The docs build, the entity-view builder and the schema limit checks all need
+the same per-template facts: which attributes a template has after
+inheritance and slot_usage, their type, whether they are multivalued or
+required, which enums they draw from, the conditional rules that apply, and
+how large their values can get. Rather than have each of them re-derive that
+from NF.ttl, the registered JSON Schemas or the source YAML, the build emits
+dist/NF.attributes.jsonl once and they read it.
+
+Format (JSON Lines):
+- line 1 is a header: {"format": "nf-template-attributes", "version": 1, ...}
+- every following line is one class with its attributes and rules
+
+Usage:
+    python utils/template_attributes.py                    # writes dist/NF.attributes.jsonl
+    python utils/template_attributes.py --output attrs.jsonl
+
+    from template_attributes import load_attributes
+    templates = load_attributes()
+    templates["RNASeqTemplate"]["attributes"]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent))
+from schema_index import DIST_SCHEMA, MODULES_DIR, SchemaIndex
+from stage_profiling import add_profile_argument, span, start_profiling
+
+ATTRIBUTES_FORMAT = "nf-template-attributes"
+ATTRIBUTES_VERSION = 1
+DEFAULT_OUTPUT = DIST_SCHEMA.parent / "NF.attributes.jsonl"
+
+# Stripped from the registered JSON Schemas (issue #708), so never exposed as columns
+EXCLUDED_SLOTS = ("Filename", "Component")
+
+# LinkML type -> JSON Schema type; anything else is serialized as a string
+JSON_TYPES = {
+    "integer": "integer",
+    "float": "number",
+    "double": "number",
+    "decimal": "number",
+    "boolean": "boolean",
+}
+
+# JSON Schema type -> Synapse column type (mirrors json_schema_entity_view.py)
+COLUMN_TYPES = {"string": "STRING", "number": "DOUBLE", "integer": "INTEGER", "boolean": "BOOLEAN"}
+LIST_COLUMN_TYPES = {"string": "STRING_LIST", "integer": "INTEGER_LIST", "boolean": "BOOLEAN_LIST"}
+
+TEMPLATE_TYPES = {
+    "FileBasedTemplate": "file",
+    "RecordBasedTemplate": "record",
+    "PartialTemplate": "partial",
+}
+
+
+def load_template_annotations(modules_dir: Path = MODULES_DIR) -> dict:
+    """Class annotations from modules/Template (they are stripped from dist/NF.yaml)."""
+    annotations = {}
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    for yaml_file in sorted((Path(modules_dir) / "Template").glob("*.yaml")):
+        with open(yaml_file) as f:
+            data = yaml.load(f, Loader=loader) or {}
+        for name, definition in (data.get("classes") or {}).items():
+            if isinstance(definition, dict) and definition.get("annotations"):
+                annotations[name] = definition["annotations"]
+    return annotations
+
+
+def _column_type(json_types: list, has_enum: bool, multivalued: bool) -> str:
+    scalar = json_types[0] if len(json_types) == 1 and not has_enum else "string"
+    if multivalued:
+        return LIST_COLUMN_TYPES.get(scalar, "STRING_LIST")
+    return COLUMN_TYPES.get(scalar, "STRING")
+
+
+def attribute_record(index: SchemaIndex, slot) -> dict:
+    """Flatten one InducedSlot into its artifact record."""
+    definition = slot.definition
+    enums = [r for r in slot.ranges if r in index.enums]
+    values = []
+    for enum_name in enums:
+        values.extend((index.enums[enum_name] or {}).get("permissible_values") or {})
+    json_types = sorted({
+        "string" if r in index.enums else JSON_TYPES.get(r, "string") for r in slot.ranges
+    })
+    multivalued = bool(definition.get("multivalued"))
+
+    record = {
+        "name": slot.name,
+        "title": definition.get("title") or slot.name,
+        "description": (definition.get("description") or "").strip(),
+        "ranges": list(slot.ranges),
+        "types": json_types,
+        "columnType": _column_type(json_types, bool(enums), multivalued),
+        "multivalued": multivalued,
+        "required": slot.required,
+        "enums": enums,
+        "enumValues": len(values),
+        "maxLength": max((len(str(v)) for v in values), default=None),
+    }
+    for key in ("pattern", "ifabsent", "minimum_value", "maximum_value"):
+        if definition.get(key) is not None:
+            record[key] = definition[key]
+    return record
+
+
+def template_record(index: SchemaIndex, class_name: str, annotations: dict | None = None) -> dict:
+    """One artifact line: a class with its induced attributes and inherited rules."""
+    definition = index.classes.get(class_name) or {}
+    lineage = [*reversed(index.ancestors(class_name)), class_name]
+    template_type = next(
+        (TEMPLATE_TYPES[name] for name in (class_name, *index.ancestors(class_name)) if name in TEMPLATE_TYPES),
+        None,
+    )
+    annotations = annotations or {}
+    return {
+        "name": class_name,
+        "parent": definition.get("is_a"),
+        "abstract": bool(definition.get("abstract")),
+        "isTemplate": index.is_subclass(class_name, "Template"),
+        "templateType": template_type,
+        "depth": len(index.ancestors(class_name)),
+        "dataGranularity": annotations.get("dataGranularity"),
+        "templateUsage": annotations.get("templateUsage"),
+        "attributes": [
+            attribute_record(index, slot)
+            for slot in index.induced_slots(class_name).values()
+            if slot.name not in EXCLUDED_SLOTS
+        ],
+        "rules": [rule for name in lineage for rule in (index.classes.get(name) or {}).get("rules") or []],
+    }
+
+
+def build_attributes(
+    model_path: Path = DIST_SCHEMA,
+    modules_dir: Path = MODULES_DIR,
+    model: dict | None = None,
+    annotations: dict | None = None,
+) -> list[dict]:
+    """Header plus one record per class that has attributes, sorted by name.
+
+    Args:
+        model_path: Merged model file (hashed into the header)
+        modules_dir: Modules directory, read for template annotations
+        model: The parsed model_path, if the caller already has it
+        annotations: {class name: annotations}, if the caller already has them
+    """
+    model_bytes = Path(model_path).read_bytes()
+    if model is None:
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with span("yaml load", "io", path=Path(model_path).name):
+            model = yaml.load(model_bytes, Loader=loader) or {}
+    with span("schema index"):
+        index = SchemaIndex(model)
+    if annotations is None:
+        annotations = load_template_annotations(modules_dir)
+
+    records = [
+        template_record(index, name, annotations.get(name))
+        for name in sorted(index.classes)
+        if index.induced_slots(name)
+    ]
+    header = {
+        "format": ATTRIBUTES_FORMAT,
+        "version": ATTRIBUTES_VERSION,
+        "model": Path(model_path).name,
+        "modelSha256": hashlib.sha256(model_bytes).hexdigest(),
+        "templates": len(records),
+    }
+    return [header, *records]
+
+
+def write_attributes(lines: list[dict], output: Path = DEFAULT_OUTPUT) -> None:
+    with open(output, "w") as f:
+        for line in lines:
+            f.write(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def load_attributes(path: Path = DEFAULT_OUTPUT) -> dict:
+    """Read the artifact back as {class name: record}.
+
+    Raises:
+        ValueError: If the file is not an attributes artifact of a supported version
+    """
+    with open(path) as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != ATTRIBUTES_FORMAT or header.get("version") != ATTRIBUTES_VERSION:
+            raise ValueError(
+                f"{path} is not a version {ATTRIBUTES_VERSION} {ATTRIBUTES_FORMAT} file; "
+                "regenerate it with utils/template_attributes.py"
+            )
+        records = (json.loads(line) for line in f if line.strip())
+        return {record["name"]: record for record in records}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Emit the per-template attribute artifact (JSON Lines)")
+    parser.add_argument("--model", type=Path, default=DIST_SCHEMA, help="Merged model (default: dist/NF.yaml)")
+    parser.add_argument("--modules-dir", type=Path, default=MODULES_DIR, help="Modules directory (for template annotations)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Output file (default: dist/NF.attributes.jsonl)")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profiling("template_attributes", args.profile)
+
+    if not args.model.exists():
+        print(f"❌ {args.model} not found. Run `make NF.yaml` first.", file=sys.stderr)
+        return 1
+
+    with span("build attributes"):
+        lines = build_attributes(args.model, args.modules_dir)
+    with span("jsonl dump", "io", path=str(args.output)):
+        write_attributes(lines, args.output)
+    n_attributes = sum(len(record["attributes"]) for record in lines[1:])
+    print(f"✅ Wrote {args.output}: {len(lines) - 1} templates, {n_attributes} attributes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache of ontology term lookups, keyed by term IRI.
+
+Shared by extract_synonyms.py (which fills it from OLS4 / RDF content
+negotiation) and inject_synonyms.py (which can read synonyms from it by
+`meaning` IRI instead of by term label). Each entry records where it came
+from and when it was fetched, so weekly refreshes only need to touch new or
+expired IRIs.
+
+Usage:
+    cache = TermCache("term_cache.sqlite", ttl_days=30)
+    entry = cache.get("http://purl.obolibrary.org/obo/NCIT_C16553")
+    if entry is None or cache.is_stale(entry):
+        ...fetch...
+        cache.put(iri, source="ols4", synonyms=[...], label="...", obsolete=False)
+"""
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = "term_cache.sqlite"
+DEFAULT_TTL_DAYS = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    iri        TEXT PRIMARY KEY,
+    source     TEXT NOT NULL,      -- 'ols4', 'rdf', 'dump' or 'none' (nothing found)
+    label      TEXT,
+    synonyms   TEXT NOT NULL,      -- JSON array
+    obsolete   INTEGER NOT NULL DEFAULT 0,
+    fetched_at REAL NOT NULL       -- unix timestamp
+)
+"""
+
+
+@dataclass(frozen=True)
+class CachedTerm:
+    """A cached lookup result for one IRI."""
+    iri: str
+    source: str
+    label: str | None
+    synonyms: tuple[str, ...]
+    obsolete: bool
+    fetched_at: float
+
+
+class TermCache:
+    """SQLite-backed IRI -> term lookup cache with a time-to-live."""
+
+    def __init__(self, path: str | Path = DEFAULT_CACHE_PATH, ttl_days: float = DEFAULT_TTL_DAYS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+
+    @staticmethod
+    def _row_to_term(row) -> CachedTerm:
+        iri, source, label, synonyms, obsolete, fetched_at = row
+        return CachedTerm(iri, source, label, tuple(json.loads(synonyms)), bool(obsolete), fetched_at)
+
+    def get(self, iri: str) -> CachedTerm | None:
+        """Return the cached entry for iri, or None if it was never fetched."""
+        row = self._conn.execute(
+            "SELECT iri, source, label, synonyms, obsolete, fetched_at FROM terms WHERE iri = ?",
+            (iri,),
+        ).fetchone()
+        return self._row_to_term(row) if row else None
+
+    def get_many(self, iris) -> dict[str, CachedTerm]:
+        """Return cached entries for the given IRIs (missing IRIs are omitted)."""
+        iris = list(iris)
+        found = {}
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(iris), 500):
+            chunk = iris[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self._conn.execute(
+                f"SELECT iri, source, label, synonyms, obsolete, fetched_at FROM terms WHERE iri IN ({placeholders})",
+                chunk,
+            ):
+                term = self._row_to_term(row)
+                found[term.iri] = term
+        return found
+
+    def is_stale(self, entry: CachedTerm, now: float | None = None) -> bool:
+        """True if entry is older than the cache TTL."""
+        now = time.time() if now is None else now
+        return now - entry.fetched_at > self.ttl_seconds
+
+    def put(
+        self,
+        iri: str,
+        source: str,
+        synonyms=(),
+        label: str | None = None,
+        obsolete: bool = False,
+        fetched_at: float | None = None,
+        commit: bool = True,
+    ) -> None:
+        """Insert or replace the entry for iri."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO terms (iri, source, label, synonyms, obsolete, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                iri,
+                source,
+                label,
+                json.dumps(list(synonyms), ensure_ascii=False),
+                int(bool(obsolete)),
+                time.time() if fetched_at is None else fetched_at,
+            ),
+        )
+        if commit:
+            self._conn.commit()
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def partition(self, iris, refresh_stale: bool = True) -> tuple[dict[str, CachedTerm], list[str]]:
+        """Split IRIs into usable cache hits and IRIs that still need fetching.
+
+        Args:
+            iris: IRIs to look up (duplicates are collapsed)
+            refresh_stale: When True, expired entries are returned for
+                refetching; when False, any cached entry is reused
+
+        Returns:
+            Tuple of (hits by IRI, IRIs to fetch in first-seen order)
+        """
+        unique = list(dict.fromkeys(iris))
+        cached = self.get_many(unique)
+        now = time.time()
+        hits, to_fetch = {}, []
+        for iri in unique:
+            entry = cached.get(iri)
+            if entry is None or (refresh_stale and self.is_stale(entry, now)):
+                to_fetch.append(iri)
+            else:
+                hits[iri] = entry
+        return hits, to_fetch